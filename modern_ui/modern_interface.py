@@ -12,11 +12,12 @@ from modern_ui.adapter import CoreAdapter
 from modern_ui.card_face import CardFaceRenderer
 from modern_ui.entities import CollectCard, DragState, MovingCard, Particle, VictoryCard
 from modern_ui.game_store import SLOT_COUNT, clear_game, has_saved_game, list_slot_status, load_game, save_game
-from modern_ui.seed_pool_store import choose_seed_for_bucket
+from modern_ui.seed_pool_store import choose_seed_for_bucket, stored_solution
 from modern_ui.settings_store import load_settings, save_settings
 from modern_ui.sound_fx import SoundFxManager
 from modern_ui.stats_store import load_stats, profile_key, record_game_lost, record_game_started, record_game_won, save_stats
-from solver.analyzer import SearchLimits, SolverState, solve_state
+from solver.analyzer import SearchLimits, SolverState, resolve_state, shorten_result
+from solver.solution_codec import opening_plan
 from modern_ui.ui_config import (
     ANIM_DURATION,
     CARD_HEIGHT_RATIO,
@@ -92,6 +93,7 @@ class ModernTkInterface(Interface):
     }
     SHOW_TOP_LEFT_DETAIL = False
     AUTO_SOLVER_STEP_INTERVAL = 0.45
+    AUTO_SOLVER_REFINE_SECONDS = 1.0
 
     def __init__(self, width=1200, height=760):
         super().__init__()
@@ -160,6 +162,7 @@ class ModernTkInterface(Interface):
         self.solver_result = None
         self.solver_request_id = 0
         self.solver_next_step_at = 0.0
+        self.solver_last_solution = None
         self.load_persisted_settings()
 
     def run(self):
@@ -273,6 +276,7 @@ class ModernTkInterface(Interface):
         self.solver_plan = []
         self.solver_mode = None
         self.solver_next_step_at = 0.0
+        self.solver_last_solution = None
 
     def fs(self, base):
         factor = FONT_SCALE_FACTOR[self.font_scale]
@@ -733,6 +737,14 @@ class ModernTkInterface(Interface):
             finished_count=int(self.core.finishedCount),
         )
 
+    def _stored_opening_plan(self, state):
+        if self.current_seed is None:
+            return None
+        data = stored_solution(self.suit_count, self.current_seed)
+        if data is None:
+            return None
+        return opening_plan(state, int(self.current_seed), self.suit_count, data)
+
     def _start_solver_job(self, mode: str):
         if self.stage != GAME or self.core is None or self.vm is None:
             self.message = "当前不在对局中，无法求解。"
@@ -759,6 +771,13 @@ class ModernTkInterface(Interface):
         self.solver_plan = []
         self.solver_request_id += 1
         request_id = self.solver_request_id
+        previous = self.solver_last_solution
+
+        # Pool seeds come with the builder's solution; from the opening it plays back without searching.
+        stored = self._stored_opening_plan(state)
+        if stored is not None:
+            self.solver_result = (request_id, stored)
+            return
 
         self.message = "求解器运行中..."
         self.request_redraw()
@@ -769,7 +788,12 @@ class ModernTkInterface(Interface):
                 max_seconds=20.0 if mode == "auto" else 1.8,
                 max_frontier=1_000_000 if mode == "auto" else 500_000,
             )
-            result = solve_state(state, limits=limits)
+            # Reconnect to the last plan after small deviations instead of searching from scratch.
+            result = resolve_state(state, previous, limits=limits)
+            if mode == "auto" and result.status == "solved" and result.stop_reason != "plan_reconnected":
+                # Splice detours out of the plan before playback.
+                deadline = time.perf_counter() + self.AUTO_SOLVER_REFINE_SECONDS
+                result = shorten_result(state, result, deadline)
             self.solver_result = (request_id, result)
 
         threading.Thread(target=worker, daemon=True).start()
@@ -827,6 +851,7 @@ class ModernTkInterface(Interface):
             self.request_redraw()
             return
 
+        self.solver_last_solution = result
         self.solver_plan = list(result.solution)
         if not self.solver_plan:
             self.solver_mode = None
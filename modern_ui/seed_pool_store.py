@@ -3,23 +3,54 @@ import random
 from pathlib import Path
 
 from modern_ui.ui_config import DIFFICULTY_BUCKET_ORDER
+from solver.pool_index import pick_seed as pick_indexed_seed
+from solver.pool_index import pool_index_path
+from solver.seed_db import SeedDb
+from solver.solution_codec import lookup_solution, solutions_path
+
+# Parsed JSON pools keyed by path and mtime, used only when no binary index exists.
+_bucket_cache: dict[tuple[str, int], dict[str, list[int]]] = {}
 
 
 def seed_pool_path(suit_count: int) -> Path:
     return Path(__file__).resolve().parents[1] / "data" / f"seed_pool_{int(suit_count)}s.json"
 
 
+def seed_db_path(suit_count: int) -> Path:
+    return seed_pool_path(suit_count).with_name("seed_pool.sqlite")
+
+
 def _legacy_seed_pool_path(suit_count: int) -> Path:
     return Path(__file__).with_name(f"seed_pool_{int(suit_count)}s.json")
 
 
-def load_seed_pool_buckets(suit_count: int) -> dict[str, list[int]]:
-    out = {key: [] for key in DIFFICULTY_BUCKET_ORDER}
+def _existing_pool_path(suit_count: int) -> Path | None:
     path = seed_pool_path(suit_count)
     if not path.exists():
         path = _legacy_seed_pool_path(suit_count)
-    if not path.exists():
-        return out
+    return path if path.exists() else None
+
+
+def load_seed_pool_buckets(suit_count: int) -> dict[str, list[int]]:
+    return {key: list(seeds) for key, seeds in _cached_seed_pool_buckets(suit_count).items()}
+
+
+def _cached_seed_pool_buckets(suit_count: int) -> dict[str, list[int]]:
+    path = _existing_pool_path(suit_count)
+    if path is None:
+        return {key: [] for key in DIFFICULTY_BUCKET_ORDER}
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return {key: [] for key in DIFFICULTY_BUCKET_ORDER}
+    if key not in _bucket_cache:
+        _bucket_cache.clear()
+        _bucket_cache[key] = _parse_seed_pool_buckets(path)
+    return _bucket_cache[key]
+
+
+def _parse_seed_pool_buckets(path: Path) -> dict[str, list[int]]:
+    out = {key: [] for key in DIFFICULTY_BUCKET_ORDER}
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
@@ -43,10 +74,56 @@ def load_seed_pool_buckets(suit_count: int) -> dict[str, list[int]]:
     return out
 
 
+def _choose_seed_from_db(suit_count: int, difficulty_bucket: str, rng: random.Random | None) -> int | None:
+    path = seed_db_path(suit_count)
+    if not path.exists():
+        return None
+    pool_path = _existing_pool_path(suit_count)
+    try:
+        with SeedDb(path, readonly=True) as db:
+            # The database is shared by every suit count; its rows for this one
+            # are stale once the pool JSON was rewritten without it.
+            if pool_path is not None and not db.mirrors_pool(suit_count, pool_path):
+                return None
+            return db.pick_seed(suit_count, difficulty_bucket, rng)
+    except Exception:
+        return None
+
+
+def _choose_seed_from_index(suit_count: int, difficulty_bucket: str, rng: random.Random | None) -> int | None:
+    path = _existing_pool_path(suit_count)
+    if path is None:
+        return None
+    index_path = pool_index_path(path)
+    try:
+        # An index older than its JSON pool is stale.
+        if index_path.stat().st_mtime_ns < path.stat().st_mtime_ns:
+            return None
+        return pick_indexed_seed(index_path, difficulty_bucket, rng)
+    except Exception:
+        return None
+
+
 def choose_seed_for_bucket(suit_count: int, difficulty_bucket: str, rng: random.Random | None = None) -> int | None:
-    pools = load_seed_pool_buckets(suit_count)
+    seed = _choose_seed_from_db(suit_count, difficulty_bucket, rng)
+    if seed is None:
+        seed = _choose_seed_from_index(suit_count, difficulty_bucket, rng)
+    if seed is not None:
+        return seed
+    pools = _cached_seed_pool_buckets(suit_count)
     options = pools.get(difficulty_bucket, [])
     if not options:
         return None
     pick_rng = rng if rng is not None else random
     return int(options[pick_rng.randrange(len(options))])
+
+
+def stored_solution(suit_count: int, seed: int) -> bytes | None:
+    """Encoded solution the pool builder kept for ``seed``, if any."""
+    path = _existing_pool_path(suit_count)
+    if path is None:
+        return None
+    try:
+        return lookup_solution(solutions_path(path), int(seed))
+    except Exception:
+        return None
@@ -4,11 +4,17 @@ import argparse
 import heapq
 import json
 import math
+import os
+import sys
 import time
-from dataclasses import dataclass, replace
-from typing import Iterable, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 
 from base.Core import Card, GameConfig
+from solver.worker_pool import make_worker_pool
 
 CardAtom = int
 StackAtom = tuple[CardAtom, ...]
@@ -48,6 +54,14 @@ class SearchLimits:
     max_nodes: int = 200_000
     max_seconds: float = 2.0
     max_frontier: int = 500_000
+    # Abort with status "memory_limit" once process RSS grows by more than this
+    # over its size when the search started; 0 disables. Measured as growth
+    # because a reused worker rarely returns memory freed by earlier seeds.
+    max_rss_mb: float = 0.0
+    # Budget by expanded nodes only so results do not depend on machine speed
+    # or load. ``max_seconds`` is then a safety cap for the whole search and a
+    # search stopped by it reports the "time_cap" reason.
+    deterministic: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -84,11 +98,88 @@ class SearchStage:
     frontier_share: float = 1.0
 
 
+@dataclass(slots=True)
+class SearchProfile:
+    """Opt-in hot-path counters collected by ``solve_state(..., instrument=True)``.
+
+    Phase timings are inclusive: ``iter_transitions`` contains the macro-chain
+    and key time spent on its behalf.
+    """
+
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    phase_calls: dict[str, int] = field(default_factory=dict)
+    macro_chain_lengths: dict[int, int] = field(default_factory=dict)
+    prunes: dict[str, int] = field(default_factory=dict)
+    depth_children: dict[int, int] = field(default_factory=dict)
+    depth_duplicates: dict[int, int] = field(default_factory=dict)
+
+    def timed(self, phase: str, fn: Callable) -> Callable:
+        seconds = self.phase_seconds
+        calls = self.phase_calls
+        seconds.setdefault(phase, 0.0)
+        calls.setdefault(phase, 0)
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                seconds[phase] += clock() - t0
+                calls[phase] += 1
+
+        return wrapper
+
+    def prune(self, name: str, count: int = 1) -> None:
+        if count > 0:
+            self.prunes[name] = self.prunes.get(name, 0) + count
+
+    def record_macro_chain(self, steps: int) -> None:
+        self.macro_chain_lengths[steps] = self.macro_chain_lengths.get(steps, 0) + 1
+
+    def record_child(self, depth: int, duplicate: bool) -> None:
+        self.depth_children[depth] = self.depth_children.get(depth, 0) + 1
+        if duplicate:
+            self.depth_duplicates[depth] = self.depth_duplicates.get(depth, 0) + 1
+
+    def merge(self, other: "SearchProfile") -> None:
+        for target, source in (
+            (self.phase_seconds, other.phase_seconds),
+            (self.phase_calls, other.phase_calls),
+            (self.macro_chain_lengths, other.macro_chain_lengths),
+            (self.prunes, other.prunes),
+            (self.depth_children, other.depth_children),
+            (self.depth_duplicates, other.depth_duplicates),
+        ):
+            for key, value in source.items():
+                target[key] = target.get(key, 0) + value
+
+    def to_dict(self) -> dict:
+        return {
+            "phases": {
+                name: {"seconds": round(self.phase_seconds[name], 6), "calls": self.phase_calls.get(name, 0)}
+                for name in sorted(self.phase_seconds)
+            },
+            "macro_chain_lengths": {str(k): self.macro_chain_lengths[k] for k in sorted(self.macro_chain_lengths)},
+            "prunes": dict(sorted(self.prunes.items())),
+            "depth": [
+                {
+                    "depth": depth,
+                    "children": self.depth_children[depth],
+                    "duplicates": self.depth_duplicates.get(depth, 0),
+                    "duplicate_rate": round(self.depth_duplicates.get(depth, 0) / self.depth_children[depth], 4),
+                }
+                for depth in sorted(self.depth_children)
+            ],
+        }
+
+
 @dataclass(slots=True)
 class SolveResult:
     status: str
     stop_reason: str
     solution: tuple[Action, ...]
+    # One state per action plus the final one: solution_states[i] is the state solution[i] is played from.
     solution_states: tuple[SolverState, ...]
     expanded_nodes: int
     generated_nodes: int
@@ -102,6 +193,10 @@ class SolveResult:
     solution_revealed: int
     solution_freed: int
     solution_deals: int
+    profile: Optional[SearchProfile] = None
+    # Indices into solution_states where the search chose a transition (macro-chain moves
+    # are not choices); None when every action was chosen.
+    decision_points: Optional[tuple[int, ...]] = None
 
 
 @dataclass(slots=True)
@@ -142,7 +237,25 @@ class _Transition:
     state_key: Optional[StateKey] = None
 
 
-def _normalized_hidden_prefix(state: SolverState) -> tuple[int, ...]:
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+# Expansions between RSS checks; each check is one small /proc read.
+_RSS_CHECK_MASK = 1023
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process, or 0 where ``/proc`` is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def normalized_hidden_prefix(state: SolverState) -> tuple[int, ...]:
     if len(state.hidden_prefix) == len(state.stacks):
         return state.hidden_prefix
     return tuple(0 for _ in state.stacks)
@@ -154,7 +267,7 @@ def _canonical_state_key(state: SolverState) -> StateKey:
     - keep base order (deal order matters)
     - sort tableau columns to collapse permutation symmetry
     """
-    hidden = _normalized_hidden_prefix(state)
+    hidden = normalized_hidden_prefix(state)
     stacks_with_hidden = tuple((state.stacks[i], hidden[i]) for i in range(len(state.stacks)))
     return state.base, tuple(sorted(stacks_with_hidden)), state.finished_count
 
@@ -163,7 +276,7 @@ def _card_suit(card_id: int) -> int:
     return card_id // Card.NUM_PER_SUIT
 
 
-def _card_num(card_id: int) -> int:
+def card_num(card_id: int) -> int:
     return card_id % Card.NUM_PER_SUIT
 
 
@@ -204,7 +317,7 @@ def _is_valid_sequence(stack: StackAtom, hidden_prefix: int, idx: int) -> bool:
     prev_id = stack[idx]
     for i in range(idx + 1, len(stack)):
         upper_id = stack[i]
-        if not (_card_suit(prev_id) == _card_suit(upper_id) and _card_num(prev_id) == _card_num(upper_id) + 1):
+        if not (_card_suit(prev_id) == _card_suit(upper_id) and card_num(prev_id) == card_num(upper_id) + 1):
             return False
         prev_id = upper_id
     return True
@@ -223,7 +336,7 @@ def _valid_move_starts(stack: StackAtom, hidden_prefix: int) -> tuple[int, ...]:
         if contiguous:
             lower = stack[idx]
             upper = stack[idx + 1]
-            contiguous = _card_suit(lower) == _card_suit(upper) and _card_num(lower) == _card_num(upper) + 1
+            contiguous = _card_suit(lower) == _card_suit(upper) and card_num(lower) == card_num(upper) + 1
         if contiguous:
             valid.append(idx)
     valid.reverse()
@@ -237,7 +350,7 @@ def _can_move(state: SolverState, src_stack: int, src_idx: int, dest_stack: int)
         return False
     if src_stack == dest_stack:
         return False
-    hidden = _normalized_hidden_prefix(state)
+    hidden = normalized_hidden_prefix(state)
     if not _is_valid_sequence(state.stacks[src_stack], hidden[src_stack], src_idx):
         return False
 
@@ -247,7 +360,7 @@ def _can_move(state: SolverState, src_stack: int, src_idx: int, dest_stack: int)
 
     src_card_id = state.stacks[src_stack][src_idx]
     dest_top_id = dest[-1]
-    return _card_num(dest_top_id) == _card_num(src_card_id) + 1
+    return card_num(dest_top_id) == card_num(src_card_id) + 1
 
 
 def _free_once(stack: StackAtom, hidden_prefix: int) -> tuple[StackAtom, int, bool, int]:
@@ -260,7 +373,7 @@ def _free_once(stack: StackAtom, hidden_prefix: int) -> tuple[StackAtom, int, bo
     suit = _card_suit(stack[-1])
     for i in range(Card.NUM_PER_SUIT):
         card_id = stack[len(stack) - i - 1]
-        if _card_suit(card_id) != suit or _card_num(card_id) != i:
+        if _card_suit(card_id) != suit or card_num(card_id) != i:
             return stack, hidden_prefix, False, 0
 
     new_stack = stack[: len(stack) - Card.NUM_PER_SUIT]
@@ -300,20 +413,20 @@ def _auto_free_all(
     return tuple(out), tuple(hidden), finished_count, freed_total, revealed_total
 
 
-def _ordered_links(stack: StackAtom) -> tuple[int, int]:
+def ordered_links(stack: StackAtom) -> tuple[int, int]:
     same_suit = 0
     any_suit = 0
     for i in range(1, len(stack)):
         lower = stack[i - 1]
         upper = stack[i]
-        if _card_num(lower) == _card_num(upper) + 1:
+        if card_num(lower) == card_num(upper) + 1:
             any_suit += 1
             if _card_suit(lower) == _card_suit(upper):
                 same_suit += 1
     return same_suit, any_suit
 
 
-def _state_potential(state: SolverState) -> int:
+def state_potential(state: SolverState) -> int:
     empty_cols = 0
     same_suit_links = 0
     any_suit_links = 0
@@ -323,7 +436,7 @@ def _state_potential(state: SolverState) -> int:
         if not stack:
             empty_cols += 1
             continue
-        ss, aa = _ordered_links(stack)
+        ss, aa = ordered_links(stack)
         same_suit_links += ss
         any_suit_links += aa
         breakpoints += max(0, len(stack) - 1 - aa)
@@ -363,7 +476,7 @@ def _move_priority(
 
     if src_idx > 0:
         below = src[src_idx - 1]
-        if _card_suit(below) == _card_suit(src_card) and _card_num(below) == _card_num(src_card) + 1:
+        if _card_suit(below) == _card_suit(src_card) and card_num(below) == card_num(src_card) + 1:
             score -= 12
 
     if moved_len >= 6:
@@ -403,19 +516,19 @@ def _splits_same_suit_run(stack: StackAtom, hidden_prefix: int, idx: int) -> boo
         return False
     below = stack[idx - 1]
     cur = stack[idx]
-    return _card_suit(below) == _card_suit(cur) and _card_num(below) == _card_num(cur) + 1
+    return _card_suit(below) == _card_suit(cur) and card_num(below) == card_num(cur) + 1
 
 
 def _legal_destinations(state: SolverState, src_stack: int, src_idx: int) -> list[int]:
     dests: list[int] = []
     stacks = state.stacks
     src_card_id = stacks[src_stack][src_idx]
-    src_num = _card_num(src_card_id)
+    src_num = card_num(src_card_id)
     for d_idx in range(len(stacks)):
         if d_idx == src_stack:
             continue
         dest = stacks[d_idx]
-        if not dest or _card_num(dest[-1]) == src_num + 1:
+        if not dest or card_num(dest[-1]) == src_num + 1:
             dests.append(d_idx)
     return dests
 
@@ -427,6 +540,7 @@ def _filter_destinations_by_policy(
     dests: list[int],
     moved_len: int,
     policy: SearchPolicy,
+    profile: Optional[SearchProfile] = None,
 ) -> list[int]:
     if not dests:
         return dests
@@ -444,11 +558,15 @@ def _filter_destinations_by_policy(
             if _card_suit(top) == _card_suit(src_card):
                 same_suit.append(d_idx)
         if same_suit:
+            if profile is not None:
+                profile.prune("same_suit_destination", len(filtered) - len(same_suit))
             filtered = same_suit
 
     if policy.avoid_empty_for_short_moves and moved_len < policy.min_len_for_empty_move:
         non_empty = [d for d in filtered if len(state.stacks[d]) > 0]
         if non_empty:
+            if profile is not None:
+                profile.prune("empty_short_move", len(filtered) - len(non_empty))
             filtered = non_empty
 
     return filtered
@@ -456,7 +574,7 @@ def _filter_destinations_by_policy(
 
 def _apply_move(state: SolverState, src_stack: int, src_idx: int, dest_stack: int) -> _Transition:
     stacks = list(state.stacks)
-    hidden = list(_normalized_hidden_prefix(state))
+    hidden = list(normalized_hidden_prefix(state))
 
     src_original = stacks[src_stack]
     moving = src_original[src_idx:]
@@ -506,7 +624,7 @@ def _apply_deal(state: SolverState) -> Optional[_Transition]:
 
     base = list(state.base)
     stacks = [list(stack) for stack in state.stacks]
-    hidden = list(_normalized_hidden_prefix(state))
+    hidden = list(normalized_hidden_prefix(state))
 
     dest = 0
     pending = draw_count
@@ -535,7 +653,7 @@ def _pick_macro_follow_up(
     last_action: Optional[Action],
 ) -> Optional[_Transition]:
     best: Optional[_Transition] = None
-    hidden = _normalized_hidden_prefix(state)
+    hidden = normalized_hidden_prefix(state)
 
     for s_idx, stack in enumerate(state.stacks):
         for idx in _valid_move_starts(stack, hidden[s_idx]):
@@ -634,32 +752,46 @@ def _iter_transitions(
     state: SolverState,
     policy: SearchPolicy = DEFAULT_POLICY,
     last_action: Optional[Action] = None,
+    profile: Optional[SearchProfile] = None,
 ) -> list[_Transition]:
     best_by_key: dict[StateKey, _Transition] = {}
     generated_move_count = 0
-    hidden = _normalized_hidden_prefix(state)
+    hidden = normalized_hidden_prefix(state)
+    apply_macro_chain = _apply_macro_chain
+    state_key = _canonical_state_key
+    if profile is not None:
+        apply_macro_chain = profile.timed("apply_macro_chain", _apply_macro_chain)
+        state_key = profile.timed("canonical_state_key", _canonical_state_key)
 
     for s_idx, stack in enumerate(state.stacks):
         for idx in _valid_move_starts(stack, hidden[s_idx]):
             if policy.lock_same_suit_runs and _splits_same_suit_run(stack, hidden[s_idx], idx):
+                if profile is not None:
+                    profile.prune("lock_same_suit_runs")
                 continue
 
             moved_len = len(stack) - idx
             dests = _legal_destinations(state, s_idx, idx)
-            dests = _filter_destinations_by_policy(state, s_idx, idx, dests, moved_len, policy)
+            dests = _filter_destinations_by_policy(state, s_idx, idx, dests, moved_len, policy, profile)
 
             used_empty_dest = False
             for d_idx in dests:
                 if policy.taboo_immediate_reverse and _is_immediate_reverse(
                     state, last_action, s_idx, idx, d_idx, moved_len
                 ):
+                    if profile is not None:
+                        profile.prune("taboo_reverse")
                     continue
                 if policy.limit_empty_destinations_per_move and len(state.stacks[d_idx]) == 0:
                     if used_empty_dest:
+                        if profile is not None:
+                            profile.prune("empty_destination_limit")
                         continue
                     used_empty_dest = True
                 tr = _apply_move(state, s_idx, idx, d_idx)
-                macro_state, macro_freed, macro_steps, macro_actions = _apply_macro_chain(tr.state, policy, tr.action)
+                macro_state, macro_freed, macro_steps, macro_actions = apply_macro_chain(tr.state, policy, tr.action)
+                if profile is not None:
+                    profile.record_macro_chain(macro_steps)
                 if macro_steps > 0:
                     tr = _Transition(
                         action=tr.action,
@@ -670,7 +802,7 @@ def _iter_transitions(
                         macro_steps=macro_steps,
                         macro_actions=macro_actions,
                     )
-                key = _canonical_state_key(tr.state)
+                key = state_key(tr.state)
                 tr = _Transition(
                     action=tr.action,
                     state=tr.state,
@@ -689,12 +821,16 @@ def _iter_transitions(
     allow_deal = True
     if policy.defer_deal_until_no_moves and generated_move_count > 0:
         allow_deal = False
+        if profile is not None and state.base:
+            profile.prune("deferred_deal")
     if allow_deal:
         deal_transition = _apply_deal(state)
         if deal_transition is not None:
-            macro_state, macro_freed, macro_steps, macro_actions = _apply_macro_chain(
+            macro_state, macro_freed, macro_steps, macro_actions = apply_macro_chain(
                 deal_transition.state, policy, deal_transition.action
             )
+            if profile is not None:
+                profile.record_macro_chain(macro_steps)
             if macro_steps > 0:
                 deal_transition = _Transition(
                     action=deal_transition.action,
@@ -705,7 +841,7 @@ def _iter_transitions(
                     macro_steps=macro_steps,
                     macro_actions=macro_actions,
                 )
-            key = _canonical_state_key(deal_transition.state)
+            key = state_key(deal_transition.state)
             deal_transition = _Transition(
                 action=deal_transition.action,
                 state=deal_transition.state,
@@ -772,8 +908,11 @@ def _build_stage_plan(suits: Optional[int]) -> tuple[SearchStage, ...]:
 def _allocate_stage_limits(base: SearchLimits, stage: SearchStage) -> SearchLimits:
     return SearchLimits(
         max_nodes=max(2_000, int(base.max_nodes * stage.node_share)),
-        max_seconds=max(0.05, base.max_seconds * stage.time_share),
+        # Deterministic stages share the whole safety cap; the caller passes what is left of it.
+        max_seconds=(base.max_seconds if base.deterministic else max(0.05, base.max_seconds * stage.time_share)),
         max_frontier=max(10_000, int(base.max_frontier * stage.frontier_share)),
+        max_rss_mb=base.max_rss_mb,
+        deterministic=base.deterministic,
     )
 
 
@@ -781,10 +920,12 @@ def _run_staged_search(
     initial_state: SolverState,
     limits: SearchLimits,
     suits: Optional[int],
+    instrument: bool = False,
 ) -> tuple[SolveResult, list[dict], str]:
     stages = _build_stage_plan(suits)
     stage_details: list[dict] = []
     final_result: Optional[SolveResult] = None
+    profile = SearchProfile() if instrument else None
     final_stage = stages[-1].name
     totals = {
         "expanded_nodes": 0,
@@ -799,9 +940,14 @@ def _run_staged_search(
         "weighted_branching_den": 0,
     }
 
+    cap_start = time.perf_counter()
     for stage in stages:
         stage_limits = _allocate_stage_limits(limits, stage)
-        result = solve_state(initial_state, limits=stage_limits, policy=stage.policy)
+        if limits.deterministic:
+            stage_limits = replace(stage_limits, max_seconds=limits.max_seconds - (time.perf_counter() - cap_start))
+        result = solve_state(initial_state, limits=stage_limits, policy=stage.policy, instrument=instrument)
+        if profile is not None and result.profile is not None:
+            profile.merge(result.profile)
         stage_details.append(
             {
                 "name": stage.name,
@@ -827,7 +973,7 @@ def _run_staged_search(
         totals["weighted_branching_den"] += max(1, result.expanded_nodes)
         final_result = result
         final_stage = stage.name
-        if result.status in ("solved", "proven_unsolvable"):
+        if result.status in ("solved", "proven_unsolvable", "memory_limit") or result.stop_reason == "time_cap":
             break
 
     assert final_result is not None
@@ -848,6 +994,8 @@ def _run_staged_search(
         solution_revealed=final_result.solution_revealed,
         solution_freed=final_result.solution_freed,
         solution_deals=final_result.solution_deals,
+        profile=profile,
+        decision_points=final_result.decision_points,
     )
     return merged, stage_details, final_stage
 
@@ -855,9 +1003,8 @@ def _run_staged_search(
 def _reconstruct(
     goal: SolverState,
     parent: dict[SolverState, tuple[Optional[SolverState], Optional[_Transition]]],
-) -> tuple[tuple[Action, ...], tuple[SolverState, ...], int, int, int]:
-    segments: list[tuple[Action, ...]] = []
-    states: list[SolverState] = [goal]
+) -> tuple[tuple[Action, ...], tuple[SolverState, ...], tuple[int, ...], int, int, int]:
+    transitions: list[_Transition] = []
     revealed = 0
     freed = 0
 
@@ -866,33 +1013,225 @@ def _reconstruct(
         prev, tr = parent[cur]
         if prev is None or tr is None:
             break
-        segment = (tr.action,) + tr.macro_actions
-        segments.append(segment)
-        states.append(prev)
+        transitions.append(tr)
         revealed += tr.revealed
         freed += tr.freed
         cur = prev
 
-    segments.reverse()
+    transitions.reverse()
     actions: list[Action] = []
+    states: list[SolverState] = [cur]
+    decisions: list[int] = []
     deals = 0
-    for segment in segments:
+    for tr in transitions:
+        decisions.append(len(states) - 1)
+        segment = (tr.action,) + tr.macro_actions
+        # Replay macro chains so there is one state per action, like refined plans.
+        for action in segment[:-1]:
+            states.append(apply_action(states[-1], action).state)
+        states.append(tr.state)
         actions.extend(segment)
-        for action in segment:
-            if action.kind == "DEAL":
-                deals += 1
-    states.reverse()
-    return tuple(actions), tuple(states), revealed, freed, deals
+        deals += sum(1 for action in segment if action.kind == "DEAL")
+    return tuple(actions), tuple(states), tuple(decisions), revealed, freed, deals
+
+
+def exact_state_key(state: SolverState) -> tuple:
+    return state.base, state.stacks, normalized_hidden_prefix(state), state.finished_count
+
+
+def apply_action(state: SolverState, action: Action) -> Optional[_Transition]:
+    if action.kind == "DEAL":
+        return _apply_deal(state)
+    if not _can_move(state, action.src_stack, action.src_idx, action.dest_stack):
+        return None
+    return _apply_move(state, action.src_stack, action.src_idx, action.dest_stack)
+
+
+def _single_step_transitions(state: SolverState) -> list[_Transition]:
+    """All legal single actions, without policy filtering or macro chains."""
+    out: list[_Transition] = []
+    hidden = normalized_hidden_prefix(state)
+    for s_idx, stack in enumerate(state.stacks):
+        for idx in _valid_move_starts(stack, hidden[s_idx]):
+            for d_idx in _legal_destinations(state, s_idx, idx):
+                out.append(_apply_move(state, s_idx, idx, d_idx))
+    deal = _apply_deal(state)
+    if deal is not None:
+        out.append(deal)
+    return out
+
+
+def _shorten_pass(
+    states: tuple[SolverState, ...],
+    actions: tuple[Action, ...],
+    deadline: Optional[float],
+) -> Optional[tuple[tuple[Action, ...], tuple[SolverState, ...]]]:
+    last_index = {exact_state_key(state): idx for idx, state in enumerate(states)}
+    out_actions: list[Action] = []
+    out_states: list[SolverState] = [states[0]]
+    n = len(actions)
+    i = 0
+    while i < n:
+        # Revisited state: drop the loop in between.
+        jump_to = last_index[exact_state_key(states[i])]
+        via: Optional[_Transition] = None
+        if deadline is None or time.perf_counter() < deadline:
+            for tr in _single_step_transitions(states[i]):
+                k = last_index.get(exact_state_key(tr.state))
+                if k is not None and k > jump_to + 1:
+                    jump_to, via = k, tr
+        if via is not None:
+            out_actions.append(via.action)
+            out_states.append(states[jump_to])
+            i = jump_to
+            continue
+        i = jump_to
+        if i >= n:
+            break
+        out_actions.append(actions[i])
+        out_states.append(states[i + 1])
+        i += 1
+
+    if len(out_actions) >= n:
+        return None
+    return tuple(out_actions), tuple(out_states)
+
+
+def _replay_actions(initial_state: SolverState, actions: tuple[Action, ...]) -> tuple[SolverState, ...]:
+    states: list[SolverState] = [initial_state]
+    for action in actions:
+        tr = apply_action(states[-1], action)
+        if tr is None:
+            raise ValueError(f"action {action.to_notation()} does not apply to the replayed state")
+        states.append(tr.state)
+    return tuple(states)
+
+
+def shorten_solution(
+    initial_state: SolverState,
+    solution: Iterable[Action],
+    deadline: Optional[float] = None,
+) -> tuple[tuple[Action, ...], tuple[SolverState, ...]]:
+    """
+    Splice detours out of a solution path.
+
+    Each pass drops loops back to an already visited state and replaces a
+    stretch of actions with one action when that reaches a later path state
+    directly. Passes repeat until nothing improves or ``deadline``
+    (a ``time.perf_counter()`` value) passes. Returned states hold one entry
+    per action, starting with ``initial_state``.
+    """
+
+    actions = tuple(solution)
+    path = (actions, _replay_actions(initial_state, actions))
+    while deadline is None or time.perf_counter() < deadline:
+        shorter = _shorten_pass(path[1], path[0], deadline)
+        if shorter is None:
+            break
+        path = shorter
+    return path
+
+
+def _path_summary(states: tuple[SolverState, ...], actions: tuple[Action, ...]) -> tuple[int, int, int]:
+    revealed = 0
+    freed = 0
+    deals = 0
+    for state, action in zip(states, actions):
+        tr = apply_action(state, action)
+        assert tr is not None
+        revealed += tr.revealed
+        freed += tr.freed
+        if action.kind == "DEAL":
+            deals += 1
+    return revealed, freed, deals
+
+
+def shorten_result(initial_state: SolverState, result: SolveResult, deadline: Optional[float] = None) -> SolveResult:
+    """A copy of a solved ``result`` with its plan put through :func:`shorten_solution` and the path counts redone."""
+    solution, solution_states = shorten_solution(initial_state, result.solution, deadline)
+    revealed, freed, deals = _path_summary(solution_states, solution)
+    return replace(
+        result,
+        solution=solution,
+        solution_states=solution_states,
+        solution_revealed=revealed,
+        solution_freed=freed,
+        solution_deals=deals,
+        decision_points=None,
+    )
+
+
+def _refine_anytime(
+    initial_state: SolverState,
+    first: SolveResult,
+    limits: SearchLimits,
+    policy: SearchPolicy,
+    depth_weight: int,
+    start: float,
+) -> SolveResult:
+    deadline = start + limits.max_seconds
+    best = first
+    expanded = first.expanded_nodes
+    generated = first.generated_nodes
+    weight = depth_weight
+    while len(best.solution) > 1 and expanded < limits.max_nodes:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        weight *= 2
+        attempt = solve_state(
+            initial_state,
+            limits=replace(limits, max_nodes=limits.max_nodes - expanded, max_seconds=remaining),
+            policy=policy,
+            depth_weight=weight,
+            max_solution_len=len(best.solution),
+        )
+        expanded += attempt.expanded_nodes
+        generated += attempt.generated_nodes
+        if attempt.status != "solved":
+            # Nothing shorter at this weight, or the budget ran out.
+            break
+        best = attempt
+
+    return replace(
+        shorten_result(initial_state, replace(first, solution=best.solution), deadline),
+        expanded_nodes=expanded,
+        generated_nodes=generated,
+        elapsed_ms=(time.perf_counter() - start) * 1000.0,
+    )
 
 
 def solve_state(
     initial_state: SolverState,
     limits: SearchLimits = SearchLimits(),
     policy: SearchPolicy = DEFAULT_POLICY,
+    instrument: bool = False,
+    anytime: bool = False,
+    depth_weight: int = 4,
+    max_solution_len: Optional[int] = None,
 ) -> SolveResult:
-    """Search for a solution with strict duplicate-state elimination."""
+    """Search for a solution with strict duplicate-state elimination.
+
+    With ``instrument=True`` the result carries a :class:`SearchProfile`;
+    otherwise the hot loop runs without any bookkeeping.
+
+    With ``anytime=True`` the first solution found is refined within the
+    remaining budget: weighted restarts with a growing ``depth_weight`` that
+    prune paths not shorter than the best so far, until one finds nothing
+    shorter, then :func:`shorten_solution`.
+    """
 
     start = time.perf_counter()
+    profile = SearchProfile() if instrument else None
+    iter_transitions = _iter_transitions
+    potential = state_potential
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    if profile is not None:
+        iter_transitions = profile.timed("iter_transitions", _iter_transitions)
+        potential = profile.timed("state_potential", state_potential)
+        heappush = profile.timed("heap_push", heapq.heappush)
+        heappop = profile.timed("heap_pop", heapq.heappop)
 
     if _is_goal(initial_state):
         return SolveResult(
@@ -912,6 +1251,7 @@ def solve_state(
             solution_revealed=0,
             solution_freed=0,
             solution_deals=0,
+            profile=profile,
         )
 
     counter = 0
@@ -919,8 +1259,10 @@ def solve_state(
     seen_keys: set[StateKey] = {_canonical_state_key(initial_state)}
 
     frontier: list[tuple[int, int, int, SolverState]] = []
-    initial_prio = -_state_potential(initial_state)
-    heapq.heappush(frontier, (initial_prio, counter, 0, initial_state))
+    # Action counts per state, only tracked when a length bound is given.
+    path_len: Optional[dict[SolverState, int]] = {initial_state: 0} if max_solution_len is not None else None
+    initial_prio = -potential(initial_state)
+    heappush(frontier, (initial_prio, counter, 0, initial_state))
 
     expanded = 0
     generated = 1
@@ -930,24 +1272,32 @@ def solve_state(
     max_depth = 0
     total_branching = 0
     hit_limits = False
+    hit_memory = False
+    hit_time_cap = False
+    rss_limit = int(limits.max_rss_mb * 1024 * 1024)
+    rss_base = _rss_bytes() if rss_limit else 0
 
     while frontier:
         if expanded >= limits.max_nodes:
             hit_limits = True
             break
+        if rss_limit and (expanded & _RSS_CHECK_MASK) == 0 and _rss_bytes() - rss_base > rss_limit:
+            hit_memory = True
+            break
         if (time.perf_counter() - start) >= limits.max_seconds:
             hit_limits = True
+            hit_time_cap = limits.deterministic
             break
         if len(frontier) > limits.max_frontier:
             hit_limits = True
             break
 
-        _, _, depth, state = heapq.heappop(frontier)
+        _, _, depth, state = heappop(frontier)
 
         if _is_goal(state):
-            solution, solution_states, revealed, freed, deals = _reconstruct(state, parent)
+            solution, solution_states, decision_points, revealed, freed, deals = _reconstruct(state, parent)
             elapsed_ms = (time.perf_counter() - start) * 1000.0
-            return SolveResult(
+            result = SolveResult(
                 status="solved",
                 stop_reason="goal_reached",
                 solution=solution,
@@ -964,10 +1314,15 @@ def solve_state(
                 solution_revealed=revealed,
                 solution_freed=freed,
                 solution_deals=deals,
+                profile=profile,
+                decision_points=decision_points,
             )
+            if anytime:
+                return _refine_anytime(initial_state, result, limits, policy, depth_weight, start)
+            return result
 
         incoming = parent[state][1].action if parent[state][1] is not None else None
-        transitions = _iter_transitions(state, policy=policy, last_action=incoming)
+        transitions = iter_transitions(state, policy=policy, last_action=incoming, profile=profile)
         expanded += 1
         total_branching += len(transitions)
 
@@ -979,7 +1334,16 @@ def solve_state(
             key = tr.state_key if tr.state_key is not None else _canonical_state_key(tr.state)
             if key in seen_keys:
                 duplicates += 1
+                if profile is not None:
+                    profile.record_child(depth + 1, duplicate=True)
                 continue
+            if path_len is not None:
+                child_len = path_len[state] + 1 + tr.macro_steps
+                if child_len >= max_solution_len:
+                    continue
+                path_len[tr.state] = child_len
+            if profile is not None:
+                profile.record_child(depth + 1, duplicate=False)
 
             seen_keys.add(key)
             parent[tr.state] = (state, tr)
@@ -987,14 +1351,20 @@ def solve_state(
             max_depth = max(max_depth, next_depth)
 
             counter += 1
-            prio = next_depth * 4 - _state_potential(tr.state) - tr.priority
-            heapq.heappush(frontier, (prio, counter, next_depth, tr.state))
+            prio = next_depth * depth_weight - potential(tr.state) - tr.priority
+            heappush(frontier, (prio, counter, next_depth, tr.state))
             generated += 1
 
         if len(frontier) > max_frontier:
             max_frontier = len(frontier)
 
-    if hit_limits:
+    if hit_memory:
+        status = "memory_limit"
+        stop_reason = "memory_limit"
+    elif hit_time_cap:
+        status = "unknown"
+        stop_reason = "time_cap"
+    elif hit_limits:
         status = "unknown"
         stop_reason = "limits_reached"
     else:
@@ -1022,27 +1392,147 @@ def solve_state(
         solution_revealed=0,
         solution_freed=0,
         solution_deals=0,
+        profile=profile,
+    )
+
+
+def plan_result(
+    actions: tuple[Action, ...],
+    states: tuple[SolverState, ...],
+    stop_reason: str,
+    expanded: int,
+    generated: int,
+    start: float,
+) -> SolveResult:
+    revealed, freed, deals = _path_summary(states, actions)
+    return SolveResult(
+        status="solved",
+        stop_reason=stop_reason,
+        solution=actions,
+        solution_states=states,
+        expanded_nodes=expanded,
+        generated_nodes=generated,
+        unique_states=generated,
+        max_frontier=0,
+        dead_end_nodes=0,
+        duplicate_states_skipped=0,
+        avg_branching=(generated / expanded) if expanded > 0 else 0.0,
+        elapsed_ms=(time.perf_counter() - start) * 1000.0,
+        max_depth=len(actions),
+        solution_revealed=revealed,
+        solution_freed=freed,
+        solution_deals=deals,
     )
 
 
+def resolve_state(
+    state: SolverState,
+    previous: Optional[SolveResult],
+    limits: SearchLimits = SearchLimits(),
+    policy: SearchPolicy = DEFAULT_POLICY,
+    max_local_nodes: int = 5_000,
+) -> SolveResult:
+    """
+    Re-solve after the position drifted away from a previous plan.
+
+    If ``state`` lies on the previous plan its remaining suffix is returned.
+    Otherwise a small breadth-first search (at most ``max_local_nodes``
+    expansions, inside the time budget) looks for the nearest plan state and
+    bridges to it. Only when that fails does a full :func:`solve_state` run.
+    Reconnected results report ``stop_reason="plan_reconnected"``.
+    """
+
+    start = time.perf_counter()
+    if previous is None or previous.status != "solved" or not previous.solution_states:
+        return solve_state(state, limits=limits, policy=policy)
+
+    plan_actions = previous.solution
+    plan_states = _replay_actions(previous.solution_states[0], plan_actions)
+    plan_index = {exact_state_key(plan_state): idx for idx, plan_state in enumerate(plan_states)}
+
+    key = exact_state_key(state)
+    hit = plan_index.get(key)
+    if hit is not None:
+        return plan_result(plan_actions[hit:], plan_states[hit:], "plan_reconnected", 0, 1, start)
+
+    deadline = start + limits.max_seconds
+    parent: dict[tuple, tuple[Optional[tuple], Optional[Action], SolverState]] = {key: (None, None, state)}
+    queue: deque[tuple] = deque([key])
+    expanded = 0
+    while queue and expanded < max_local_nodes and time.perf_counter() < deadline:
+        cur_key = queue.popleft()
+        expanded += 1
+        for tr in _single_step_transitions(parent[cur_key][2]):
+            next_key = exact_state_key(tr.state)
+            if next_key in parent:
+                continue
+            parent[next_key] = (cur_key, tr.action, tr.state)
+            hit = plan_index.get(next_key)
+            if hit is None:
+                queue.append(next_key)
+                continue
+
+            bridge_actions: list[Action] = []
+            bridge_states: list[SolverState] = []
+            walk: Optional[tuple] = next_key
+            while walk is not None:
+                prev_key, action, walk_state = parent[walk]
+                bridge_states.append(walk_state)
+                if action is not None:
+                    bridge_actions.append(action)
+                walk = prev_key
+            bridge_actions.reverse()
+            bridge_states.reverse()
+            return plan_result(
+                tuple(bridge_actions) + plan_actions[hit:],
+                tuple(bridge_states[:-1]) + plan_states[hit:],
+                "plan_reconnected",
+                expanded,
+                len(parent),
+                start,
+            )
+
+    remaining = max(0.0, deadline - time.perf_counter())
+    return solve_state(state, limits=replace(limits, max_seconds=remaining), policy=policy)
+
+
 def _count_legal_actions(state: SolverState) -> int:
     total = 0
     stacks = state.stacks
-    hidden = _normalized_hidden_prefix(state)
+    hidden = normalized_hidden_prefix(state)
     for s_idx, stack in enumerate(stacks):
         for idx in _valid_move_starts(stack, hidden[s_idx]):
-            src_num = _card_num(stack[idx])
+            src_num = card_num(stack[idx])
             for d_idx, dest in enumerate(stacks):
                 if d_idx == s_idx:
                     continue
-                if not dest or _card_num(dest[-1]) == src_num + 1:
+                if not dest or card_num(dest[-1]) == src_num + 1:
                     total += 1
     if state.base:
         total += 1
     return total
 
 
-def _difficulty_band(score: float) -> str:
+# Linear weights of the difficulty score, in the order components are stored.
+DIFFICULTY_WEIGHTS = {
+    "expanded_nodes": 1.0,
+    "solution_len": 420.0,
+    "deal_count": 9_000.0,
+    "avg_branching": 1_600.0,
+    "forced_pct": 2_600.0,
+    "dead_pct": 1_800.0,
+    "pressure_pct": 1_200.0,
+    "suit_factor": 15_000.0,
+}
+DIFFICULTY_COMPONENTS = tuple(DIFFICULTY_WEIGHTS)
+
+
+def difficulty_score(components: dict[str, float]) -> float:
+    # Keep score as a large raw value; downstream bucketing uses quantiles.
+    return max(0.0, sum(weight * float(components[name]) for name, weight in DIFFICULTY_WEIGHTS.items()))
+
+
+def difficulty_band(score: float) -> str:
     if score < 80_000.0:
         return "Easy"
     if score < 220_000.0:
@@ -1057,13 +1547,14 @@ def analyze_state(
     limits: SearchLimits = SearchLimits(),
     policy: SearchPolicy = DEFAULT_POLICY,
     staged: bool = True,
+    instrument: bool = False,
 ) -> AnalyzeResult:
     """Run solver and estimate difficulty from search metrics."""
 
     if staged:
-        solved, stage_details, final_stage = _run_staged_search(initial_state, limits, suits)
+        solved, stage_details, final_stage = _run_staged_search(initial_state, limits, suits, instrument=instrument)
     else:
-        solved = solve_state(initial_state, limits, policy=policy)
+        solved = solve_state(initial_state, limits, policy=policy, instrument=instrument)
         stage_details = [
             {
                 "name": "single",
@@ -1092,9 +1583,13 @@ def analyze_state(
         "final_stage": final_stage,
         "stages": stage_details,
     }
+    if solved.profile is not None:
+        metrics["profile"] = solved.profile.to_dict()
 
     if solved.status == "solved":
-        legal_counts = [_count_legal_actions(state) for state in solved.solution_states[:-1]]
+        states = solved.solution_states
+        points = solved.decision_points if solved.decision_points is not None else range(len(states) - 1)
+        legal_counts = [_count_legal_actions(states[i]) for i in points]
         if legal_counts:
             avg_legal = sum(legal_counts) / len(legal_counts)
             forced_ratio = sum(1 for n in legal_counts if n == 1) / len(legal_counts)
@@ -1113,19 +1608,18 @@ def analyze_state(
         branching = float(solved.avg_branching)
         deal_count = float(solved.solution_deals)
 
-        # Keep score as a large raw value; downstream bucketing uses quantiles.
-        score = (
-            expanded_nodes
-            + 420.0 * solution_len
-            + 9_000.0 * deal_count
-            + 1_600.0 * branching
-            + 2_600.0 * forced_pct
-            + 1_800.0 * dead_pct
-            + 1_200.0 * pressure_pct
-            + 15_000.0 * suit_factor
-        )
-        score = max(0.0, score)
-        band = _difficulty_band(score)
+        components = {
+            "expanded_nodes": expanded_nodes,
+            "solution_len": solution_len,
+            "deal_count": deal_count,
+            "avg_branching": branching,
+            "forced_pct": forced_pct,
+            "dead_pct": dead_pct,
+            "pressure_pct": pressure_pct,
+            "suit_factor": float(suit_factor),
+        }
+        score = difficulty_score(components)
+        band = difficulty_band(score)
 
         metrics.update(
             {
@@ -1136,16 +1630,8 @@ def analyze_state(
                 "avg_legal_on_path": round(avg_legal, 4),
                 "forced_ratio": round(forced_ratio, 4),
                 "dead_end_ratio": round(dead_ratio, 4),
-                "difficulty_components": {
-                    "expanded_nodes": round(expanded_nodes, 3),
-                    "solution_len": round(solution_len, 3),
-                    "deal_count": round(deal_count, 3),
-                    "avg_branching": round(branching, 4),
-                    "forced_pct": round(forced_pct, 4),
-                    "dead_pct": round(dead_pct, 4),
-                    "pressure_pct": round(pressure_pct, 4),
-                    "suit_factor": round(suit_factor, 4),
-                },
+                # Unrounded, so stored components reproduce the score exactly.
+                "difficulty_components": components,
             }
         )
 
@@ -1188,7 +1674,7 @@ def analyze_state(
     return AnalyzeResult(
         seed=seed,
         suits=suits,
-        status="unknown",
+        status="memory_limit" if solved.status == "memory_limit" else "unknown",
         solvable=None,
         proven=False,
         difficulty_score=None,
@@ -1204,12 +1690,25 @@ def analyze_seed(
     limits: SearchLimits = SearchLimits(),
     policy: SearchPolicy = DEFAULT_POLICY,
     staged: bool = True,
+    instrument: bool = False,
 ) -> AnalyzeResult:
+    start = time.perf_counter()
     cfg = GameConfig()
     cfg.seed = seed
     cfg.suits = suits
     state = build_initial_state(cfg)
-    return analyze_state(initial_state=state, suits=suits, seed=seed, limits=limits, policy=policy, staged=staged)
+    result = analyze_state(
+        initial_state=state,
+        suits=suits,
+        seed=seed,
+        limits=limits,
+        policy=policy,
+        staged=staged,
+        instrument=instrument,
+    )
+    # Dealing included, unlike the search-only elapsed_ms.
+    result.metrics["wall_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+    return result
 
 
 def analyze_seeds(
@@ -1218,34 +1717,149 @@ def analyze_seeds(
     limits: SearchLimits = SearchLimits(),
     policy: SearchPolicy = DEFAULT_POLICY,
     staged: bool = True,
-) -> list[AnalyzeResult]:
-    return [analyze_seed(seed=seed, suits=suits, limits=limits, policy=policy, staged=staged) for seed in seeds]
+    instrument: bool = False,
+    workers: int = 1,
+    inflight_per_worker: int = 2,
+    stop: Optional[Callable[[AnalyzeResult], bool]] = None,
+) -> Iterator[AnalyzeResult]:
+    """
+    Analyze seeds lazily, yielding each result as soon as it is ready.
+
+    With ``workers > 1`` seeds run in a process pool with at most
+    ``inflight_per_worker * workers`` tasks in flight, so results arrive in
+    completion order. Once ``stop`` returns true for a yielded result, or the
+    iterator is closed, queued seeds are cancelled; only seeds already
+    running are waited for.
+    """
+
+    if workers <= 1:
+        for seed in seeds:
+            result = analyze_seed(seed=seed, suits=suits, limits=limits, policy=policy, staged=staged, instrument=instrument)
+            yield result
+            if stop is not None and stop(result):
+                return
+        return
+
+    exe = make_worker_pool(workers)
+    seed_iter = iter(seeds)
+    window = workers * max(1, inflight_per_worker)
+    pending = set()
+
+    def fill() -> None:
+        while len(pending) < window:
+            seed = next(seed_iter, None)
+            if seed is None:
+                return
+            pending.add(exe.submit(analyze_seed, seed, suits, limits, policy, staged, instrument))
+
+    try:
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                result = fut.result()
+                yield result
+                if stop is not None and stop(result):
+                    return
+            fill()
+    finally:
+        exe.shutdown(wait=True, cancel_futures=True)
+
+
+def _parse_seed_range(text: str) -> range:
+    try:
+        start, end = (int(part) for part in text.split(":", 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START:END, got {text!r}")
+    if end < start:
+        raise argparse.ArgumentTypeError(f"empty seed range {text!r}")
+    return range(start, end)
+
+
+def read_seed_file(path: str) -> Iterator[int]:
+    """Seeds separated by whitespace or commas; ``#`` starts a comment; ``-`` reads stdin."""
+    stream = sys.stdin if path == "-" else Path(path).expanduser().open("r", encoding="utf-8")
+    try:
+        for line in stream:
+            for token in line.split("#", 1)[0].replace(",", " ").split():
+                yield int(token)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _iter_cli_seeds(args: argparse.Namespace) -> Iterator[int]:
+    yield from args.seed or ()
+    for seed_range in args.seed_range or ():
+        yield from seed_range
+    for path in args.seed_file or ():
+        yield from read_seed_file(path)
 
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Analyze Spider seed solvability and difficulty.")
-    parser.add_argument("--seed", type=int, action="append", required=True, help="Seed to analyze; can be repeated.")
+    parser.add_argument("--seed", type=int, action="append", help="Seed to analyze; can be repeated.")
+    parser.add_argument(
+        "--seed-range",
+        type=_parse_seed_range,
+        action="append",
+        help="Seed range START:END (end exclusive); can be repeated.",
+    )
+    parser.add_argument(
+        "--seed-file",
+        action="append",
+        help="File with seeds (whitespace/comma separated, '-' for stdin); can be repeated.",
+    )
     parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), default=4, help="Suit count.")
     parser.add_argument("--max-nodes", type=int, default=200_000, help="Search node limit.")
     parser.add_argument("--max-seconds", type=float, default=2.0, help="Search time limit in seconds.")
     parser.add_argument("--max-frontier", type=int, default=500_000, help="Search frontier size limit.")
+    parser.add_argument("--max-rss-mb", type=float, default=0.0, help="Abort a seed whose search grows RSS by more than this many MiB. 0 disables.")
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Budget by --max-nodes only; --max-seconds becomes a safety cap reported as reason time_cap.",
+    )
     parser.add_argument("--single-stage", action="store_true", help="Disable staged widening search.")
+    parser.add_argument("--instrument", action="store_true", help="Collect per-phase search profile in metrics.")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel worker processes.")
+    parser.add_argument("--jsonl", action="store_true", help="Emit one JSON line per seed as results complete.")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print json output.")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not (args.seed or args.seed_range or args.seed_file):
+        parser.error("one of --seed, --seed-range or --seed-file is required")
+    return args
 
 
 def main() -> None:
     args = _parse_args()
-    limits = SearchLimits(max_nodes=args.max_nodes, max_seconds=args.max_seconds, max_frontier=args.max_frontier)
+    limits = SearchLimits(
+        max_nodes=args.max_nodes,
+        max_seconds=args.max_seconds,
+        max_frontier=args.max_frontier,
+        max_rss_mb=args.max_rss_mb,
+        deterministic=args.deterministic,
+    )
     results = analyze_seeds(
-        args.seed,
+        _iter_cli_seeds(args),
         suits=args.suits,
         limits=limits,
         policy=DEFAULT_POLICY,
         staged=not args.single_stage,
+        instrument=args.instrument,
+        workers=max(1, args.workers),
     )
 
+    if args.jsonl:
+        for result in results:
+            print(json.dumps(result.to_dict(), ensure_ascii=False), flush=True)
+        return
+
     payload = [result.to_dict() for result in results]
+    if args.workers > 1:
+        # Completion order is arbitrary; keep the document stable.
+        payload.sort(key=lambda item: item["seed"])
     if len(payload) == 1:
         payload = payload[0]
 
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from solver.quantile_sketch import KllSketch
+
+
+class BuildTelemetry:
+    """
+    Throughput counters for a running pool build.
+
+    Rows are fed in completion order via :meth:`record`; :meth:`snapshot`
+    reports overall and rolling seeds/sec, per-status rates, worker
+    utilization (analysis time over wall time times workers), ``elapsed_ms``
+    percentiles from a quantile sketch, and an ETA from the rolling rate.
+    """
+
+    def __init__(self, total: int, workers: int, window_sec: float = 60.0):
+        self.total = max(0, int(total))
+        self.workers = max(1, int(workers))
+        self.window_sec = max(1.0, float(window_sec))
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.done = 0
+        self.busy_ms = 0.0
+        self.by_status: dict[str, int] = {}
+        self.elapsed = KllSketch()
+        self._recent: deque[float] = deque()
+
+    def record(self, status: str, elapsed_ms: float, now: Optional[float] = None) -> None:
+        now = time.perf_counter() if now is None else now
+        self.done += 1
+        self.busy_ms += max(0.0, float(elapsed_ms))
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        self.elapsed.update(float(elapsed_ms))
+        self._recent.append(now)
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._recent and now - self._recent[0] > self.window_sec:
+            self._recent.popleft()
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        now = time.perf_counter() if now is None else now
+        self._trim(now)
+        wall = max(1e-9, now - self.started)
+        overall = self.done / wall
+        rolling = len(self._recent) / min(wall, self.window_sec)
+        remaining = max(0, self.total - self.done)
+        rate = rolling if rolling > 0 else overall
+        percentiles = {}
+        if self.elapsed.count:
+            percentiles = {f"p{int(q * 100)}": round(self.elapsed.quantile(q), 3) for q in (0.5, 0.95, 0.99)}
+        return {
+            "updated_at": time.time(),
+            "started_at": self.started_at,
+            "wall_seconds": round(wall, 3),
+            "done": self.done,
+            "total": self.total,
+            "seeds_per_sec": round(overall, 4),
+            "seeds_per_sec_rolling": round(rolling, 4),
+            "rolling_window_sec": self.window_sec,
+            "status_counts": dict(self.by_status),
+            "status_rates": {k: round(v / max(1, self.done), 4) for k, v in sorted(self.by_status.items())},
+            "workers": self.workers,
+            "worker_utilization": round(min(1.0, self.busy_ms / 1000.0 / (wall * self.workers)), 4),
+            "elapsed_ms": percentiles,
+            "eta_seconds": (round(remaining / rate, 1) if rate > 0 else None),
+        }
+
+    def write_status(self, path: Path, extra: Optional[dict] = None) -> dict:
+        payload = self.snapshot()
+        if extra:
+            payload.update(extra)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(path)
+        return payload
+
+    def write_prometheus(self, path: Path, labels: Optional[dict[str, str]] = None) -> None:
+        """Text exposition format, e.g. for the node_exporter textfile collector."""
+        snap = self.snapshot()
+        base = ",".join(f'{k}="{v}"' for k, v in sorted((labels or {}).items()))
+
+        def sample(name: str, value, extra: str = "") -> str:
+            label_text = ",".join(part for part in (base, extra) if part)
+            return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+        lines = [
+            "# TYPE seed_pool_seeds_done counter",
+            sample("seed_pool_seeds_done", snap["done"]),
+            "# TYPE seed_pool_seeds_total gauge",
+            sample("seed_pool_seeds_total", snap["total"]),
+            "# TYPE seed_pool_seeds_per_second gauge",
+            sample("seed_pool_seeds_per_second", snap["seeds_per_sec"], 'window="overall"'),
+            sample("seed_pool_seeds_per_second", snap["seeds_per_sec_rolling"], 'window="rolling"'),
+            "# TYPE seed_pool_rows counter",
+        ]
+        lines += [sample("seed_pool_rows", count, f'status="{status}"') for status, count in sorted(snap["status_counts"].items())]
+        lines += [
+            "# TYPE seed_pool_worker_utilization gauge",
+            sample("seed_pool_worker_utilization", snap["worker_utilization"]),
+            "# TYPE seed_pool_elapsed_ms gauge",
+        ]
+        lines += [
+            sample("seed_pool_elapsed_ms", value, f'quantile="{int(key[1:]) / 100:g}"')
+            for key, value in snap["elapsed_ms"].items()
+        ]
+        if snap["eta_seconds"] is not None:
+            lines += ["# TYPE seed_pool_eta_seconds gauge", sample("seed_pool_eta_seconds", snap["eta_seconds"])]
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(path)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from base.Core import Card, GameConfig
+from solver.analyzer import (
+    SearchLimits,
+    SolverState,
+    build_initial_state,
+    card_num,
+    normalized_hidden_prefix,
+    ordered_links,
+    solve_state,
+    state_potential,
+)
+
+FEATURES = (
+    "potential",
+    "same_suit_links",
+    "any_suit_links",
+    "buried_kings",
+    "probe_solved",
+    "probe_dead_ratio",
+    "probe_duplicate_ratio",
+    "probe_depth",
+)
+
+DEFAULT_PROBE_NODES = 64
+
+# Prior for log(elapsed_ms) before any refit: probe-solved deals are cheap,
+# deals whose probe hits many dead ends or buried kings are expensive.
+_DEFAULT_WEIGHTS = {
+    "potential": -0.004,
+    "same_suit_links": -0.05,
+    "any_suit_links": -0.02,
+    "buried_kings": 0.15,
+    "probe_solved": -3.0,
+    "probe_dead_ratio": 2.0,
+    "probe_duplicate_ratio": 1.0,
+    "probe_depth": -0.01,
+}
+_DEFAULT_INTERCEPT = 7.0
+
+
+def seed_features(seed: int, suits: int, probe_nodes: int = DEFAULT_PROBE_NODES) -> dict[str, float]:
+    """Cheap features of a deal: static structure plus a tiny probe search."""
+    cfg = GameConfig()
+    cfg.seed = seed
+    cfg.suits = suits
+    return state_features(build_initial_state(cfg), probe_nodes)
+
+
+def state_features(state: SolverState, probe_nodes: int = DEFAULT_PROBE_NODES) -> dict[str, float]:
+    hidden = normalized_hidden_prefix(state)
+    same_suit = 0
+    any_suit = 0
+    buried_kings = 0
+    for i, stack in enumerate(state.stacks):
+        ss, aa = ordered_links(stack)
+        same_suit += ss
+        any_suit += aa
+        # A king above the column bottom can only move to an empty column.
+        buried_kings += sum(1 for card in stack[1 : hidden[i]] if card_num(card) == Card.NUM_PER_SUIT - 1)
+
+    probe = solve_state(state, SearchLimits(max_nodes=max(1, probe_nodes), max_seconds=5.0))
+    expanded = max(1, probe.expanded_nodes)
+    return {
+        "potential": float(state_potential(state)),
+        "same_suit_links": float(same_suit),
+        "any_suit_links": float(any_suit),
+        "buried_kings": float(buried_kings),
+        "probe_solved": 1.0 if probe.status == "solved" else 0.0,
+        "probe_dead_ratio": probe.dead_end_nodes / expanded,
+        "probe_duplicate_ratio": probe.duplicate_states_skipped / max(1, probe.generated_nodes),
+        "probe_depth": float(probe.max_depth),
+    }
+
+
+def features_chunk(seeds: list[int], suits: int, probe_nodes: int) -> list[tuple[int, dict[str, float]]]:
+    return [(seed, seed_features(seed, suits, probe_nodes)) for seed in seeds]
+
+
+@dataclass(slots=True)
+class CostModel:
+    """Log-linear model of a seed's analysis time in milliseconds."""
+
+    weights: dict[str, float] = field(default_factory=lambda: dict(_DEFAULT_WEIGHTS))
+    intercept: float = _DEFAULT_INTERCEPT
+    samples: int = 0
+
+    def predict_ms(self, features: dict[str, float]) -> float:
+        z = self.intercept + sum(w * float(features.get(name, 0.0)) for name, w in self.weights.items())
+        return math.exp(min(30.0, z))
+
+    def to_dict(self) -> dict:
+        return {"weights": dict(self.weights), "intercept": self.intercept, "samples": self.samples}
+
+    @staticmethod
+    def from_dict(data: dict) -> "CostModel":
+        return CostModel(
+            weights={str(k): float(v) for k, v in (data.get("weights") or _DEFAULT_WEIGHTS).items()},
+            intercept=float(data.get("intercept", _DEFAULT_INTERCEPT)),
+            samples=int(data.get("samples", 0)),
+        )
+
+    @staticmethod
+    def load(path: Path) -> "CostModel":
+        """The model at ``path``, or the built-in prior if there is none yet."""
+        try:
+            return CostModel.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except Exception:
+            return CostModel()
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+def default_model_path(suits: int) -> Path:
+    return Path(__file__).resolve().parents[1] / "data" / f"seed_cost_model_{suits}s.json"
+
+
+def solve_linear(a: list[list[float]], b: list[float]) -> list[float]:
+    n = len(b)
+    m = [row[:] + [b[i]] for i, row in enumerate(a)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(m[r][col]))
+        m[col], m[pivot] = m[pivot], m[col]
+        if abs(m[col][col]) < 1e-12:
+            continue
+        for r in range(n):
+            if r != col:
+                f = m[r][col] / m[col][col]
+                for c in range(col, n + 1):
+                    m[r][c] -= f * m[col][c]
+    return [m[i][n] / m[i][i] if abs(m[i][i]) >= 1e-12 else 0.0 for i in range(n)]
+
+
+def fit_model(samples: Iterable[tuple[dict[str, float], float]], ridge: float = 1e-3) -> CostModel:
+    """Ridge least squares of ``log(elapsed_ms)`` on :data:`FEATURES`."""
+    xs: list[list[float]] = []
+    ys: list[float] = []
+    for features, elapsed_ms in samples:
+        xs.append([1.0] + [float(features.get(name, 0.0)) for name in FEATURES])
+        ys.append(math.log(max(1.0, float(elapsed_ms))))
+    if len(xs) <= len(FEATURES):
+        raise ValueError(f"need more than {len(FEATURES)} samples to fit, got {len(xs)}")
+
+    dim = len(FEATURES) + 1
+    ata = [[sum(x[i] * x[j] for x in xs) + (ridge if i == j and i > 0 else 0.0) for j in range(dim)] for i in range(dim)]
+    aty = [sum(x[i] * y for x, y in zip(xs, ys)) for i in range(dim)]
+    coef = solve_linear(ata, aty)
+    return CostModel(weights=dict(zip(FEATURES, coef[1:])), intercept=coef[0], samples=len(xs))
+
+
+def rank_correlation(predicted: list[float], actual: list[float]) -> float:
+    """Spearman correlation, used to judge how well a model orders seeds."""
+    n = len(predicted)
+    if n < 2:
+        return 0.0
+
+    def ranks(values: list[float]) -> list[float]:
+        order = sorted(range(n), key=lambda i: values[i])
+        out = [0.0] * n
+        for rank, i in enumerate(order):
+            out[i] = float(rank)
+        return out
+
+    rp, ra = ranks(predicted), ranks(actual)
+    d2 = sum((p - a) ** 2 for p, a in zip(rp, ra))
+    return 1.0 - 6.0 * d2 / (n * (n * n - 1))
+
+
+def read_cost_log(path: Path) -> list[dict]:
+    items: list[dict] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(item, dict) and isinstance(item.get("features"), dict) and "elapsed_ms" in item:
+                items.append(item)
+    return items
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refit the seed cost model from a builder cost log.")
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), required=True, help="Suit count.")
+    parser.add_argument("--log", type=str, required=True, help="Cost log JSONL written by seed_pool_builder.")
+    parser.add_argument("--out", type=str, default="", help="Model path. Default: data/seed_cost_model_{suits}s.json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    items = read_cost_log(Path(args.log).expanduser())
+    before = [float(item["predicted_ms"]) for item in items if "predicted_ms" in item]
+    actual = [float(item["elapsed_ms"]) for item in items]
+    model = fit_model((item["features"], item["elapsed_ms"]) for item in items)
+    after = [model.predict_ms(item["features"]) for item in items]
+    out = Path(args.out).expanduser() if args.out else default_model_path(args.suits)
+    model.save(out)
+    if len(before) == len(actual):
+        print(f"rank_correlation logged={rank_correlation(before, actual):.4f}")
+    print(f"rank_correlation refit={rank_correlation(after, actual):.4f} samples={model.samples} out={out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+MAGIC = b"SPDC"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_NAME = struct.Struct("<24s")
+
+
+def components_path(meta_json_path: Path) -> Path:
+    return meta_json_path.with_name(f"{meta_json_path.stem}_components.bin")
+
+
+def write_columns(path: Path, seeds: list[int], columns: dict[str, list[float]]) -> None:
+    """
+    Column-major file: header, column names, uint32 seeds, then one float64
+    array per column, all little-endian.
+    """
+    names = list(columns)
+    head = bytearray(_HEADER.pack(MAGIC, VERSION, len(names), len(seeds)))
+    for name in names:
+        head += _NAME.pack(name.encode("utf-8")[:24])
+    parts = [array("I", seeds)] + [array("d", columns[name]) for name in names]
+    if sys.byteorder != "little":
+        for part in parts:
+            part.byteswap()
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(head)
+        for part in parts:
+            f.write(part.tobytes())
+    tmp.replace(path)
+
+
+def read_columns(path: Path) -> tuple[list[int], dict[str, list[float]]]:
+    """Seeds and per-column values; a missing or foreign file reads as empty."""
+    if not path.exists() or not path.is_file():
+        return [], {}
+    data = path.read_bytes()
+    if len(data) < _HEADER.size:
+        return [], {}
+    magic, version, ncols, nrows = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        return [], {}
+    offset = _HEADER.size
+    names: list[str] = []
+    for _ in range(ncols):
+        names.append(_NAME.unpack_from(data, offset)[0].rstrip(b"\0").decode("utf-8"))
+        offset += _NAME.size
+
+    def take(typecode: str) -> list:
+        nonlocal offset
+        values = array(typecode)
+        size = nrows * values.itemsize
+        values.frombytes(data[offset : offset + size])
+        offset += size
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tolist()
+
+    seeds = take("I")
+    columns = {name: take("d") for name in names}
+    return seeds, columns
+
+
+def weighted_sum(columns: dict[str, list[float]], weights: dict[str, float], rows: Optional[int] = None) -> list[float]:
+    """``max(0, sum(w * column))`` per row, vectorized with NumPy when it is installed."""
+    if rows is None:
+        rows = len(next(iter(columns.values()), []))
+    if np is not None:
+        total = np.zeros(rows, dtype=np.float64)
+        for name, weight in weights.items():
+            total += weight * np.asarray(columns[name], dtype=np.float64)
+        return np.maximum(total, 0.0).tolist()
+    out = [0.0] * rows
+    for name, weight in weights.items():
+        values = columns[name]
+        for i in range(rows):
+            out[i] += weight * values[i]
+    return [max(0.0, value) for value in out]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Executor, TimeoutError, as_completed
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from base.Core import GameConfig
+from solver.analyzer import (
+    DEFAULT_POLICY,
+    Action,
+    SearchLimits,
+    SearchPolicy,
+    SolverState,
+    build_initial_state,
+    normalized_hidden_prefix,
+    solve_state,
+)
+from solver.worker_pool import make_worker_pool
+
+HIDDEN_CARD = -1
+InfoSetKey = tuple
+
+
+@dataclass(slots=True)
+class FairResult:
+    """Aggregated outcome of solving sampled deals of one information set."""
+
+    samples: int
+    solved_samples: int
+    success_rate: float
+    best_action: Optional[Action]
+    action_votes: dict[str, int]
+    elapsed_ms: float
+    cached: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "solved_samples": self.solved_samples,
+            "success_rate": self.success_rate,
+            "best_action": None if self.best_action is None else self.best_action.to_notation(),
+            "action_votes": dict(self.action_votes),
+            "elapsed_ms": self.elapsed_ms,
+            "cached": self.cached,
+        }
+
+
+_CACHE_SIZE = 64
+_cache: OrderedDict[tuple, FairResult] = OrderedDict()
+# One pool shared by every call, so repeated hints do not pay for worker start-up.
+_executor: Optional[Executor] = None
+_executor_workers = 0
+
+
+def information_set_key(state: SolverState) -> InfoSetKey:
+    """Everything a player can know: visible cards, hidden counts and the unseen multiset."""
+    hidden = normalized_hidden_prefix(state)
+    masked = tuple((HIDDEN_CARD,) * hidden[i] + stack[hidden[i] :] for i, stack in enumerate(state.stacks))
+    unseen = tuple(sorted(_unseen_cards(state)))
+    return masked, len(state.base), state.finished_count, unseen
+
+
+def _unseen_cards(state: SolverState) -> list[int]:
+    # Completed suits are removed from play, so the unseen multiset equals
+    # the deck minus everything a player has seen.
+    hidden = normalized_hidden_prefix(state)
+    cards = list(state.base)
+    for i, stack in enumerate(state.stacks):
+        cards.extend(stack[: hidden[i]])
+    return cards
+
+
+def sample_determinization(state: SolverState, rng: random.Random) -> SolverState:
+    """Deal the unseen cards at random into hidden slots and the base."""
+    cards = _unseen_cards(state)
+    rng.shuffle(cards)
+    hidden = normalized_hidden_prefix(state)
+    base = tuple(cards[: len(state.base)])
+    pos = len(state.base)
+    stacks = []
+    for i, stack in enumerate(state.stacks):
+        count = hidden[i]
+        stacks.append(tuple(cards[pos : pos + count]) + stack[count:])
+        pos += count
+    return SolverState(base=base, stacks=tuple(stacks), hidden_prefix=hidden, finished_count=state.finished_count)
+
+
+def _solve_sample(
+    state: SolverState,
+    limits: SearchLimits,
+    policy: SearchPolicy,
+    deadline: float,
+) -> tuple[bool, Optional[Action]]:
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        return False, None
+    result = solve_state(state, limits=replace(limits, max_seconds=min(limits.max_seconds, remaining)), policy=policy)
+    if result.status != "solved":
+        return False, None
+    return True, (result.solution[0] if result.solution else None)
+
+
+def _shared_executor(workers: int) -> Executor:
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        _close_shared_executor()
+        _executor = make_worker_pool(workers)
+        _executor_workers = workers
+    return _executor
+
+
+@atexit.register
+def _close_shared_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def fair_solve(
+    state: SolverState,
+    samples: int = 8,
+    limits: SearchLimits = SearchLimits(),
+    policy: SearchPolicy = DEFAULT_POLICY,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    use_cache: bool = True,
+) -> FairResult:
+    """
+    Solve ``samples`` deals consistent with what the player can see.
+
+    Samples run in a process pool, kept across calls, under one shared
+    deadline of ``limits.max_seconds``; samples still running at the deadline
+    count as unsolved. Solved samples vote for their first action, which is always
+    legal in the real position because it only touches visible cards.
+    Results are cached per information set.
+    """
+
+    started = time.perf_counter()
+    cache_key = (information_set_key(state), samples, limits, policy, seed)
+    if use_cache and cache_key in _cache:
+        _cache.move_to_end(cache_key)
+        return replace(_cache[cache_key], cached=True)
+
+    rng = random.Random(seed)
+    deals = [sample_determinization(state, rng) for _ in range(max(1, samples))]
+    deadline = time.time() + limits.max_seconds
+    if workers is None:
+        workers = min(len(deals), os.cpu_count() or 1)
+
+    outcomes: list[tuple[bool, Optional[Action]]] = []
+    if workers <= 1:
+        outcomes = [_solve_sample(deal, limits, policy, deadline) for deal in deals]
+    else:
+        exe = _shared_executor(workers)
+        futures = [exe.submit(_solve_sample, deal, limits, policy, deadline) for deal in deals]
+        try:
+            for fut in as_completed(futures, timeout=max(0.0, deadline - time.time()) + 1.0):
+                outcomes.append(fut.result())
+        except TimeoutError:
+            # Samples still queued are dropped; running ones stop at the deadline on their own.
+            for fut in futures:
+                fut.cancel()
+        except BrokenExecutor:
+            _close_shared_executor()
+            raise
+
+    votes: dict[str, int] = {}
+    by_notation: dict[str, Action] = {}
+    for _, action in outcomes:
+        if action is None:
+            continue
+        notation = action.to_notation()
+        votes[notation] = votes.get(notation, 0) + 1
+        by_notation[notation] = action
+    best = max(votes, key=lambda k: (votes[k], k), default=None)
+    solved = sum(1 for ok, _ in outcomes if ok)
+    result = FairResult(
+        samples=len(deals),
+        solved_samples=solved,
+        success_rate=round(solved / len(deals), 4),
+        best_action=None if best is None else by_notation[best],
+        action_votes=dict(sorted(votes.items(), key=lambda kv: (-kv[1], kv[0]))),
+        elapsed_ms=round((time.perf_counter() - started) * 1000.0, 3),
+    )
+    if use_cache:
+        _cache[cache_key] = result
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fair (hidden-information) Spider solving by determinization sampling.")
+    parser.add_argument("--seed", type=int, required=True, help="Game seed; only its visible cards are used.")
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), default=4, help="Suit count.")
+    parser.add_argument("--samples", type=int, default=8, help="Sampled deals of unseen cards.")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel workers. Default: one per sample/core.")
+    parser.add_argument("--sample-seed", type=int, default=0, help="RNG seed for sampling.")
+    parser.add_argument("--max-nodes", type=int, default=200_000, help="Per-sample node limit.")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Shared wall-clock deadline in seconds.")
+    parser.add_argument("--max-frontier", type=int, default=500_000, help="Per-sample frontier limit.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cfg = GameConfig()
+    cfg.seed = args.seed
+    cfg.suits = args.suits
+    limits = SearchLimits(max_nodes=args.max_nodes, max_seconds=args.max_seconds, max_frontier=args.max_frontier)
+    result = fair_solve(
+        build_initial_state(cfg),
+        samples=args.samples,
+        limits=limits,
+        workers=args.workers,
+        seed=args.sample_seed,
+    )
+    payload = result.to_dict()
+    payload["seed"] = args.seed
+    payload["suits"] = args.suits
+    print(json.dumps(payload, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
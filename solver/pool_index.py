@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import mmap
+import random
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional
+
+MAGIC = b"SPIX"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+_ENTRY = struct.Struct("<16sII")
+_SEED = struct.Struct("<I")
+
+
+def pool_index_path(meta_json_path: Path) -> Path:
+    return meta_json_path.with_suffix(".idx")
+
+
+def write_pool_index(path: Path, buckets: dict[str, list[int]]) -> None:
+    """
+    Write ``buckets`` as a binary index: a header, one ``(name, offset, count)``
+    entry per bucket, then every bucket's seeds as little-endian uint32.
+    """
+    names = list(buckets)
+    offset = _HEADER.size + _ENTRY.size * len(names)
+    head = bytearray(_HEADER.pack(MAGIC, VERSION, len(names)))
+    body = array("I")
+    for name in names:
+        seeds = array("I", (int(seed) for seed in buckets[name]))
+        head += _ENTRY.pack(name.encode("utf-8")[:16], offset, len(seeds))
+        offset += len(seeds) * _SEED.size
+        body.extend(seeds)
+    if sys.byteorder != "little":
+        body.byteswap()
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(head)
+        f.write(body.tobytes())
+    tmp.replace(path)
+
+
+def _read_entries(buf) -> dict[str, tuple[int, int]]:
+    magic, version, count = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a seed pool index")
+    entries: dict[str, tuple[int, int]] = {}
+    for i in range(count):
+        raw, offset, size = _ENTRY.unpack_from(buf, _HEADER.size + i * _ENTRY.size)
+        entries[raw.rstrip(b"\0").decode("utf-8")] = (offset, size)
+    return entries
+
+
+def pick_seed(path: Path, bucket: str, rng: random.Random | None = None) -> Optional[int]:
+    """Pick a uniform seed from ``bucket`` by reading only the header and one slot."""
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        entry = _read_entries(buf).get(bucket)
+        if entry is None or entry[1] <= 0:
+            return None
+        offset, size = entry
+        i = (rng if rng is not None else random).randrange(size)
+        return int(_SEED.unpack_from(buf, offset + i * _SEED.size)[0])
+
+
+def read_pool_index(path: Path) -> dict[str, list[int]]:
+    data = path.read_bytes()
+    out: dict[str, list[int]] = {}
+    for name, (offset, size) in _read_entries(data).items():
+        seeds = array("I", data[offset : offset + size * _SEED.size])
+        if sys.byteorder != "little":
+            seeds.byteswap()
+        out[name] = seeds.tolist()
+    return out
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import random
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional
+
+from solver.pool_rows import default_output_path, derive_output_paths
+
+MAGIC = b"SPSQ"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+_ENTRY = struct.Struct("<16sII")
+_KEY = struct.Struct("<d")
+_SEED = struct.Struct("<I")
+
+# Section name -> (row status, sort key); each section is sorted by (key, seed).
+SECTIONS = {
+    "score": ("solved", "score"),
+    "solved_ms": ("solved", "elapsed_ms"),
+    "unknown_nodes": ("unknown", "expanded_nodes"),
+}
+
+
+def sorted_index_path(meta_json_path: Path) -> Path:
+    return meta_json_path.with_name(f"{meta_json_path.stem}_sorted.idx")
+
+
+def build_sections(rows: Iterable) -> dict[str, list[tuple[float, int]]]:
+    """``(key, seed)`` pairs per section of :data:`SECTIONS`, sorted ascending."""
+    sections: dict[str, list[tuple[float, int]]] = {name: [] for name in SECTIONS}
+    for row in rows:
+        for name, (status, field) in SECTIONS.items():
+            value = getattr(row, field)
+            if row.status == status and value is not None:
+                sections[name].append((float(value), int(row.seed)))
+    for pairs in sections.values():
+        pairs.sort()
+    return sections
+
+
+def write_sorted_index(path: Path, sections: dict[str, list[tuple[float, int]]]) -> None:
+    """
+    Header, one ``(name, offset, count)`` entry per section, then per section
+    its float64 keys followed by its uint32 seeds, all little-endian.
+    """
+    names = list(sections)
+    offset = _HEADER.size + _ENTRY.size * len(names)
+    head = bytearray(_HEADER.pack(MAGIC, VERSION, len(names)))
+    parts: list[array] = []
+    for name in names:
+        pairs = sections[name]
+        head += _ENTRY.pack(name.encode("utf-8")[:16], offset, len(pairs))
+        offset += len(pairs) * (_KEY.size + _SEED.size)
+        parts.append(array("d", (key for key, _ in pairs)))
+        parts.append(array("I", (seed for _, seed in pairs)))
+    if sys.byteorder != "little":
+        for part in parts:
+            part.byteswap()
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(head)
+        for part in parts:
+            f.write(part.tobytes())
+    tmp.replace(path)
+
+
+class SortedIndex:
+    """Memory-mapped sorted index; lookups read only the header and the slots they probe."""
+
+    def __init__(self, path: Path):
+        self._file = path.open("rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: empty sorted index") from None
+        magic, version, count = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a sorted seed index")
+        self._entries: dict[str, tuple[int, int]] = {}
+        for i in range(count):
+            raw, offset, size = _ENTRY.unpack_from(self._buf, _HEADER.size + i * _ENTRY.size)
+            self._entries[raw.rstrip(b"\0").decode("utf-8")] = (offset, size)
+
+    def __enter__(self) -> "SortedIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buf.close()
+        self._file.close()
+
+    def count(self, section: str) -> int:
+        return self._entries.get(section, (0, 0))[1]
+
+    def key(self, section: str, i: int) -> float:
+        offset, _ = self._entries[section]
+        return _KEY.unpack_from(self._buf, offset + i * _KEY.size)[0]
+
+    def seed(self, section: str, i: int) -> int:
+        offset, size = self._entries[section]
+        return _SEED.unpack_from(self._buf, offset + size * _KEY.size + i * _SEED.size)[0]
+
+    def seeds(self, section: str, lo: int, hi: int) -> list[int]:
+        offset, size = self._entries.get(section, (0, 0))
+        lo, hi = max(0, lo), min(size, hi)
+        if hi <= lo:
+            return []
+        start = offset + size * _KEY.size
+        seeds = array("I", self._buf[start + lo * _SEED.size : start + hi * _SEED.size])
+        if sys.byteorder != "little":
+            seeds.byteswap()
+        return seeds.tolist()
+
+    def bisect(self, section: str, key: float, right: bool = False) -> int:
+        """Position of ``key`` among the section's keys, like :func:`bisect.bisect_left` (or ``_right``)."""
+        lo, hi = 0, self.count(section)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self.key(section, mid)
+            if probe < key or (right and probe == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def ensure_sorted_index(meta_json_path: Path) -> Path:
+    """The pool's sorted index, rebuilt from its rows when missing or older than them."""
+    from solver.seed_pool_builder import load_existing_rows
+
+    _, rows_csv_path = derive_output_paths(meta_json_path)
+    path = sorted_index_path(meta_json_path)
+    source = rows_csv_path if rows_csv_path.exists() else meta_json_path
+    try:
+        if path.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+            return path
+    except OSError:
+        pass
+    write_sorted_index(path, build_sections(load_existing_rows(rows_csv_path, meta_json_path)))
+    return path
+
+
+def percentile_range(index: SortedIndex, lo_pct: float, hi_pct: float) -> tuple[int, int]:
+    """Positions of solved seeds whose score rank lies between the two percentiles."""
+    n = index.count("score")
+    return int(round(n * lo_pct / 100.0)), int(round(n * hi_pct / 100.0))
+
+
+def score_range(index: SortedIndex, min_score: Optional[float], max_score: Optional[float]) -> tuple[int, int]:
+    lo = 0 if min_score is None else index.bisect("score", min_score)
+    hi = index.count("score") if max_score is None else index.bisect("score", max_score, right=True)
+    return lo, hi
+
+
+def solved_within(index: SortedIndex, max_ms: float) -> tuple[int, int]:
+    """Solved seeds with ``elapsed_ms <= max_ms``, fastest first."""
+    return 0, index.bisect("solved_ms", max_ms, right=True)
+
+
+def take(
+    index: SortedIndex,
+    section: str,
+    lo: int,
+    hi: int,
+    limit: int = 0,
+    rng: Optional[random.Random] = None,
+    descending: bool = False,
+) -> list[int]:
+    """
+    Seeds at positions ``[lo, hi)`` in index order, or reversed. With
+    ``limit`` only that many: the first ones, or with ``rng`` a random sample
+    kept in that order.
+    """
+    hi = min(hi, index.count(section))
+    if limit <= 0 or hi - lo <= limit:
+        seeds = index.seeds(section, lo, hi)
+        return seeds[::-1] if descending else seeds
+    if rng is None:
+        if descending:
+            return index.seeds(section, hi - limit, hi)[::-1]
+        return index.seeds(section, lo, lo + limit)
+    return [index.seed(section, i) for i in sorted(rng.sample(range(lo, hi), limit), reverse=descending)]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query seeds from a pool through a sorted index cached next to it.")
+    parser.add_argument(
+        "command",
+        choices=("percentile", "score", "solved-within", "unknown"),
+        help=(
+            "percentile: solved seeds between score percentiles --lo and --hi; "
+            "score: solved seeds with --min <= score <= --max; "
+            "solved-within: solved seeds with elapsed_ms <= --ms, fastest first; "
+            "unknown: unknown seeds by expanded nodes."
+        ),
+    )
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), default=None, help="Suit count.")
+    parser.add_argument("--pool", type=str, default="", help="Pool JSON path. Default: data/seed_pool_{suits}s.json")
+    parser.add_argument("--lo", type=float, default=0.0, help="percentile: lower score percentile (0-100).")
+    parser.add_argument("--hi", type=float, default=100.0, help="percentile: upper score percentile (0-100).")
+    parser.add_argument("--min", type=float, default=None, help="score: minimum score.")
+    parser.add_argument("--max", type=float, default=None, help="score: maximum score.")
+    parser.add_argument("--ms", type=float, default=None, help="solved-within: solver time limit in milliseconds.")
+    parser.add_argument("--desc", action="store_true", help="unknown: most expanded nodes first.")
+    parser.add_argument("-n", "--limit", type=int, default=0, help="Return at most N seeds (0: all matches).")
+    parser.add_argument(
+        "--random-seed",
+        type=int,
+        default=None,
+        help="With --limit, draw the N seeds at random from the matches (reproducibly) instead of taking the first N.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("lines", "json"),
+        default="lines",
+        help="lines: one seed per line (a --seed-file for the builder, analyzer and seed_miner); "
+        "json: seeds with the query.",
+    )
+    parser.add_argument("--out", type=str, default="", help="Output path. Default: stdout.")
+    args = parser.parse_args()
+    if not args.pool and args.suits is None:
+        parser.error("--suits or --pool is required")
+    if args.command == "percentile" and not 0.0 <= args.lo <= args.hi <= 100.0:
+        parser.error("percentile needs 0 <= --lo <= --hi <= 100")
+    if args.command == "solved-within" and args.ms is None:
+        parser.error("solved-within needs --ms")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    pool = Path(args.pool).expanduser() if args.pool else default_output_path(args.suits)
+    rng = random.Random(args.random_seed) if args.random_seed is not None else None
+    with SortedIndex(ensure_sorted_index(pool)) as index:
+        if args.command == "percentile":
+            section, (lo, hi) = "score", percentile_range(index, args.lo, args.hi)
+        elif args.command == "score":
+            section, (lo, hi) = "score", score_range(index, args.min, args.max)
+        elif args.command == "solved-within":
+            section, (lo, hi) = "solved_ms", solved_within(index, args.ms)
+        else:
+            section, (lo, hi) = "unknown_nodes", (0, index.count("unknown_nodes"))
+        seeds = take(index, section, lo, hi, args.limit, rng, descending=args.command == "unknown" and args.desc)
+
+    if args.format == "json":
+        params = {"percentile": ("lo", "hi"), "score": ("min", "max"), "solved-within": ("ms",), "unknown": ("desc",)}
+        query = {"command": args.command, **{k: getattr(args, k) for k in params[args.command] + ("limit", "random_seed")}}
+        text = json.dumps({"pool": str(pool), "query": query, "matches": hi - lo, "seeds": seeds}, indent=2) + "\n"
+    else:
+        text = "".join(f"{seed}\n" for seed in seeds)
+    if args.out:
+        out = Path(args.out).expanduser()
+        tmp = out.with_suffix(out.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(out)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
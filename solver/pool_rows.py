@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import csv
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class SeedRow:
+    seed: int
+    status: str
+    score: Optional[float]
+    band: Optional[str]
+    reason: Optional[str]
+    elapsed_ms: float
+    expanded_nodes: int
+    unique_states: int
+    # Search budget the row was produced with; None for rows from older pools.
+    max_seconds: Optional[float] = None
+    max_nodes: Optional[int] = None
+    # 1-based budget tier that produced the row in multi-pass builds.
+    tier: Optional[int] = None
+    # Difficulty components of solved rows, ordered as DIFFICULTY_COMPONENTS.
+    components: Optional[tuple[float, ...]] = None
+    # Solution of solved rows in solution_codec's compact encoding.
+    solution: Optional[bytes] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "seed": self.seed,
+            "status": self.status,
+            "score": self.score,
+            "band": self.band,
+            "reason": self.reason,
+            "elapsed_ms": self.elapsed_ms,
+            "expanded_nodes": self.expanded_nodes,
+            "unique_states": self.unique_states,
+            "max_seconds": self.max_seconds,
+            "max_nodes": self.max_nodes,
+            "tier": self.tier,
+            "components": None if self.components is None else list(self.components),
+            "solution": None if self.solution is None else self.solution.hex(),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "SeedRow":
+        return SeedRow(
+            seed=int(data["seed"]),
+            status=str(data["status"]),
+            score=(None if data.get("score") is None else float(data["score"])),
+            band=(None if data.get("band") is None else str(data["band"])),
+            reason=(None if data.get("reason") is None else str(data["reason"])),
+            elapsed_ms=float(data.get("elapsed_ms", 0.0)),
+            expanded_nodes=int(data.get("expanded_nodes", 0)),
+            unique_states=int(data.get("unique_states", 0)),
+            max_seconds=(None if data.get("max_seconds") is None else float(data["max_seconds"])),
+            max_nodes=(None if data.get("max_nodes") is None else int(data["max_nodes"])),
+            tier=(None if data.get("tier") is None else int(data["tier"])),
+            components=(None if data.get("components") is None else tuple(float(v) for v in data["components"])),
+            solution=(None if data.get("solution") is None else bytes.fromhex(data["solution"])),
+        )
+
+
+ROWS_CSV_FIELDS = [
+    "seed",
+    "status",
+    "score",
+    "bucket",
+    "reason",
+    "elapsed_ms",
+    "expanded_nodes",
+    "unique_states",
+    "max_seconds",
+    "max_nodes",
+    "tier",
+]
+
+
+def quantile(values: list[float], q: float) -> float:
+    if not values:
+        raise ValueError("empty values")
+    if q <= 0:
+        return values[0]
+    if q >= 1:
+        return values[-1]
+
+    pos = (len(values) - 1) * q
+    lo = int(math.floor(pos))
+    hi = int(math.ceil(pos))
+    if lo == hi:
+        return values[lo]
+    alpha = pos - lo
+    return values[lo] * (1.0 - alpha) + values[hi] * alpha
+
+
+def default_output_path(suits: int) -> Path:
+    return Path(__file__).resolve().parents[1] / "data" / f"seed_pool_{suits}s.json"
+
+
+def derive_output_paths(meta_json_path: Path) -> tuple[Path, Path]:
+    base_name = meta_json_path.stem
+    parent = meta_json_path.parent
+    rows_csv = parent / f"{base_name}_rows.csv"
+    return meta_json_path, rows_csv
+
+
+def write_csv_atomic(path: Path, fieldnames: list[str], rows: list[dict]) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    tmp.replace(path)
+
+
+def load_existing_rows_from_csv(path: Path) -> list[SeedRow]:
+    if not path.exists() or not path.is_file():
+        return []
+    rows: list[SeedRow] = []
+    try:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            for item in reader:
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    rows.append(
+                        SeedRow(
+                            seed=int(item.get("seed", "0")),
+                            status=str(item.get("status", "")),
+                            score=(None if not item.get("score") else float(item["score"])),
+                            band=(None if not item.get("band") else str(item["band"])),
+                            reason=(None if not item.get("reason") else str(item["reason"])),
+                            elapsed_ms=float(item.get("elapsed_ms", "0") or 0.0),
+                            expanded_nodes=int(item.get("expanded_nodes", "0") or 0),
+                            unique_states=int(item.get("unique_states", "0") or 0),
+                            max_seconds=(None if not item.get("max_seconds") else float(item["max_seconds"])),
+                            max_nodes=(None if not item.get("max_nodes") else int(item["max_nodes"])),
+                            tier=(None if not item.get("tier") else int(item["tier"])),
+                        )
+                    )
+                except Exception:
+                    continue
+    except Exception:
+        return []
+    return rows
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import Iterable, Optional
+
+
+class KllSketch:
+    """
+    Mergeable streaming quantile sketch (KLL style).
+
+    Level ``h`` holds items of weight ``2**h``. A full level is sorted and
+    every other item is promoted, so memory stays around ``3 * k`` items
+    and the rank error is about ``1.7 / k``. Until the first compaction
+    the sketch holds every value and answers exactly, with the same linear
+    interpolation as ``pool_rows.quantile``.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        self.k = max(8, int(k))
+        self.levels: list[list[float]] = [[]]
+        self.count = 0
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                # An odd leftover stays on this level to keep total weight exact.
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self._rng.randrange(2)
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, value: float) -> None:
+        self.levels[0].append(float(value))
+        self.count += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KllSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    @property
+    def exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            raise ValueError("empty sketch")
+        if self.exact:
+            values = sorted(self.levels[0])
+            pos = (len(values) - 1) * min(1.0, max(0.0, q))
+            lo = int(math.floor(pos))
+            hi = int(math.ceil(pos))
+            alpha = pos - lo
+            return values[lo] * (1.0 - alpha) + values[hi] * alpha
+
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        total = sum(weight for _, weight in weighted)
+        target = min(1.0, max(0.0, q)) * total
+        acc = 0
+        for value, weight in weighted:
+            acc += weight
+            if acc >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "count": self.count, "levels": [list(items) for items in self.levels]}
+
+    @staticmethod
+    def from_dict(data: dict) -> "KllSketch":
+        sketch = KllSketch(k=int(data.get("k", 200)))
+        levels = data.get("levels") or [[]]
+        sketch.levels = [[float(value) for value in items] for items in levels]
+        sketch.count = int(data.get("count", sum(len(items) for items in sketch.levels)))
+        return sketch
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import bisect
+import json
+import math
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from solver.pool_rows import ROWS_CSV_FIELDS, SeedRow, default_output_path, derive_output_paths, load_existing_rows_from_csv, quantile, write_csv_atomic
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# (name, .npy dtype); every column holds one value per row, ordered by seed.
+COLUMNS = (
+    ("seed", "<i8"),
+    ("status", "|u1"),
+    ("score", "<f8"),
+    ("bucket", "|u1"),
+    ("reason", "|u1"),
+    ("elapsed_ms", "<f8"),
+    ("expanded_nodes", "<i8"),
+    ("unique_states", "<i8"),
+    ("max_seconds", "<f8"),
+    ("max_nodes", "<i8"),
+    ("tier", "<i8"),
+)
+# Categorical columns are stored as uint8 codes into a vocabulary; code 0 is "missing".
+CATEGORICAL = ("status", "bucket", "reason")
+BUCKETS = ("Easy", "Medium", "Hard")
+# Bucket of every unknown row, next to the score buckets of solved rows.
+UNKNOWN_BUCKET = "unknown"
+
+_TYPECODES = {"<i8": "q", "|u1": "B", "<f8": "d"}
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_VOCAB_FILE = "vocab.json"
+
+
+def columns_dir(rows_csv_path: Path) -> Path:
+    """``seed_pool_2s_rows.csv`` -> ``seed_pool_2s_rows.npcols/``."""
+    return rows_csv_path.with_suffix(".npcols")
+
+
+def _write_npy(path: Path, dtype: str, values: array) -> None:
+    """NumPy ``.npy`` (format 1.0) of a 1-d array, written without NumPy."""
+    header = repr({"descr": dtype, "fortran_order": False, "shape": (len(values),)})
+    # Pad so the data starts on a 64-byte boundary, as numpy.save does.
+    pad = 64 - (len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = (header + " " * pad + "\n").encode("latin1")
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_NPY_MAGIC + struct.pack("<H", len(header)) + header)
+        f.write(values.tobytes())
+    tmp.replace(path)
+
+
+def _read_npy(path: Path, dtype: str):
+    """Memory-mapped array with NumPy; an ``array.array`` copy without it."""
+    if np is not None:
+        values = np.load(path, mmap_mode="r")
+        if values.dtype.str != dtype or values.ndim != 1:
+            raise ValueError(f"{path}: expected 1-d {dtype}, got {values.dtype.str}")
+        return values
+    data = path.read_bytes()
+    if not data.startswith(_NPY_MAGIC[:6]):
+        raise ValueError(f"{path}: not a .npy file")
+    major = data[6]
+    size_fmt, start = ("<H", 8) if major == 1 else ("<I", 8)
+    header_len = struct.unpack_from(size_fmt, data, start)[0]
+    offset = start + struct.calcsize(size_fmt)
+    header = ast.literal_eval(data[offset : offset + header_len].decode("latin1"))
+    if header.get("descr") != dtype or header.get("fortran_order") or len(header.get("shape", ())) != 1:
+        raise ValueError(f"{path}: expected 1-d {dtype}")
+    values = array(_TYPECODES[dtype])
+    values.frombytes(data[offset + header_len :])
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values.byteswap()
+    if len(values) != header["shape"][0]:
+        raise ValueError(f"{path}: truncated")
+    return values
+
+
+@dataclass(slots=True)
+class RowColumns:
+    """
+    A pool's rows as parallel typed columns.
+
+    ``columns`` maps each name in :data:`COLUMNS` to a NumPy array (memory
+    mapped when loaded from disk) or, without NumPy, an ``array.array``.
+    Missing floats are NaN, missing integers -1 and missing categories code 0.
+    """
+
+    columns: dict
+    vocab: dict[str, list[str]]
+
+    def __len__(self) -> int:
+        return len(self.columns["seed"])
+
+    @staticmethod
+    def from_rows(rows: Iterable, bucket_of: Optional[dict[int, str]] = None) -> "RowColumns":
+        """Build columns from ``SeedRow``-like objects, in the given order."""
+        bucket_of = bucket_of or {}
+        vocab: dict[str, list[str]] = {name: [""] for name in CATEGORICAL}
+        vocab["bucket"] += list(BUCKETS) + [UNKNOWN_BUCKET]
+        index = {name: {value: i for i, value in enumerate(values)} for name, values in vocab.items()}
+        out = {name: array(_TYPECODES[dtype]) for name, dtype in COLUMNS}
+
+        def code(name: str, value: Optional[str]) -> int:
+            if not value:
+                return 0
+            codes = index[name]
+            if value not in codes:
+                if len(codes) >= 256:
+                    raise ValueError(f"more than 255 distinct {name} values")
+                codes[value] = len(vocab[name])
+                vocab[name].append(value)
+            return codes[value]
+
+        for row in rows:
+            out["seed"].append(int(row.seed))
+            out["status"].append(code("status", row.status))
+            out["score"].append(math.nan if row.score is None else float(row.score))
+            out["bucket"].append(code("bucket", bucket_of.get(row.seed)))
+            out["reason"].append(code("reason", row.reason))
+            out["elapsed_ms"].append(float(row.elapsed_ms))
+            out["expanded_nodes"].append(int(row.expanded_nodes))
+            out["unique_states"].append(int(row.unique_states))
+            out["max_seconds"].append(math.nan if row.max_seconds is None else float(row.max_seconds))
+            out["max_nodes"].append(-1 if row.max_nodes is None else int(row.max_nodes))
+            out["tier"].append(-1 if row.tier is None else int(row.tier))
+        return RowColumns(columns=out, vocab=vocab)
+
+    def write(self, path: Path) -> None:
+        """One ``.npy`` per column plus ``vocab.json``, which is written last and marks the set complete."""
+        path.mkdir(parents=True, exist_ok=True)
+        for name, dtype in COLUMNS:
+            values = self.columns[name]
+            if not isinstance(values, array):
+                values = array(_TYPECODES[dtype], values.tolist())
+            _write_npy(path / f"{name}.npy", dtype, values)
+        tmp = path / (_VOCAB_FILE + ".tmp")
+        tmp.write_text(json.dumps({"rows": len(self), "vocab": self.vocab}), encoding="utf-8")
+        tmp.replace(path / _VOCAB_FILE)
+
+    @staticmethod
+    def load(path: Path) -> Optional["RowColumns"]:
+        """Columns under ``path``; None if the set is missing, partial or inconsistent."""
+        try:
+            meta = json.loads((path / _VOCAB_FILE).read_text(encoding="utf-8"))
+            columns = {name: _read_npy(path / f"{name}.npy", dtype) for name, dtype in COLUMNS}
+        except (OSError, ValueError, SyntaxError):
+            return None
+        if any(len(values) != meta.get("rows") for values in columns.values()):
+            return None
+        return RowColumns(columns=columns, vocab={k: list(v) for k, v in meta["vocab"].items()})
+
+    def _status_code(self, status: str) -> int:
+        values = self.vocab["status"]
+        return values.index(status) if status in values else -1
+
+    def to_rows(self) -> list:
+        cols = {name: self.columns[name].tolist() for name, _ in COLUMNS}
+        status, reason = self.vocab["status"], self.vocab["reason"]
+        return [
+            SeedRow(
+                seed=seed,
+                status=status[st],
+                score=(None if score != score else score),
+                band=None,
+                reason=(reason[rc] or None),
+                elapsed_ms=elapsed,
+                expanded_nodes=expanded,
+                unique_states=unique,
+                max_seconds=(None if max_seconds != max_seconds else max_seconds),
+                max_nodes=(None if max_nodes < 0 else max_nodes),
+                tier=(None if tier < 0 else tier),
+            )
+            for seed, st, score, rc, elapsed, expanded, unique, max_seconds, max_nodes, tier in zip(
+                cols["seed"],
+                cols["status"],
+                cols["score"],
+                cols["reason"],
+                cols["elapsed_ms"],
+                cols["expanded_nodes"],
+                cols["unique_states"],
+                cols["max_seconds"],
+                cols["max_nodes"],
+                cols["tier"],
+            )
+        ]
+
+    def status_counts(self) -> dict[str, int]:
+        codes = self.columns["status"]
+        if np is not None:
+            counts = np.bincount(np.asarray(codes), minlength=len(self.vocab["status"])).tolist()
+        else:
+            counts = [0] * len(self.vocab["status"])
+            for code in codes:
+                counts[code] += 1
+        return {name: int(count) for name, count in zip(self.vocab["status"], counts) if name}
+
+    def solved_scores(self):
+        """Scores of solved rows, sorted ascending."""
+        solved = self._status_code("solved")
+        if np is not None:
+            scores = np.asarray(self.columns["score"])[np.asarray(self.columns["status"]) == solved]
+            return np.sort(scores[~np.isnan(scores)])
+        return sorted(s for s, st in zip(self.columns["score"], self.columns["status"]) if st == solved and s == s)
+
+    def tertiles(self) -> tuple[float, float]:
+        """Exact score tertiles of solved rows, interpolated like ``pool_rows.quantile``."""
+        scores = self.solved_scores()
+        if len(scores) == 0:
+            return 0.0, 0.0
+        if np is not None:
+            q33, q66 = np.quantile(scores, [1.0 / 3.0, 2.0 / 3.0]).tolist()
+            return q33, q66
+        return quantile(scores, 1.0 / 3.0), quantile(scores, 2.0 / 3.0)
+
+    def quantiles(self) -> dict[str, float]:
+        q33, q66 = self.tertiles()
+        return {"q33": round(q33, 6), "q66": round(q66, 6)}
+
+    def assign_buckets(self, q33: float, q66: float) -> None:
+        """
+        Recompute the bucket column: solved rows are Easy up to ``q33``, Medium
+        up to ``q66``, else Hard; unknown rows get :data:`UNKNOWN_BUCKET`.
+        """
+        vocab = self.vocab["bucket"]
+        if UNKNOWN_BUCKET not in vocab:
+            # Columns written before unknown rows had a bucket code.
+            vocab.append(UNKNOWN_BUCKET)
+        first, unknown_code = vocab.index(BUCKETS[0]), vocab.index(UNKNOWN_BUCKET)
+        solved, unknown = self._status_code("solved"), self._status_code("unknown")
+        if np is not None:
+            scores = np.asarray(self.columns["score"])
+            status = np.asarray(self.columns["status"])
+            is_solved = (status == solved) & ~np.isnan(scores)
+            codes = first + np.searchsorted(np.array([q33, q66]), scores, side="left")
+            codes = np.where(is_solved, codes, np.where(status == unknown, unknown_code, 0))
+            self.columns["bucket"] = codes.astype(np.uint8)
+            return
+        edges = [q33, q66]
+        self.columns["bucket"] = array(
+            "B",
+            (
+                first + bisect.bisect_left(edges, score) if st == solved and score == score else (unknown_code if st == unknown else 0)
+                for score, st in zip(self.columns["score"], self.columns["status"])
+            ),
+        )
+
+    def bucket_seeds(self, by_score: bool = False) -> dict[str, list[int]]:
+        """Seeds per bucket in row order; with ``by_score`` the score buckets are ordered by ``(score, seed)``."""
+        seeds, codes, scores = self.columns["seed"], self.columns["bucket"], self.columns["score"]
+        out: dict[str, list[int]] = {}
+        for code, name in enumerate(self.vocab["bucket"]):
+            if not name:
+                continue
+            ordered = by_score and name in BUCKETS
+            if np is not None:
+                mask = np.asarray(codes) == code
+                picked = np.asarray(seeds)[mask]
+                if ordered:
+                    picked = picked[np.lexsort((picked, np.asarray(scores)[mask]))]
+                out[name] = picked.tolist()
+            elif ordered:
+                out[name] = [seed for _, seed in sorted((score, seed) for seed, c, score in zip(seeds, codes, scores) if c == code)]
+            else:
+                out[name] = [seed for seed, c in zip(seeds, codes) if c == code]
+        return out
+
+    def csv_rows(self) -> list[dict]:
+        """Rows for the pool's rows CSV (``seed_pool_builder.ROWS_CSV_FIELDS``), in row order."""
+        cols = {name: self.columns[name].tolist() for name, _ in COLUMNS}
+        status, bucket, reason = self.vocab["status"], self.vocab["bucket"], self.vocab["reason"]
+        return [
+            {
+                "seed": seed,
+                "status": status[st],
+                "score": ("" if score != score else f"{score:.6f}"),
+                "bucket": bucket[bc],
+                "reason": reason[rc],
+                "elapsed_ms": f"{elapsed:.3f}",
+                "expanded_nodes": expanded,
+                "unique_states": unique,
+                "max_seconds": ("" if max_seconds != max_seconds else f"{max_seconds:g}"),
+                "max_nodes": ("" if max_nodes < 0 else max_nodes),
+                "tier": ("" if tier < 0 else tier),
+            }
+            for seed, st, score, bc, rc, elapsed, expanded, unique, max_seconds, max_nodes, tier in zip(
+                *(cols[name] for name, _ in COLUMNS)
+            )
+        ]
+
+    def stats(self) -> dict:
+        counts = self.status_counts()
+        elapsed = self.columns["elapsed_ms"]
+        out = {
+            "scanned": len(self),
+            **{status: counts.get(status, 0) for status in ("solved", "unknown", "proven_unsolvable", "memory_limit")},
+            "quantiles": self.quantiles(),
+        }
+        if len(self):
+            if np is not None:
+                p50, p95 = np.quantile(np.asarray(elapsed), [0.5, 0.95]).tolist()
+            else:
+                ordered = sorted(elapsed)
+                p50, p95 = quantile(ordered, 0.5), quantile(ordered, 0.95)
+            out["elapsed_ms"] = {"p50": round(p50, 3), "p95": round(p95, 3)}
+        return out
+
+
+def write_pool_columns(rows_csv_path: Path, rows: list, bucket_of: dict[int, str]) -> None:
+    RowColumns.from_rows(rows, bucket_of).write(columns_dir(rows_csv_path))
+
+
+def load_pool_columns(rows_csv_path: Path) -> Optional[RowColumns]:
+    """Columns next to ``rows_csv_path`` unless the CSV was written after them."""
+    path = columns_dir(rows_csv_path)
+    try:
+        if rows_csv_path.exists() and (path / _VOCAB_FILE).stat().st_mtime_ns < rows_csv_path.stat().st_mtime_ns:
+            return None
+    except OSError:
+        return None
+    return RowColumns.load(path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert seed pool rows between CSV and columnar .npy files.")
+    parser.add_argument(
+        "command",
+        choices=("import", "export", "stats"),
+        help="import: CSV -> columns; export: columns -> CSV; stats: summary computed from the columns.",
+    )
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), default=None, help="Suit count.")
+    parser.add_argument("--pool", type=str, default="", help="Pool JSON path. Default: data/seed_pool_{suits}s.json")
+    args = parser.parse_args()
+    if not args.pool and args.suits is None:
+        parser.error("--suits or --pool is required")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    pool = Path(args.pool).expanduser() if args.pool else default_output_path(args.suits)
+    meta_json_path, rows_csv_path = derive_output_paths(pool)
+    if args.command == "import":
+        rows = load_existing_rows_from_csv(rows_csv_path)
+        buckets = (json.loads(meta_json_path.read_text(encoding="utf-8")).get("buckets") or {}) if meta_json_path.exists() else {}
+        bucket_of = {int(seed): name for name in BUCKETS + (UNKNOWN_BUCKET,) for seed in buckets.get(name, [])}
+        write_pool_columns(rows_csv_path, rows, bucket_of)
+        print(f"imported {len(rows)} rows into {columns_dir(rows_csv_path)}")
+        return
+
+    cols = RowColumns.load(columns_dir(rows_csv_path))
+    if cols is None:
+        raise SystemExit(f"no columns at {columns_dir(rows_csv_path)}")
+    if args.command == "export":
+        write_csv_atomic(rows_csv_path, ROWS_CSV_FIELDS, cols.csv_rows())
+        print(f"exported {len(cols)} rows to {rows_csv_path}")
+    else:
+        print(json.dumps(cols.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, TextIO
+
+
+class RowJournal:
+    """
+    Append-only JSON Lines journal of result rows.
+
+    Every append is flushed to the OS, so a killed process loses nothing;
+    ``sync()`` additionally fsyncs, so the journal also survives a node crash.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: Optional[TextIO] = None
+        self.appended = 0
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _drop_torn_tail(self.path)
+            self._file = self.path.open("a", encoding="utf-8")
+        return self._file
+
+    def append(self, row: dict) -> None:
+        f = self._open()
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        f.flush()
+        self.appended += 1
+
+    def sync(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def reset(self) -> None:
+        """Drop the journal once its rows are compacted into the artifacts."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "RowJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _drop_torn_tail(path: Path, block: int = 65536) -> None:
+    """Truncate a partial last line left by a crash, so the next append starts a line of its own."""
+    try:
+        f = path.open("r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            if pos == end and chunk.endswith(b"\n"):
+                return
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+
+def replay_journal(path: Path) -> list[dict]:
+    """Read journal rows in append order; a torn last line from a crash is ignored."""
+    if not path.exists() or not path.is_file():
+        return []
+    rows: list[dict] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(item, dict):
+                rows.append(item)
+    return rows
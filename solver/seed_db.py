@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from solver.pool_rows import SeedRow, default_output_path, derive_output_paths
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    suits INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    score REAL,
+    bucket TEXT,
+    reason TEXT,
+    elapsed_ms REAL NOT NULL DEFAULT 0,
+    expanded_nodes INTEGER NOT NULL DEFAULT 0,
+    unique_states INTEGER NOT NULL DEFAULT 0,
+    max_seconds REAL,
+    max_nodes INTEGER,
+    tier INTEGER,
+    PRIMARY KEY (suits, seed)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rows_by_bucket ON rows (suits, status, bucket, score);
+CREATE TABLE IF NOT EXISTS budgets (
+    suits INTEGER PRIMARY KEY,
+    max_seconds REAL,
+    max_nodes INTEGER,
+    max_frontier INTEGER,
+    single_stage INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suits INTEGER NOT NULL,
+    generated_at TEXT NOT NULL,
+    start_seed INTEGER,
+    count INTEGER,
+    incoming_rows INTEGER NOT NULL DEFAULT 0,
+    stats TEXT,
+    quantiles TEXT
+);
+CREATE TABLE IF NOT EXISTS pools (
+    suits INTEGER PRIMARY KEY,
+    generated_at TEXT NOT NULL,
+    pool_mtime_ns INTEGER NOT NULL
+);
+"""
+
+ROW_COLUMNS = (
+    "seed",
+    "status",
+    "score",
+    "bucket",
+    "reason",
+    "elapsed_ms",
+    "expanded_nodes",
+    "unique_states",
+    "max_seconds",
+    "max_nodes",
+    "tier",
+)
+
+_UPSERT_ROW = (
+    f"INSERT OR REPLACE INTO rows (suits, {', '.join(ROW_COLUMNS)}) "
+    f"VALUES (?, {', '.join('?' for _ in ROW_COLUMNS)})"
+)
+
+
+def default_db_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "data" / "seed_pool.sqlite"
+
+
+class SeedDb:
+    """
+    SQLite store for seed pool rows of every suit count.
+
+    Rows are keyed by ``(suits, seed)``; the ``(suits, status, bucket, score)``
+    index serves bucket picks and score-ordered scans without loading the
+    pool. Writes go through :meth:`upsert_rows`, one transaction per batch.
+    """
+
+    def __init__(self, path: Path, readonly: bool = False):
+        self.path = Path(path)
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SeedDb":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def upsert_rows(self, suits: int, rows: Iterable[dict]) -> int:
+        """Insert or replace row dicts (``SeedRow.to_dict()`` shape, optional ``bucket``)."""
+        params = [(int(suits),) + tuple(row.get(col) for col in ROW_COLUMNS) for row in rows]
+        if params:
+            with self.conn:
+                self.conn.executemany(_UPSERT_ROW, params)
+        return len(params)
+
+    def assign_buckets(self, suits: int, q33: float, q66: float) -> None:
+        """Re-bucket every row of a pool from its tertile cut points in one statement."""
+        with self.conn:
+            self.conn.execute(
+                """
+                UPDATE rows SET bucket = CASE
+                    WHEN status = 'solved' AND score IS NOT NULL AND score <= ? THEN 'Easy'
+                    WHEN status = 'solved' AND score IS NOT NULL AND score <= ? THEN 'Medium'
+                    WHEN status = 'solved' AND score IS NOT NULL THEN 'Hard'
+                    WHEN status = 'unknown' THEN 'unknown'
+                    ELSE NULL
+                END
+                WHERE suits = ?
+                """,
+                (float(q33), float(q66), int(suits)),
+            )
+
+    def set_budget(self, suits: int, max_seconds: float, max_nodes: int, max_frontier: int, single_stage: bool) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO budgets VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    int(suits),
+                    float(max_seconds),
+                    int(max_nodes),
+                    int(max_frontier),
+                    int(bool(single_stage)),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def budget(self, suits: int) -> Optional[dict]:
+        cur = self.conn.execute(
+            "SELECT max_seconds, max_nodes, max_frontier, single_stage FROM budgets WHERE suits = ?",
+            (int(suits),),
+        )
+        item = cur.fetchone()
+        if item is None:
+            return None
+        return {"max_seconds": item[0], "max_nodes": item[1], "max_frontier": item[2], "single_stage": bool(item[3])}
+
+    def record_run(self, suits: int, payload: dict) -> None:
+        source = payload.get("source") or {}
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO runs (suits, generated_at, start_seed, count, incoming_rows, stats, quantiles) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    int(suits),
+                    str(payload.get("generated_at") or datetime.now(timezone.utc).isoformat()),
+                    source.get("start_seed"),
+                    source.get("count"),
+                    int(source.get("incoming_rows") or 0),
+                    json.dumps(payload.get("stats") or {}),
+                    json.dumps(payload.get("quantiles") or {}),
+                ),
+            )
+
+    def mark_pool(self, suits: int, generated_at: str, meta_json_path: Path) -> None:
+        """Record that the rows of ``suits`` mirror the pool JSON as it is on disk now."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pools VALUES (?, ?, ?)",
+                (int(suits), str(generated_at), Path(meta_json_path).stat().st_mtime_ns),
+            )
+
+    def mirrors_pool(self, suits: int, meta_json_path: Path) -> bool:
+        """Whether the rows of ``suits`` were last synced with this exact pool JSON."""
+        cur = self.conn.execute("SELECT pool_mtime_ns FROM pools WHERE suits = ?", (int(suits),))
+        item = cur.fetchone()
+        try:
+            return item is not None and item[0] == Path(meta_json_path).stat().st_mtime_ns
+        except OSError:
+            return False
+
+    def clear_rows(self, suits: int) -> None:
+        """Drop every row of one suit count, e.g. before it is rebuilt from scratch."""
+        with self.conn:
+            self.conn.execute("DELETE FROM rows WHERE suits = ?", (int(suits),))
+            self.conn.execute("DELETE FROM pools WHERE suits = ?", (int(suits),))
+
+    def rows(self, suits: int, status: Optional[str] = None, bucket: Optional[str] = None) -> list[dict]:
+        sql = f"SELECT {', '.join(ROW_COLUMNS)} FROM rows WHERE suits = ?"
+        params: list = [int(suits)]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        if bucket is not None:
+            sql += " AND bucket = ?"
+            params.append(bucket)
+        sql += " ORDER BY seed"
+        return [dict(zip(ROW_COLUMNS, item)) for item in self.conn.execute(sql, params)]
+
+    def row_count(self, suits: int) -> int:
+        cur = self.conn.execute("SELECT COUNT(*) FROM rows WHERE suits = ?", (int(suits),))
+        return int(cur.fetchone()[0])
+
+    def bucket_size(self, suits: int, bucket: str) -> int:
+        cur = self.conn.execute(
+            "SELECT COUNT(*) FROM rows WHERE suits = ? AND status = 'solved' AND bucket = ?",
+            (int(suits), bucket),
+        )
+        return int(cur.fetchone()[0])
+
+    def pick_seed(self, suits: int, bucket: str, rng: random.Random | None = None) -> Optional[int]:
+        """Uniform pick from a solved bucket using only the bucket index."""
+        size = self.bucket_size(suits, bucket)
+        if size <= 0:
+            return None
+        offset = (rng if rng is not None else random).randrange(size)
+        cur = self.conn.execute(
+            "SELECT seed FROM rows WHERE suits = ? AND status = 'solved' AND bucket = ? "
+            "ORDER BY score LIMIT 1 OFFSET ?",
+            (int(suits), bucket, offset),
+        )
+        item = cur.fetchone()
+        return None if item is None else int(item[0])
+
+
+def import_pool(db: SeedDb, meta_json_path: Path) -> int:
+    """Replace one suit count's rows with a ``seed_pool_{n}s.json`` + ``_rows.csv`` pair."""
+    from solver.seed_pool_builder import load_existing_rows
+
+    meta_json_path, rows_csv_path = derive_output_paths(Path(meta_json_path))
+    data = json.loads(meta_json_path.read_text(encoding="utf-8"))
+    suits = int(data["suits"])
+    bucket_of: dict[int, str] = {}
+    for name, seeds in (data.get("buckets") or {}).items():
+        for seed in seeds:
+            bucket_of[int(seed)] = name
+
+    rows = load_existing_rows(rows_csv_path, meta_json_path)
+    items = []
+    for row in rows:
+        item = row.to_dict()
+        item["bucket"] = bucket_of.get(row.seed)
+        items.append(item)
+    db.clear_rows(suits)
+    count = db.upsert_rows(suits, items)
+    search = data.get("search") or {}
+    if search.get("max_seconds") is not None and search.get("max_nodes") is not None:
+        db.set_budget(
+            suits,
+            search["max_seconds"],
+            search["max_nodes"],
+            search.get("max_frontier") or 0,
+            bool(search.get("single_stage")),
+        )
+    db.record_run(suits, data)
+    db.mark_pool(suits, str(data.get("generated_at") or ""), meta_json_path)
+    return count
+
+
+def export_pool(db: SeedDb, suits: int, meta_json_path: Path) -> dict:
+    """Write the CSV/JSON artifacts of one suit count from the database."""
+    from solver.seed_pool_builder import _write_artifacts
+
+    meta_json_path, rows_csv_path = derive_output_paths(Path(meta_json_path))
+    meta_json_path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [SeedRow.from_dict(item) for item in db.rows(suits)]
+    budget = db.budget(suits) or {}
+    args = argparse.Namespace(
+        suits=suits,
+        max_seconds=budget.get("max_seconds"),
+        max_nodes=budget.get("max_nodes"),
+        max_frontier=budget.get("max_frontier"),
+        single_stage=bool(budget.get("single_stage")),
+        workers=1,
+        start_seed=None,
+        count=None,
+        overwrite=False,
+    )
+    payload = _write_artifacts(args, meta_json_path, rows_csv_path, rows, [], time.perf_counter())
+    quantiles = payload["quantiles"]
+    db.assign_buckets(suits, quantiles["q33"], quantiles["q66"])
+    db.mark_pool(suits, payload["generated_at"], meta_json_path)
+    return payload
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import/export seed pools to a SQLite seed database.")
+    parser.add_argument("command", choices=("import", "export"), help="Direction of the conversion.")
+    parser.add_argument("--db", type=str, default=str(default_db_path()), help="SQLite database path.")
+    parser.add_argument(
+        "--pool",
+        type=str,
+        action="append",
+        default=[],
+        help="Pool JSON path (repeatable). Default: data/seed_pool_{suits}s.json",
+    )
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), default=None, help="Suit count for export.")
+    args = parser.parse_args()
+    if args.command == "export" and args.suits is None:
+        parser.error("--suits is required for export")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    with SeedDb(Path(args.db).expanduser()) as db:
+        if args.command == "import":
+            pools = [Path(p).expanduser() for p in args.pool]
+            if not pools:
+                pools = [default_output_path(s) for s in (1, 2, 3, 4) if default_output_path(s).exists()]
+            for pool in pools:
+                count = import_pool(db, pool)
+                print(f"imported {count} rows from {pool}")
+        else:
+            out = Path(args.pool[0]).expanduser() if args.pool else default_output_path(args.suits)
+            payload = export_pool(db, args.suits, out)
+            print(f"exported out={out} scanned={payload['stats']['scanned']}")
+
+
+if __name__ == "__main__":
+    main()
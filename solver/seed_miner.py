@@ -4,67 +4,135 @@ import argparse
 import json
 import time
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 
-from solver.analyzer import SearchLimits, analyze_seed
+from solver.analyzer import AnalyzeResult, SearchLimits, analyze_seeds, read_seed_file
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Batch seed mining for Spider solver/analyzer.")
     parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), required=True, help="Suit count.")
-    parser.add_argument("--start-seed", type=int, required=True, help="Start seed (inclusive).")
-    parser.add_argument("--count", type=int, required=True, help="How many seeds to scan.")
+    parser.add_argument("--start-seed", type=int, default=None, help="Start seed (inclusive).")
+    parser.add_argument("--count", type=int, default=None, help="How many seeds to scan.")
+    parser.add_argument(
+        "--seed-file",
+        type=str,
+        default="",
+        help="Read seeds (whitespace/comma separated) from this file instead of a range; '-' reads stdin.",
+    )
     parser.add_argument("--max-seconds", type=float, default=10.0, help="Per-seed solver time limit.")
     parser.add_argument("--max-nodes", type=int, default=2_000_000, help="Per-seed node limit.")
     parser.add_argument("--max-frontier", type=int, default=1_000_000, help="Per-seed frontier limit.")
     parser.add_argument("--target-solved", type=int, default=1, help="Stop early after this many solved seeds.")
     parser.add_argument("--jsonl", type=str, default="", help="Optional output jsonl path.")
     parser.add_argument("--single-stage", action="store_true", help="Disable staged widening search.")
-    return parser.parse_args()
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Budget by --max-nodes only; --max-seconds becomes a safety cap reported as reason time_cap.",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Parallel worker processes.")
+    parser.add_argument("--inflight-per-worker", type=int, default=2, help="Queued seeds per worker.")
+    args = parser.parse_args()
+    if not args.seed_file and (args.start_seed is None or args.count is None):
+        parser.error("--start-seed and --count are required unless --seed-file is given")
+    return args
+
+
+def iter_mined(
+    seeds: Iterable[int],
+    suits: int,
+    limits: SearchLimits,
+    staged: bool = True,
+    workers: int = 1,
+    inflight_per_worker: int = 2,
+    stop: Optional[Callable[[AnalyzeResult], bool]] = None,
+) -> Iterator[dict]:
+    """
+    Yield one result payload per seed in completion order.
+
+    A thin wrapper over :func:`solver.analyzer.analyze_seeds`: at most
+    ``workers * inflight_per_worker`` seeds are submitted at a time, and
+    closing the iterator early or ``stop`` returning true cancels every
+    queued seed.
+    """
+    results = analyze_seeds(
+        seeds,
+        suits=suits,
+        limits=limits,
+        staged=staged,
+        workers=workers,
+        inflight_per_worker=inflight_per_worker,
+        stop=stop,
+    )
+    try:
+        for result in results:
+            payload = result.to_dict()
+            payload["wall_ms"] = result.metrics["wall_ms"]
+            yield payload
+    finally:
+        results.close()
 
 
 def main() -> None:
     args = parse_args()
-    limits = SearchLimits(max_nodes=args.max_nodes, max_seconds=args.max_seconds, max_frontier=args.max_frontier)
+    limits = SearchLimits(
+        max_nodes=args.max_nodes,
+        max_seconds=args.max_seconds,
+        max_frontier=args.max_frontier,
+        deterministic=args.deterministic,
+    )
 
     out_path = Path(args.jsonl).expanduser() if args.jsonl else None
     if out_path is not None:
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    if args.seed_file:
+        seeds: Iterable[int] = read_seed_file(args.seed_file)
+    else:
+        seeds = range(args.start_seed, args.start_seed + args.count)
+
     solved = 0
     unknown = 0
     proven_unsolvable = 0
     started = time.perf_counter()
 
-    for i in range(args.count):
-        seed = args.start_seed + i
-        t0 = time.perf_counter()
-        result = analyze_seed(seed=seed, suits=args.suits, limits=limits, staged=not args.single_stage)
-        wall_ms = (time.perf_counter() - t0) * 1000.0
-
-        payload = result.to_dict()
-        payload["wall_ms"] = round(wall_ms, 3)
-
-        if out_path is not None:
-            with out_path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(payload, ensure_ascii=False) + "\n")
-
-        if result.status == "solved":
-            solved += 1
-        elif result.status == "proven_unsolvable":
-            proven_unsolvable += 1
-        else:
-            unknown += 1
-
-        metrics = result.metrics
-        print(
-            f"seed={seed} status={result.status} reason={metrics.get('reason')} "
-            f"wall_ms={wall_ms:.1f} solver_ms={metrics['elapsed_ms']} "
-            f"expanded={metrics['expanded_nodes']} unique={metrics['unique_states']} "
-            f"score={result.difficulty_score}"
-        )
-
-        if solved >= args.target_solved:
-            break
+    out = out_path.open("a", encoding="utf-8") if out_path is not None else None
+    mined = iter_mined(
+        seeds,
+        suits=args.suits,
+        limits=limits,
+        staged=not args.single_stage,
+        workers=max(1, args.workers),
+        inflight_per_worker=args.inflight_per_worker,
+        # Checked after each payload below has been counted.
+        stop=lambda _: solved >= args.target_solved,
+    )
+    try:
+        for payload in mined:
+            if out is not None:
+                out.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+            status = payload["status"]
+            if status == "solved":
+                solved += 1
+            elif status == "proven_unsolvable":
+                proven_unsolvable += 1
+            else:
+                unknown += 1
+
+            metrics = payload["metrics"]
+            print(
+                f"seed={payload['seed']} status={status} reason={metrics.get('reason')} "
+                f"wall_ms={payload['wall_ms']:.1f} solver_ms={metrics['elapsed_ms']} "
+                f"expanded={metrics['expanded_nodes']} unique={metrics['unique_states']} "
+                f"score={payload['difficulty_score']}"
+            )
+    finally:
+        # Cancels queued seeds before the final flush.
+        mined.close()
+        if out is not None:
+            out.close()
 
     total_ms = (time.perf_counter() - started) * 1000.0
     print(
@@ -1,20 +1,44 @@
 from __future__ import annotations
 
 import argparse
-import csv
+import bisect
 import json
-import math
 import os
 import random
+import struct
+import sys
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Iterable, Optional
+from typing import Callable, Iterable, Iterator, Optional
 
-from solver.analyzer import SearchLimits, analyze_seed
+from solver.analyzer import DIFFICULTY_COMPONENTS, DIFFICULTY_WEIGHTS, SearchLimits, analyze_seed, difficulty_band, read_seed_file
+from solver.quantile_sketch import KllSketch
+from solver.build_telemetry import BuildTelemetry
+from solver.difficulty_columns import components_path, read_columns, weighted_sum, write_columns
+from solver.cost_model import DEFAULT_PROBE_NODES, CostModel, default_model_path, features_chunk, rank_correlation
+from solver.pool_index import pool_index_path, write_pool_index
+from solver.pool_rows import (
+    ROWS_CSV_FIELDS,
+    SeedRow,
+    default_output_path,
+    derive_output_paths,
+    load_existing_rows_from_csv,
+    quantile,
+    write_csv_atomic,
+)
+from solver.row_columns import BUCKETS, UNKNOWN_BUCKET, RowColumns, columns_dir, load_pool_columns
+from solver.row_journal import RowJournal, replay_journal
+from solver.seed_db import SeedDb
+from solver.solvability import RESOLVED_STATUSES, SolvabilityModel
+from solver.solvability import default_model_path as default_solvability_path
+from solver.solution_codec import encode_actions, parse_notation, read_solutions, solutions_path, write_solutions
+from solver.worker_pool import make_worker_pool
 
 
 def _default_workers() -> int:
@@ -27,71 +51,19 @@ def _default_workers() -> int:
     return max(1, int(avail) - 1)
 
 
-@dataclass(frozen=True, slots=True)
-class SeedRow:
-    seed: int
-    status: str
-    score: Optional[float]
-    band: Optional[str]
-    reason: Optional[str]
-    elapsed_ms: float
-    expanded_nodes: int
-    unique_states: int
-
-    def to_dict(self) -> dict:
-        return {
-            "seed": self.seed,
-            "status": self.status,
-            "score": self.score,
-            "band": self.band,
-            "reason": self.reason,
-            "elapsed_ms": self.elapsed_ms,
-            "expanded_nodes": self.expanded_nodes,
-            "unique_states": self.unique_states,
-        }
-
-    @staticmethod
-    def from_dict(data: dict) -> "SeedRow":
-        return SeedRow(
-            seed=int(data["seed"]),
-            status=str(data["status"]),
-            score=(None if data.get("score") is None else float(data["score"])),
-            band=(None if data.get("band") is None else str(data["band"])),
-            reason=(None if data.get("reason") is None else str(data["reason"])),
-            elapsed_ms=float(data.get("elapsed_ms", 0.0)),
-            expanded_nodes=int(data.get("expanded_nodes", 0)),
-            unique_states=int(data.get("unique_states", 0)),
-        )
-
-
-def _quantile(values: list[float], q: float) -> float:
-    if not values:
-        raise ValueError("empty values")
-    if q <= 0:
-        return values[0]
-    if q >= 1:
-        return values[-1]
-
-    pos = (len(values) - 1) * q
-    lo = int(math.floor(pos))
-    hi = int(math.ceil(pos))
-    if lo == hi:
-        return values[lo]
-    alpha = pos - lo
-    return values[lo] * (1.0 - alpha) + values[hi] * alpha
-
-
 def bucket_solved_rows(rows: Iterable[SeedRow]) -> tuple[dict[str, list[SeedRow]], dict[str, float]]:
+    """Split solved rows into Easy/Medium/Hard by exact score tertiles, each ordered by score."""
     solved = [row for row in rows if row.status == "solved" and row.score is not None]
     if not solved:
         return {"Easy": [], "Medium": [], "Hard": []}, {"q33": 0.0, "q66": 0.0}
 
     scores = sorted(float(row.score) for row in solved)
-    q33 = _quantile(scores, 1.0 / 3.0)
-    q66 = _quantile(scores, 2.0 / 3.0)
+    q33 = quantile(scores, 1.0 / 3.0)
+    q66 = quantile(scores, 2.0 / 3.0)
+    ordered = sorted(solved, key=lambda r: (float(r.score), r.seed))
 
     buckets: dict[str, list[SeedRow]] = {"Easy": [], "Medium": [], "Hard": []}
-    for row in sorted(solved, key=lambda r: (float(r.score), r.seed)):
+    for row in ordered:
         score = float(row.score)
         if score <= q33:
             key = "Easy"
@@ -104,17 +76,95 @@ def bucket_solved_rows(rows: Iterable[SeedRow]) -> tuple[dict[str, list[SeedRow]
     return buckets, {"q33": round(q33, 6), "q66": round(q66, 6)}
 
 
-def _analyze_one(
-    seed: int,
-    suits: int,
-    max_nodes: int,
-    max_seconds: float,
-    max_frontier: int,
-    single_stage: bool,
-) -> SeedRow:
-    limits = SearchLimits(max_nodes=max_nodes, max_seconds=max_seconds, max_frontier=max_frontier)
-    result = analyze_seed(seed=seed, suits=suits, limits=limits, staged=not single_stage)
+def sketch_from_rows(rows: Iterable[SeedRow]) -> KllSketch:
+    sketch = KllSketch()
+    sketch.extend(float(row.score) for row in rows if row.status == "solved" and row.score is not None)
+    return sketch
+
+
+def _load_sketch(meta_json_path: Path, existing_rows: list[SeedRow]) -> KllSketch:
+    """Reuse the persisted sketch when it still covers exactly the loaded solved rows."""
+    solved = sum(1 for row in existing_rows if row.status == "solved" and row.score is not None)
+    try:
+        data = json.loads(meta_json_path.read_text(encoding="utf-8")).get("sketch")
+        if isinstance(data, dict):
+            sketch = KllSketch.from_dict(data)
+            if sketch.count == solved:
+                return sketch
+    except Exception:
+        pass
+    return sketch_from_rows(existing_rows)
+
+
+@dataclass(frozen=True, slots=True)
+class RowSearch:
+    """Per-task search settings shipped to workers."""
+
+    suits: int
+    max_nodes: int
+    max_seconds: float
+    max_frontier: int
+    single_stage: bool
+    tier: Optional[int] = None
+    max_rss_mb: float = 0.0
+    deterministic: bool = False
+
+
+class BucketQuota:
+    """
+    Running Easy/Medium/Hard counts under the current solved-score tertiles.
+
+    Mirrors :func:`bucket_solved_rows` incrementally so a build can stop as
+    soon as every bucket holds ``target`` seeds.
+    """
+
+    def __init__(self, target: int, rows: Iterable[SeedRow] = ()):
+        self.target = target
+        self._scores: list[float] = []
+        self._score_by_seed: dict[int, float] = {}
+        for row in rows:
+            self.add(row)
+
+    def add(self, row: SeedRow) -> None:
+        old = self._score_by_seed.pop(row.seed, None)
+        if old is not None:
+            del self._scores[bisect.bisect_left(self._scores, old)]
+        if row.status == "solved" and row.score is not None:
+            score = float(row.score)
+            self._score_by_seed[row.seed] = score
+            bisect.insort(self._scores, score)
+
+    def counts(self) -> dict[str, int]:
+        if not self._scores:
+            return {"Easy": 0, "Medium": 0, "Hard": 0}
+        easy = bisect.bisect_right(self._scores, quantile(self._scores, 1.0 / 3.0))
+        medium = bisect.bisect_right(self._scores, quantile(self._scores, 2.0 / 3.0)) - easy
+        return {"Easy": easy, "Medium": medium, "Hard": len(self._scores) - easy - medium}
+
+    def satisfied(self) -> bool:
+        return self.target > 0 and all(count >= self.target for count in self.counts().values())
+
+    def to_dict(self) -> dict:
+        return {"target_per_bucket": self.target, "counts": self.counts(), "satisfied": self.satisfied()}
+
+
+def _analyze_one(seed: int, search: RowSearch) -> SeedRow:
+    limits = SearchLimits(
+        max_nodes=search.max_nodes,
+        max_seconds=search.max_seconds,
+        max_frontier=search.max_frontier,
+        max_rss_mb=search.max_rss_mb,
+        deterministic=search.deterministic,
+    )
+    result = analyze_seed(seed=seed, suits=search.suits, limits=limits, staged=not search.single_stage)
     metrics = result.metrics
+    components = metrics.get("difficulty_components")
+    solution = None
+    if result.status == "solved":
+        try:
+            solution = encode_actions(parse_notation(text) for text in result.solution)
+        except ValueError:
+            solution = None
     return SeedRow(
         seed=seed,
         status=result.status,
@@ -124,80 +174,248 @@ def _analyze_one(
         elapsed_ms=float(metrics.get("elapsed_ms", 0.0)),
         expanded_nodes=int(metrics.get("expanded_nodes", 0)),
         unique_states=int(metrics.get("unique_states", 0)),
+        max_seconds=search.max_seconds,
+        max_nodes=search.max_nodes,
+        tier=search.tier,
+        components=(None if components is None else tuple(float(components[name]) for name in DIFFICULTY_COMPONENTS)),
+        solution=solution,
     )
 
 
-def _iter_rows_parallel(
-    seeds: list[int],
-    suits: int,
-    max_nodes: int,
-    max_seconds: float,
-    max_frontier: int,
-    single_stage: bool,
+def _analyze_chunk(seeds: list[int], search: RowSearch) -> list[SeedRow]:
+    return [_analyze_one(seed, search) for seed in seeds]
+
+
+def _lost_row(seed: int, search: RowSearch) -> SeedRow:
+    # The worker died (typically OOM-killed) while this seed was in flight.
+    return SeedRow(
+        seed=seed,
+        status="memory_limit",
+        score=None,
+        band=None,
+        reason="worker_lost",
+        elapsed_ms=0.0,
+        expanded_nodes=0,
+        unique_states=0,
+        max_seconds=search.max_seconds,
+        max_nodes=search.max_nodes,
+        tier=search.tier,
+    )
+
+
+def _default_chunk_size(suits: int) -> int:
+    # 1-suit seeds usually finish in milliseconds; batch them to cut dispatch overhead.
+    return 8 if suits == 1 else 1
+
+
+def _interleave(chunk_lists: list[list[list[int]]]) -> Iterator[tuple[int, list[int]]]:
+    """Round-robin ``(job, chunk)`` pairs so every job keeps a share of the workers."""
+    iters = [iter(chunks) for chunks in chunk_lists]
+    live = list(range(len(iters)))
+    while live:
+        for job in list(live):
+            chunk = next(iters[job], None)
+            if chunk is None:
+                live.remove(job)
+            else:
+                yield job, chunk
+
+
+def _iter_rows_multi(
+    jobs: list[tuple[RowSearch, list[int]]],
     workers: int,
     progress_every: int,
     on_row: Optional[Callable[[int, list[SeedRow]], None]] = None,
-) -> list[SeedRow]:
-    rows: list[SeedRow] = []
+    chunk_sizes: Optional[list[int]] = None,
+    inflight_per_worker: int = 4,
+    should_stop: Optional[Callable[[int], bool]] = None,
+    max_pool_strikes: int = 3,
+) -> list[list[SeedRow]]:
+    """
+    Analyze several ``(search, seeds)`` jobs in one worker pool.
+
+    Returns one row list per job, each in completion order. Chunks of the
+    jobs are submitted round-robin through one bounded window of
+    ``workers * inflight_per_worker`` tasks. ``on_row(job, rows)`` sees the
+    job's rows so far. Once ``should_stop(job)`` is true that job submits no
+    more work and its queued tasks are cancelled. A worker crash rebuilds the
+    pool after re-running every seed that was in flight alone in a one-worker
+    pool; a seed that breaks that pool ``max_pool_strikes`` times is recorded
+    by :func:`_lost_row`.
+    """
+    searches = [search for search, _ in jobs]
+    sizes = chunk_sizes or [1] * len(jobs)
+    results: list[list[SeedRow]] = [[] for _ in jobs]
+    total = sum(len(seeds) for _, seeds in jobs)
+    done_count = 0
     started = time.perf_counter()
 
+    def chunked(job: int, seeds: list[int]) -> list[list[int]]:
+        size = max(1, sizes[job])
+        return [seeds[i : i + size] for i in range(0, len(seeds), size)]
+
+    def report(queue_depth: int) -> None:
+        if progress_every > 0 and done_count % progress_every == 0:
+            elapsed = (time.perf_counter() - started) * 1000.0
+            print(f"progress {done_count}/{total} elapsed_ms={elapsed:.1f} queue_depth={queue_depth}")
+
+    def emit(job: int, row: SeedRow, queue_depth: int) -> None:
+        nonlocal done_count
+        results[job].append(row)
+        done_count += 1
+        if on_row is not None:
+            on_row(job, results[job])
+        report(queue_depth)
+
+    def stopping(job: int) -> bool:
+        return should_stop is not None and should_stop(job)
+
     if workers <= 1:
-        for idx, seed in enumerate(seeds, 1):
-            row = _analyze_one(seed, suits, max_nodes, max_seconds, max_frontier, single_stage)
-            rows.append(row)
-            if on_row is not None:
-                on_row(idx, rows)
-            if progress_every > 0 and idx % progress_every == 0:
-                elapsed = (time.perf_counter() - started) * 1000.0
-                print(f"progress {idx}/{len(seeds)} elapsed_ms={elapsed:.1f}")
-        return rows
+        for job, chunk in _interleave([chunked(job, seeds) for job, (_, seeds) in enumerate(jobs)]):
+            for seed in chunk:
+                if stopping(job):
+                    break
+                emit(job, _analyze_one(seed, searches[job]), 0)
+        return results
 
-    try:
-        with ProcessPoolExecutor(max_workers=workers) as exe:
-            futures = {
-                exe.submit(_analyze_one, seed, suits, max_nodes, max_seconds, max_frontier, single_stage): seed
-                for seed in seeds
-            }
-            done = 0
-            for fut in as_completed(futures):
-                rows.append(fut.result())
-                done += 1
-                if on_row is not None:
-                    on_row(done, rows)
-                if progress_every > 0 and done % progress_every == 0:
-                    elapsed = (time.perf_counter() - started) * 1000.0
-                    print(f"progress {done}/{len(seeds)} elapsed_ms={elapsed:.1f}")
-        return rows
-    except PermissionError:
-        print("process pool unavailable in current environment; fallback to thread pool")
+    def isolate(make_executor: Callable[[int], Executor], suspects: deque[tuple[int, int]]) -> None:
+        # Seeds in flight when a pool broke run one at a time in a one-worker
+        # pool, so a crash there can only be the seed that was running.
+        strikes: dict[tuple[int, int], int] = {}
+        while suspects:
+            with make_executor(1) as exe:
+                while suspects:
+                    job, seed = suspects[0]
+                    if stopping(job):
+                        suspects.popleft()
+                        continue
+                    try:
+                        chunk_rows = exe.submit(_analyze_chunk, [seed], searches[job]).result()
+                    except BrokenProcessPool:
+                        break
+                    suspects.popleft()
+                    for row in chunk_rows:
+                        emit(job, row, len(suspects))
+            if not suspects:
+                return
+            job, seed = suspects[0]
+            strikes[(job, seed)] = strikes.get((job, seed), 0) + 1
+            print(f"seed {seed} broke an isolated worker ({strikes[(job, seed)]}/{max_pool_strikes})")
+            if strikes[(job, seed)] >= max_pool_strikes:
+                suspects.popleft()
+                emit(job, _lost_row(seed, searches[job]), len(suspects))
 
-    with ThreadPoolExecutor(max_workers=workers) as exe:
-        futures = {
-            exe.submit(_analyze_one, seed, suits, max_nodes, max_seconds, max_frontier, single_stage): seed
-            for seed in seeds
-        }
-        done = 0
-        for fut in as_completed(futures):
-            rows.append(fut.result())
-            done += 1
-            if on_row is not None:
-                on_row(done, rows)
-            if progress_every > 0 and done % progress_every == 0:
-                elapsed = (time.perf_counter() - started) * 1000.0
-                print(f"progress {done}/{len(seeds)} elapsed_ms={elapsed:.1f}")
+    def run_pool(make_executor: Callable[[int], Executor], todo: list[list[int]]) -> None:
+        chunks = _interleave([chunked(job, seeds) for job, seeds in enumerate(todo)])
+        window = max(1, workers * max(1, inflight_per_worker))
+        suspects: deque[tuple[int, int]] = deque()
 
-    return rows
+        while True:
+            isolate(make_executor, suspects)
+            pending: dict = {}
+            lost: list[tuple[int, list[int]]] = []
+            with make_executor(workers) as exe:
+
+                def fill() -> None:
+                    for fut, (job, _) in list(pending.items()):
+                        if stopping(job) and fut.cancel():
+                            pending.pop(fut)
+                    while len(pending) < window:
+                        item = next(chunks, None)
+                        if item is None:
+                            return
+                        if stopping(item[0]):
+                            continue
+                        pending[exe.submit(_analyze_chunk, item[1], searches[item[0]])] = item
+
+                fill()
+                while pending and not lost:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        job, chunk = pending.pop(fut)
+                        try:
+                            chunk_rows = fut.result()
+                        except BrokenProcessPool:
+                            lost.append((job, chunk))
+                            continue
+                        for row in chunk_rows:
+                            emit(job, row, len(pending))
+                    if lost:
+                        lost.extend(pending.values())
+                        pending.clear()
+                    else:
+                        fill()
+            if not lost:
+                return
+
+            # Queued seeds fail along with the running ones, so none is struck here.
+            suspects.extend((job, seed) for job, chunk in lost for seed in chunk)
+            print(f"worker pool broke with {len(suspects)} seeds in flight; retrying them one at a time")
+
+    run_pool(lambda n: make_worker_pool(n, log=print), [seeds for _, seeds in jobs])
+    return results
+
+
+def predict_seed_costs(
+    seeds: list[int],
+    suits: int,
+    workers: int,
+    probe_nodes: int = DEFAULT_PROBE_NODES,
+    chunk_size: int = 16,
+) -> dict[int, dict[str, float]]:
+    """Cost-model features per seed, computed in the worker pool."""
+    chunks = [seeds[i : i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    features: dict[int, dict[str, float]] = {}
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            features.update(features_chunk(chunk, suits, probe_nodes))
+        return features
+    with make_worker_pool(workers, log=print) as exe:
+        for part in exe.map(features_chunk, chunks, [suits] * len(chunks), [probe_nodes] * len(chunks)):
+            features.update(part)
+    return features
+
+
+def tier_budgets(max_seconds: float, max_nodes: int, tiers: int, growth: float) -> list[tuple[float, int]]:
+    """Geometric (seconds, nodes) budgets ending at the ceiling, smallest first."""
+    tiers = max(1, tiers)
+    growth = max(1.0, growth)
+    budgets: list[tuple[float, int]] = []
+    for idx in range(tiers):
+        factor = growth ** (tiers - 1 - idx)
+        budgets.append((round(max_seconds / factor, 6), max(1, int(max_nodes / factor))))
+    return budgets
+
+
+def _journal_path(rows_csv_path: Path) -> Path:
+    return rows_csv_path.with_name(rows_csv_path.stem + ".journal.jsonl")
+
+
+def shard_output_path(meta_json_path: Path, shard_index: int, shard_count: int) -> Path:
+    return meta_json_path.with_name(f"{meta_json_path.stem}.shard{shard_index}of{shard_count}{meta_json_path.suffix}")
 
 
-def _default_output_path(suits: int) -> Path:
-    return Path(__file__).resolve().parents[1] / "data" / f"seed_pool_{suits}s.json"
+def shard_seeds(start_seed: int, count: int, shard_index: int, shard_count: int) -> list[int]:
+    """Seeds of ``[start_seed, start_seed + count)`` owned by one shard (``seed % shard_count``)."""
+    return [seed for seed in range(start_seed, start_seed + count) if seed % shard_count == shard_index]
 
 
-def _derive_output_paths(meta_json_path: Path) -> tuple[Path, Path]:
-    base_name = meta_json_path.stem
-    parent = meta_json_path.parent
-    rows_csv = parent / f"{base_name}_rows.csv"
-    return meta_json_path, rows_csv
+def _cost_log_path(rows_csv_path: Path) -> Path:
+    return rows_csv_path.with_name(rows_csv_path.stem + ".cost_log.jsonl")
+
+
+def _status_path(rows_csv_path: Path) -> Path:
+    return rows_csv_path.with_name(rows_csv_path.stem + ".status.json")
+
+
+def _replay_journal_rows(path: Path) -> list[SeedRow]:
+    rows: list[SeedRow] = []
+    for item in replay_journal(path):
+        try:
+            rows.append(SeedRow.from_dict(item))
+        except Exception:
+            continue
+    return rows
 
 
 def _relative_file_ref(meta_json_path: Path, target_path: Path) -> str:
@@ -209,70 +427,258 @@ def _relative_file_ref(meta_json_path: Path, target_path: Path) -> str:
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build seed pools by quantile-bucketed difficulty.")
-    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), required=True, help="Suit count.")
+    parser.add_argument(
+        "--suits",
+        type=_parse_suit_counts,
+        required=True,
+        help="Suit count, or several (e.g. 1,2,3,4) to build those pools in one run sharing one worker pool.",
+    )
     parser.add_argument("--start-seed", type=int, default=None, help="Start seed inclusive. Default: random.")
-    parser.add_argument("--count", type=int, required=True, help="How many seeds to scan.")
+    parser.add_argument("--count", type=int, default=None, help="How many seeds to scan.")
+    parser.add_argument(
+        "--seed-file",
+        type=str,
+        default="",
+        help="Scan the seeds listed in this file (e.g. from solver.pool_query; '-' reads stdin) instead of a range.",
+    )
     parser.add_argument("--workers", type=int, default=_default_workers(), help="Parallel workers.")
-    parser.add_argument("--max-seconds", type=float, default=4.0, help="Per-seed search time budget.")
-    parser.add_argument("--max-nodes", type=int, default=1_500_000, help="Per-seed node budget.")
+    parser.add_argument("--max-seconds", type=float, default=4.0, help="Per-seed search time budget (tier ceiling).")
+    parser.add_argument("--max-nodes", type=int, default=1_500_000, help="Per-seed node budget (tier ceiling).")
+    parser.add_argument(
+        "--tiers",
+        type=int,
+        default=1,
+        help="Budget passes; later passes re-run only unknown seeds with geometrically larger budgets.",
+    )
+    parser.add_argument("--tier-growth", type=float, default=4.0, help="Budget growth factor between tiers.")
+    parser.add_argument(
+        "--target-per-bucket",
+        type=_parse_bucket_targets,
+        default={},
+        help=(
+            "Stop once Easy/Medium/Hard each hold this many seeds; --count becomes the scan limit. "
+            "Per suit count: e.g. 1:5000,4:2000 (suit counts not listed get no quota)."
+        ),
+    )
     parser.add_argument("--max-frontier", type=int, default=800_000, help="Per-seed frontier budget.")
+    parser.add_argument(
+        "--schedule",
+        choices=("seed", "cost"),
+        default="seed",
+        help="Dispatch order: seed order, or longest predicted cost first (see solver.cost_model).",
+    )
+    parser.add_argument(
+        "--cost-model",
+        type=str,
+        default="",
+        help="Cost model JSON for --schedule cost. Default: data/seed_cost_model_{suits}s.json (built-in prior if missing).",
+    )
+    parser.add_argument("--probe-nodes", type=int, default=DEFAULT_PROBE_NODES, help="Probe search nodes per seed.")
+    parser.add_argument(
+        "--triage",
+        choices=("off", "skip", "defer"),
+        default="off",
+        help=(
+            "Pre-classify seeds (see solver.solvability): skip or queue last those unlikely to resolve. "
+            "skip needs a model fit on this budget and --probe-nodes; otherwise it defers."
+        ),
+    )
+    parser.add_argument(
+        "--min-solve-prob",
+        type=float,
+        default=0.05,
+        help="--triage threshold on the predicted chance of resolving under the budget.",
+    )
+    parser.add_argument(
+        "--solvability-model",
+        type=str,
+        default="",
+        help="Model JSON for --triage. Default: data/seed_solvability_{suits}s.json (built-in prior if missing).",
+    )
     parser.add_argument("--single-stage", action="store_true", help="Disable staged widening search.")
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help=(
+            "Budget each seed by --max-nodes only so rows are identical on any machine; "
+            "--max-seconds becomes a safety cap recorded as reason time_cap."
+        ),
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=0.0,
+        help="Per-seed RSS growth cap in MiB; seeds that exceed it are recorded as memory_limit. 0 disables.",
+    )
     parser.add_argument("--progress-every", type=int, default=10, help="Print progress every N completed seeds.")
-    parser.add_argument("--save-interval-sec", type=float, default=60.0, help="Checkpoint save interval in seconds.")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        help="Seeds per worker task. Default: 8 for 1 suit, otherwise 1.",
+    )
+    parser.add_argument(
+        "--save-interval-sec",
+        type=float,
+        default=60.0,
+        help="Interval in seconds between journal fsyncs.",
+    )
     parser.add_argument(
         "--out",
         type=str,
         default="",
         help="Output JSON path. Default: data/seed_pool_{suits}s.json",
     )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        default="",
+        help="Directory for seed_pool_{suits}s.json of every --suits pool. Default: data/",
+    )
     parser.add_argument("--raw-jsonl", type=str, default="", help="Optional raw per-seed JSONL path.")
+    parser.add_argument(
+        "--status-json",
+        type=str,
+        default="",
+        help="Live telemetry JSON path. Default: data/seed_pool_{suits}s_rows.status.json",
+    )
+    parser.add_argument("--prometheus", type=str, default="", help="Optional Prometheus text-format telemetry path.")
+    parser.add_argument("--status-interval-sec", type=float, default=10.0, help="Telemetry write interval; 0 disables.")
+    parser.add_argument(
+        "--db",
+        type=str,
+        default="",
+        help="Also write rows to this SQLite seed database (see solver.seed_db) in batched transactions.",
+    )
+    parser.add_argument("--db-batch", type=int, default=500, help="Rows per SQLite insert transaction.")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite output instead of merging existing json.")
+    parser.add_argument("--shard-index", type=int, default=0, help="This node's shard in [0, --shard-count).")
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="Split the seed range by seed %% shard-count; each shard writes {out}.shard{i}of{n}.json.",
+    )
+    parser.add_argument("--resume", action="store_true", help="Skip seeds already present in the existing rows.")
+    parser.add_argument(
+        "--rerun-below-budget",
+        action="store_true",
+        help="With --resume, re-run unknown rows whose recorded budget is below --max-seconds/--max-nodes.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Only fold the row journal into the CSV/JSON artifacts, then exit.",
+    )
+    parser.add_argument(
+        "--exact-quantiles",
+        action="store_true",
+        help="Bucket by exact sorted tertiles instead of the streaming sketch, and report the sketch error.",
+    )
     args = parser.parse_args()
-    if not args.out:
-        args.out = str(_default_output_path(args.suits))
+    args.suit_counts = args.suits
+    args.suits = args.suit_counts[0]
+    if len(args.suit_counts) > 1:
+        single_pool = [flag for flag in ("out", "status_json", "prometheus", "cost_model", "solvability_model", "raw_jsonl") if getattr(args, flag)]
+        if single_pool:
+            parser.error(f"--{single_pool[0].replace('_', '-')} names one pool's file; give a single --suits to use it")
+    if args.out and args.out_dir:
+        parser.error("--out and --out-dir are mutually exclusive")
+    targets = args.target_per_bucket
+    args.bucket_targets = targets
+    args.target_per_bucket = targets.get(args.suits, targets.get(None, 0))
+    if args.seed_file and (args.start_seed is not None or args.count is not None):
+        parser.error("--seed-file replaces --start-seed/--count")
+    if args.count is None and not args.compact and not args.seed_file:
+        parser.error("--count is required unless --compact or --seed-file is given")
+    if args.shard_count < 1 or not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be in [0, --shard-count)")
+    if args.shard_count > 1 and args.start_seed is None and not args.compact and not args.seed_file:
+        parser.error("--start-seed is required with --shard-count so all shards share one range")
+    if len(args.suit_counts) == 1:
+        if not args.out:
+            args.out = str(_suit_output_path(args, args.suits))
+        if args.shard_count > 1:
+            args.out = str(shard_output_path(Path(args.out), args.shard_index, args.shard_count))
     return args
 
 
-def _stats(rows: list[SeedRow]) -> dict:
-    solved = sum(1 for r in rows if r.status == "solved")
-    unknown = sum(1 for r in rows if r.status == "unknown")
-    proven_unsolvable = sum(1 for r in rows if r.status == "proven_unsolvable")
+def _suit_output_path(args: argparse.Namespace, suits: int) -> Path:
+    default = default_output_path(suits)
+    out_dir = getattr(args, "out_dir", "")
+    return Path(out_dir).expanduser() / default.name if out_dir else default
+
+
+def _parse_suit_counts(text: str) -> tuple[int, ...]:
+    try:
+        counts = tuple(int(part) for part in text.split(",") if part.strip())
+    except ValueError:
+        counts = ()
+    if not counts or any(c not in (1, 2, 3, 4) for c in counts) or len(set(counts)) != len(counts):
+        raise argparse.ArgumentTypeError(f"expected distinct suit counts from 1-4, e.g. 2 or 1,2,4; got {text!r}")
+    return counts
+
+
+def _parse_bucket_targets(text: str) -> dict[Optional[int], int]:
+    """``"2000"`` applies to every suit count; ``"1:5000,4:2000"`` sets quotas per suit count."""
+    targets: dict[Optional[int], int] = {}
+    try:
+        for part in (p.strip() for p in text.split(",")):
+            if not part:
+                continue
+            if ":" in part:
+                suits, target = part.split(":", 1)
+                targets[int(suits)] = int(target)
+            else:
+                targets[None] = int(part)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected N or SUITS:N[,SUITS:N...]; got {text!r}") from None
+    return targets
+
+
+def per_suit_args(args: argparse.Namespace) -> list[argparse.Namespace]:
+    """One namespace per pool of a (possibly multi-suit) run, with that pool's default paths and quota."""
+    out: list[argparse.Namespace] = []
+    for suits in getattr(args, "suit_counts", (args.suits,)):
+        suit_args = argparse.Namespace(**vars(args))
+        suit_args.suits = suits
+        targets = getattr(args, "bucket_targets", None)
+        if targets is not None:
+            suit_args.target_per_bucket = targets.get(suits, targets.get(None, 0))
+        if len(getattr(args, "suit_counts", ())) > 1:
+            suit_args.out = str(_suit_output_path(args, suits))
+            if args.shard_count > 1:
+                suit_args.out = str(shard_output_path(Path(suit_args.out), args.shard_index, args.shard_count))
+        out.append(suit_args)
+    return out
+
+
+def _stats(columns: RowColumns) -> dict:
+    counts = columns.status_counts()
     return {
-        "scanned": len(rows),
-        "solved": solved,
-        "unknown": unknown,
-        "proven_unsolvable": proven_unsolvable,
+        "scanned": len(columns),
+        **{status: counts.get(status, 0) for status in ("solved", "unknown", "proven_unsolvable", "memory_limit")},
     }
 
 
-def _load_existing_rows_from_csv(path: Path) -> list[SeedRow]:
-    if not path.exists() or not path.is_file():
-        return []
-    rows: list[SeedRow] = []
-    try:
-        with path.open("r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for item in reader:
-                if not isinstance(item, dict):
-                    continue
-                try:
-                    rows.append(
-                        SeedRow(
-                            seed=int(item.get("seed", "0")),
-                            status=str(item.get("status", "")),
-                            score=(None if not item.get("score") else float(item["score"])),
-                            band=(None if not item.get("band") else str(item["band"])),
-                            reason=(None if not item.get("reason") else str(item["reason"])),
-                            elapsed_ms=float(item.get("elapsed_ms", "0") or 0.0),
-                            expanded_nodes=int(item.get("expanded_nodes", "0") or 0),
-                            unique_states=int(item.get("unique_states", "0") or 0),
-                        )
-                    )
-                except Exception:
-                    continue
-    except Exception:
-        return []
-    return rows
+def _summarize_rows(merged_rows: list[SeedRow], sketch: Optional[KllSketch] = None) -> tuple[RowColumns, dict[str, list[int]], dict[str, float]]:
+    """
+    Columns of ``merged_rows`` with buckets assigned, seeds per bucket and
+    the score tertiles. Matches :func:`bucket_solved_rows`: exact tertiles
+    order buckets by score, a sketch's keep seed order.
+    """
+    columns = RowColumns.from_rows(merged_rows)
+    exact = sketch is None or sketch.count <= 0
+    if not exact:
+        q33, q66 = sketch.quantile(1.0 / 3.0), sketch.quantile(2.0 / 3.0)
+    else:
+        q33, q66 = columns.tertiles()
+    columns.assign_buckets(q33, q66)
+    seeds = columns.bucket_seeds(by_score=exact)
+    buckets = {name: seeds.get(name, []) for name in BUCKETS + (UNKNOWN_BUCKET,)}
+    if not any(buckets[name] for name in BUCKETS):
+        q33 = q66 = 0.0
+    return columns, buckets, {"q33": round(q33, 6), "q66": round(q66, 6)}
 
 
 def _load_existing_rows_from_legacy_json(path: Path) -> list[SeedRow]:
@@ -296,19 +702,84 @@ def _load_existing_rows_from_legacy_json(path: Path) -> list[SeedRow]:
     return rows
 
 
-def _load_existing_rows(rows_csv_path: Path, meta_json_path: Path) -> list[SeedRow]:
-    from_csv = _load_existing_rows_from_csv(rows_csv_path)
+def load_existing_rows(rows_csv_path: Path, meta_json_path: Path) -> list[SeedRow]:
+    # Columnar copy first: memory-mapped and typed, so no per-field parsing.
+    columns = load_pool_columns(rows_csv_path)
+    if columns is not None and len(columns):
+        return columns.to_rows()
+    from_csv = load_existing_rows_from_csv(rows_csv_path)
     if from_csv:
         return from_csv
     # Legacy csv fallback from previous format.
     legacy_details_csv = rows_csv_path.with_name(rows_csv_path.stem.replace("_rows", "_details") + rows_csv_path.suffix)
     if legacy_details_csv != rows_csv_path:
-        from_legacy_csv = _load_existing_rows_from_csv(legacy_details_csv)
+        from_legacy_csv = load_existing_rows_from_csv(legacy_details_csv)
         if from_legacy_csv:
             return from_legacy_csv
     return _load_existing_rows_from_legacy_json(meta_json_path)
 
 
+def _load_existing_search_budget(meta_json_path: Path) -> tuple[Optional[float], Optional[int]]:
+    """Pool-level budget, used for rows written before budgets were recorded per row."""
+    if not meta_json_path.exists() or not meta_json_path.is_file():
+        return None, None
+    try:
+        search = json.loads(meta_json_path.read_text(encoding="utf-8")).get("search") or {}
+        max_seconds = search.get("max_seconds")
+        max_nodes = search.get("max_nodes")
+        return (
+            None if max_seconds is None else float(max_seconds),
+            None if max_nodes is None else int(max_nodes),
+        )
+    except Exception:
+        return None, None
+
+
+def _fill_missing_budgets(rows: list[SeedRow], budget: tuple[Optional[float], Optional[int]]) -> list[SeedRow]:
+    max_seconds, max_nodes = budget
+    if max_seconds is None and max_nodes is None:
+        return rows
+    return [
+        replace(
+            row,
+            max_seconds=row.max_seconds if row.max_seconds is not None else max_seconds,
+            max_nodes=row.max_nodes if row.max_nodes is not None else max_nodes,
+        )
+        for row in rows
+    ]
+
+
+def _below_budget(row: SeedRow, max_seconds: float, max_nodes: int) -> bool:
+    if row.max_seconds is None or row.max_nodes is None:
+        return True
+    return row.max_seconds < max_seconds or row.max_nodes < max_nodes
+
+
+def select_pending_seeds(
+    seeds: Iterable[int],
+    existing_rows: list[SeedRow],
+    max_seconds: float,
+    max_nodes: int,
+    rerun_below_budget: bool = False,
+) -> list[int]:
+    """
+    Seeds that still need work when resuming.
+
+    Seeds without a row are always pending. With ``rerun_below_budget``,
+    ``unknown`` rows searched with a smaller time or node budget than the
+    current one are pending too; conclusive rows are never re-run.
+    """
+    by_seed = {row.seed: row for row in existing_rows}
+    pending: list[int] = []
+    for seed in seeds:
+        row = by_seed.get(seed)
+        if row is None:
+            pending.append(seed)
+        elif rerun_below_budget and row.status == "unknown" and _below_budget(row, max_seconds, max_nodes):
+            pending.append(seed)
+    return pending
+
+
 def merge_rows(existing: list[SeedRow], incoming: list[SeedRow]) -> list[SeedRow]:
     merged: dict[int, SeedRow] = {row.seed: row for row in existing}
     for row in incoming:
@@ -322,13 +793,10 @@ def _build_payload(
     rows: list[SeedRow],
     started: float,
     in_progress: bool,
+    sketch: Optional[KllSketch] = None,
+    summary: Optional[tuple[RowColumns, dict[str, list[int]], dict[str, float]]] = None,
 ) -> dict:
-    merged_rows = merge_rows(existing_rows, rows)
-    solved_buckets, quantiles = bucket_solved_rows(merged_rows)
-    unknown_rows = [row for row in merged_rows if row.status == "unknown"]
-    buckets = dict(solved_buckets)
-    buckets["unknown"] = unknown_rows
-    stats = _stats(merged_rows)
+    columns, buckets, quantiles = summary or _summarize_rows(merge_rows(existing_rows, rows), sketch)
     return {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "in_progress": in_progress,
@@ -339,17 +807,23 @@ def _build_payload(
             "max_frontier": args.max_frontier,
             "single_stage": args.single_stage,
             "workers": max(1, args.workers),
+            "max_rss_mb": getattr(args, "max_rss_mb", 0.0),
+            "deterministic": bool(getattr(args, "deterministic", False)),
         },
         "source": {
             "start_seed": args.start_seed,
             "count": args.count,
+            "seed_file": getattr(args, "seed_file", "") or None,
             "merge_mode": "overwrite" if args.overwrite else "merge",
+            "resume": bool(getattr(args, "resume", False)),
+            "shard": [getattr(args, "shard_index", 0), getattr(args, "shard_count", 1)],
             "existing_rows_loaded": len(existing_rows),
             "incoming_rows": len(rows),
         },
-        "stats": stats,
+        "stats": _stats(columns),
         "quantiles": quantiles,
-        "buckets": {key: [row.seed for row in rows_for_bucket] for key, rows_for_bucket in buckets.items()},
+        "quantile_method": "exact" if sketch is None else "kll",
+        "buckets": buckets,
         "build_elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
     }
 
@@ -360,133 +834,644 @@ def _write_json_atomic(path: Path, payload: dict) -> None:
     tmp.replace(path)
 
 
-def _write_csv_atomic(path: Path, fieldnames: list[str], rows: list[dict]) -> None:
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    with tmp.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
-    tmp.replace(path)
+def _write_artifacts(
+    args: argparse.Namespace,
+    meta_json_path: Path,
+    rows_csv_path: Path,
+    existing_rows: list[SeedRow],
+    rows: list[SeedRow],
+    started: float,
+    extra: Optional[dict] = None,
+    sketch: Optional[KllSketch] = None,
+) -> dict:
+    merged_rows = merge_rows(existing_rows, rows)
+    # Stats, tertiles, buckets and the CSV all come from one columnar copy of the rows.
+    summary = _summarize_rows(merged_rows, sketch)
+    columns, buckets, _ = summary
+
+    payload = _build_payload(args, existing_rows, rows, started, in_progress=False, sketch=sketch, summary=summary)
+    payload["files"] = {
+        "rows_csv": _relative_file_ref(meta_json_path, rows_csv_path),
+    }
+    if sketch is not None:
+        payload["sketch"] = sketch.to_dict()
+    if extra:
+        payload.update(extra)
+    _write_json_atomic(meta_json_path, payload)
+    write_csv_atomic(rows_csv_path, fieldnames=ROWS_CSV_FIELDS, rows=columns.csv_rows())
+    columns.write(columns_dir(rows_csv_path))
+    _write_components(components_path(meta_json_path), merged_rows)
+    _write_solutions(solutions_path(meta_json_path), merged_rows)
+    # Written after the JSON so the UI never sees an index older than the pool.
+    index_path = pool_index_path(meta_json_path)
+    try:
+        write_pool_index(index_path, {key: buckets[key] for key in BUCKETS})
+    except OverflowError:
+        index_path.unlink(missing_ok=True)
+        print(f"seeds outside uint32 range; skipped binary index {index_path}")
+    return payload
+
+
+def _write_components(path: Path, rows: list[SeedRow]) -> None:
+    # Rows loaded without the side file (seed DB, old pools) keep the stored components.
+    rows = _attach_components(rows, path)
+    scored = [row for row in rows if row.components is not None and len(row.components) == len(DIFFICULTY_COMPONENTS)]
+    if not scored:
+        path.unlink(missing_ok=True)
+        return
+    columns = {name: [row.components[i] for row in scored] for i, name in enumerate(DIFFICULTY_COMPONENTS)}
+    try:
+        write_columns(path, [row.seed for row in scored], columns)
+    except OverflowError:
+        path.unlink(missing_ok=True)
+        print(f"seeds outside uint32 range; skipped components file {path}")
+
+
+def _attach_components(rows: list[SeedRow], path: Path) -> list[SeedRow]:
+    """Rows with their stored difficulty components; the CSV does not carry them."""
+    seeds, columns = read_columns(path)
+    if not seeds or any(name not in columns for name in DIFFICULTY_COMPONENTS):
+        return rows
+    by_seed = {seed: tuple(columns[name][i] for name in DIFFICULTY_COMPONENTS) for i, seed in enumerate(seeds)}
+    return [
+        replace(row, components=by_seed[row.seed]) if row.components is None and row.seed in by_seed else row
+        for row in rows
+    ]
+
+
+def _write_solutions(path: Path, rows: list[SeedRow]) -> None:
+    rows = _attach_solutions(rows, path)
+    solutions = {row.seed: row.solution for row in rows if row.status == "solved" and row.solution is not None}
+    if not solutions:
+        path.unlink(missing_ok=True)
+        return
+    try:
+        write_solutions(path, solutions)
+    except struct.error:
+        path.unlink(missing_ok=True)
+        print(f"seeds outside uint32 range; skipped solutions file {path}")
+
+
+def _attach_solutions(rows: list[SeedRow], path: Path) -> list[SeedRow]:
+    try:
+        solutions = read_solutions(path)
+    except ValueError:
+        return rows
+    if not solutions:
+        return rows
+    return [
+        replace(row, solution=solutions[row.seed]) if row.solution is None and row.seed in solutions else row
+        for row in rows
+    ]
+
+
+def rescore_rows(rows: list[SeedRow], weights: Optional[dict[str, float]] = None) -> tuple[list[SeedRow], int]:
+    """
+    Recompute scores of solved rows from their stored components.
+
+    Returns the rescored rows and how many solved rows had no components
+    (those keep their old score).
+    """
+    weights = dict(DIFFICULTY_WEIGHTS if weights is None else weights)
+    scored = [i for i, row in enumerate(rows) if row.status == "solved" and row.components is not None]
+    columns = {name: [rows[i].components[k] for i in scored] for k, name in enumerate(DIFFICULTY_COMPONENTS)}
+    scores = weighted_sum(columns, weights, rows=len(scored))
+    out = list(rows)
+    for i, score in zip(scored, scores):
+        out[i] = replace(out[i], score=score, band=difficulty_band(score))
+    missing = sum(1 for row in rows if row.status == "solved" and row.components is None)
+    return out, missing
 
 
-def _bucket_by_seed(buckets: dict[str, list[SeedRow]]) -> dict[int, str]:
-    mapping: dict[int, str] = {}
-    for bucket_name, rows in buckets.items():
+_CONCLUSIVE_STATUSES = ("solved", "proven_unsolvable")
+
+
+def prefer_row(current: SeedRow, other: SeedRow) -> SeedRow:
+    """Conflict rule when merging shards: a conclusive status wins, then the larger budget."""
+    current_conclusive = current.status in _CONCLUSIVE_STATUSES
+    other_conclusive = other.status in _CONCLUSIVE_STATUSES
+    if current_conclusive != other_conclusive:
+        return other if other_conclusive else current
+    current_budget = (current.max_nodes or 0, current.max_seconds or 0.0)
+    other_budget = (other.max_nodes or 0, other.max_seconds or 0.0)
+    return other if other_budget > current_budget else current
+
+
+def merge_shard_rows(row_sets: Iterable[list[SeedRow]]) -> tuple[list[SeedRow], int]:
+    """Combine rows of several pools by seed; returns the merged rows and the conflict count."""
+    merged: dict[int, SeedRow] = {}
+    conflicts = 0
+    for rows in row_sets:
         for row in rows:
-            mapping[row.seed] = bucket_name
-    return mapping
-
-
-def _build_rows_csv_rows(merged_rows: list[SeedRow], buckets: dict[str, list[SeedRow]]) -> list[dict]:
-    bucket_map = _bucket_by_seed(buckets)
-    out: list[dict] = []
-    for row in merged_rows:
-        score = "" if row.score is None else f"{float(row.score):.6f}"
-        out.append(
-            {
-                "seed": int(row.seed),
-                "status": row.status,
-                "score": score,
-                "bucket": bucket_map.get(row.seed, ""),
-                "reason": ("" if row.reason is None else row.reason),
-                "elapsed_ms": f"{float(row.elapsed_ms):.3f}",
-                "expanded_nodes": int(row.expanded_nodes),
-                "unique_states": int(row.unique_states),
-            }
-        )
-    return out
+            current = merged.get(row.seed)
+            if current is None:
+                merged[row.seed] = row
+            elif current != row:
+                conflicts += 1
+                merged[row.seed] = prefer_row(current, row)
+    return [merged[k] for k in sorted(merged)], conflicts
 
 
-def main() -> None:
-    args = parse_args()
-    if args.start_seed is None:
-        args.start_seed = random.SystemRandom().randrange(0, 2_147_483_647)
-        print(f"start-seed not set; selected random start_seed={args.start_seed}")
-    seeds = list(range(args.start_seed, args.start_seed + args.count))
-    meta_json_path = Path(args.out).expanduser()
-    meta_json_path.parent.mkdir(parents=True, exist_ok=True)
-    meta_json_path, rows_csv_path = _derive_output_paths(meta_json_path)
-    existing_rows: list[SeedRow] = []
-    if not args.overwrite:
-        existing_rows = _load_existing_rows(rows_csv_path, meta_json_path)
+def _load_pool_meta(meta_json_path: Path) -> dict:
+    try:
+        data = json.loads(meta_json_path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
 
-    started = time.perf_counter()
-    last_save_at = started
 
-    def maybe_checkpoint(done: int, current_rows: list[SeedRow]) -> None:
-        nonlocal last_save_at
-        interval = max(0.0, float(args.save_interval_sec))
-        if interval <= 0:
-            return
-        now = time.perf_counter()
-        if (now - last_save_at) < interval:
-            return
-        merged_rows = merge_rows(existing_rows, list(current_rows))
-        solved_buckets, _ = bucket_solved_rows(merged_rows)
-        buckets = dict(solved_buckets)
-        buckets["unknown"] = [row for row in merged_rows if row.status == "unknown"]
-        payload = _build_payload(args, existing_rows, list(current_rows), started, in_progress=True)
-        payload["files"] = {
-            "rows_csv": _relative_file_ref(meta_json_path, rows_csv_path),
-        }
-        _write_json_atomic(meta_json_path, payload)
-        _write_csv_atomic(
-            rows_csv_path,
-            fieldnames=["seed", "status", "score", "bucket", "reason", "elapsed_ms", "expanded_nodes", "unique_states"],
-            rows=_build_rows_csv_rows(merged_rows, buckets),
-        )
-        last_save_at = now
-        print(
-            f"checkpoint saved out={meta_json_path} done={done}/{len(seeds)} "
-            f"scanned={payload['stats']['scanned']} solved={payload['stats']['solved']}"
-        )
+def _pool_build_args(suits: int, metas: list[dict], overwrite: bool) -> argparse.Namespace:
+    """Build arguments for rewriting a pool from existing pool metadata rather than a search."""
+    searches = [meta.get("search") or {} for meta in metas]
+    sources = [meta.get("source") or {} for meta in metas]
+    start_seeds = [src["start_seed"] for src in sources if src.get("start_seed") is not None]
+    return argparse.Namespace(
+        suits=suits,
+        max_seconds=max((float(s["max_seconds"]) for s in searches if s.get("max_seconds") is not None), default=None),
+        max_nodes=max((int(s["max_nodes"]) for s in searches if s.get("max_nodes") is not None), default=None),
+        max_frontier=max((int(s["max_frontier"]) for s in searches if s.get("max_frontier") is not None), default=None),
+        single_stage=any(bool(s.get("single_stage")) for s in searches),
+        deterministic=bool(searches) and all(bool(s.get("deterministic")) for s in searches),
+        workers=sum(int(s.get("workers") or 1) for s in searches),
+        start_seed=min(start_seeds, default=None),
+        count=None,
+        overwrite=overwrite,
+    )
 
-    rows = _iter_rows_parallel(
-        seeds=seeds,
-        suits=args.suits,
-        max_nodes=args.max_nodes,
-        max_seconds=args.max_seconds,
-        max_frontier=args.max_frontier,
-        single_stage=args.single_stage,
-        workers=max(1, args.workers),
-        progress_every=max(0, args.progress_every),
-        on_row=maybe_checkpoint,
+
+def parse_merge_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m solver.seed_pool_builder merge",
+        description="Merge shard pools into one pool and recompute its buckets.",
     )
-    rows.sort(key=lambda r: r.seed)
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), required=True, help="Suit count.")
+    parser.add_argument(
+        "--out",
+        type=str,
+        default="",
+        help="Merged output JSON path. Default: data/seed_pool_{suits}s.json",
+    )
+    parser.add_argument(
+        "shards",
+        nargs="*",
+        help="Shard JSON paths. Default: every {out}.shard*of*.json next to the output.",
+    )
+    parser.add_argument("--overwrite", action="store_true", help="Do not merge the existing output pool.")
+    parser.add_argument("--exact-quantiles", action="store_true", help="Bucket by exact sorted tertiles.")
+    args = parser.parse_args(argv)
+    if not args.out:
+        args.out = str(default_output_path(args.suits))
+    return args
 
-    merged_rows = merge_rows(existing_rows, rows)
-    solved_buckets, _ = bucket_solved_rows(merged_rows)
-    buckets = dict(solved_buckets)
-    buckets["unknown"] = [row for row in merged_rows if row.status == "unknown"]
 
-    payload = _build_payload(args, existing_rows, rows, started, in_progress=False)
-    payload["files"] = {
-        "rows_csv": _relative_file_ref(meta_json_path, rows_csv_path),
+def merge_main(argv: list[str]) -> None:
+    args = parse_merge_args(argv)
+    started = time.perf_counter()
+    meta_json_path, rows_csv_path = derive_output_paths(Path(args.out).expanduser())
+    shard_paths = [Path(p).expanduser() for p in args.shards]
+    if not shard_paths:
+        shard_paths = sorted(meta_json_path.parent.glob(f"{meta_json_path.stem}.shard*of*{meta_json_path.suffix}"))
+    if not shard_paths:
+        raise SystemExit(f"no shard pools found next to {meta_json_path}")
+
+    inputs = list(shard_paths)
+    if not args.overwrite and meta_json_path.exists():
+        inputs.insert(0, meta_json_path)
+    row_sets = [_load_pool_rows(path) for path in inputs]
+    metas = [_load_pool_meta(path) for path in inputs]
+    merged, conflicts = merge_shard_rows(row_sets)
+
+    sketch = None
+    if not args.exact_quantiles:
+        # Input sketches add up only when no seed is in two inputs; an existing
+        # merged pool overlaps its shards even where the rows agree.
+        if conflicts or sum(len(rows) for rows in row_sets) != len(merged):
+            sketch = sketch_from_rows(merged)
+        else:
+            sketch = KllSketch()
+            for path, rows in zip(inputs, row_sets):
+                sketch.merge(_load_sketch(path, rows))
+
+    build = _pool_build_args(args.suits, metas, args.overwrite)
+    extra = {
+        "merged_from": [_relative_file_ref(meta_json_path, path) for path in inputs],
+        "merge_conflicts": conflicts,
     }
-    _write_json_atomic(meta_json_path, payload)
-    _write_csv_atomic(
-        rows_csv_path,
-        fieldnames=["seed", "status", "score", "bucket", "reason", "elapsed_ms", "expanded_nodes", "unique_states"],
-        rows=_build_rows_csv_rows(merged_rows, buckets),
-    )
-    stats = payload["stats"]
+    payload = _write_artifacts(build, meta_json_path, rows_csv_path, merged, [], started, extra, sketch)
     quantiles = payload["quantiles"]
+    print(
+        f"merged out={meta_json_path} inputs={len(inputs)} scanned={payload['stats']['scanned']} "
+        f"solved={payload['stats']['solved']} conflicts={conflicts} q33={quantiles['q33']} q66={quantiles['q66']}"
+    )
+
 
-    if args.raw_jsonl:
-        raw_path = Path(args.raw_jsonl).expanduser()
-        raw_path.parent.mkdir(parents=True, exist_ok=True)
-        with raw_path.open("a", encoding="utf-8") as f:
-            for row in rows:
-                f.write(json.dumps(row.to_dict(), ensure_ascii=False) + "\n")
+def parse_rescore_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m solver.seed_pool_builder rescore",
+        description="Recompute scores and buckets from stored difficulty components, without searching.",
+    )
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), required=True, help="Suit count.")
+    parser.add_argument("--out", type=str, default="", help="Pool JSON path. Default: data/seed_pool_{suits}s.json")
+    parser.add_argument(
+        "--weights",
+        type=str,
+        default="",
+        help="JSON file of component weights overriding the analyzer's (missing components keep theirs).",
+    )
+    parser.add_argument("--exact-quantiles", action="store_true", help="Bucket by exact sorted tertiles.")
+    args = parser.parse_args(argv)
+    if not args.out:
+        args.out = str(default_output_path(args.suits))
+    return args
 
+
+def rescore_main(argv: list[str]) -> None:
+    args = parse_rescore_args(argv)
+    started = time.perf_counter()
+    meta_json_path, rows_csv_path = derive_output_paths(Path(args.out).expanduser())
+    weights = dict(DIFFICULTY_WEIGHTS)
+    if args.weights:
+        override = json.loads(Path(args.weights).expanduser().read_text(encoding="utf-8"))
+        unknown = sorted(set(override) - set(DIFFICULTY_WEIGHTS))
+        if unknown:
+            raise SystemExit(f"unknown difficulty components in {args.weights}: {', '.join(unknown)}")
+        weights.update({name: float(value) for name, value in override.items()})
+
+    rows = _load_pool_rows(meta_json_path)
+    if not rows:
+        raise SystemExit(f"no pool rows found for {meta_json_path}")
+    rows, missing = rescore_rows(rows, weights)
+    sketch = None if args.exact_quantiles else sketch_from_rows(rows)
+    build = _pool_build_args(args.suits, [_load_pool_meta(meta_json_path)], overwrite=False)
+    extra = {"rescored": {"weights": weights, "missing_components": missing}}
+    payload = _write_artifacts(build, meta_json_path, rows_csv_path, rows, [], started, extra, sketch)
+    RowJournal(_journal_path(rows_csv_path)).reset()
+    quantiles = payload["quantiles"]
     print(
-        f"done out={meta_json_path} scanned={stats['scanned']} solved={stats['solved']} "
-        f"unknown={stats['unknown']} proven_unsolvable={stats['proven_unsolvable']} "
-        f"q33={quantiles['q33']} q66={quantiles['q66']} "
-        f"merged_existing={len(existing_rows)} incoming={len(rows)}"
+        f"rescored out={meta_json_path} solved={payload['stats']['solved']} missing_components={missing} "
+        f"q33={quantiles['q33']} q66={quantiles['q66']}"
     )
 
 
+def _load_pool_rows(meta_json_path: Path) -> list[SeedRow]:
+    meta_json_path, rows_csv_path = derive_output_paths(meta_json_path)
+    rows = load_existing_rows(rows_csv_path, meta_json_path)
+    # Rows from older pools carry no budget; attribute the pool-level one.
+    rows = _fill_missing_budgets(rows, _load_existing_search_budget(meta_json_path))
+    rows = _attach_components(rows, components_path(meta_json_path))
+    rows = _attach_solutions(rows, solutions_path(meta_json_path))
+    # Crash recovery: rows journaled after the last compaction win over the artifacts.
+    journal_path = _journal_path(rows_csv_path)
+    journal_rows = _replay_journal_rows(journal_path)
+    if journal_rows:
+        print(f"journal: replayed {len(journal_rows)} rows from {journal_path}")
+        rows = merge_rows(rows, journal_rows)
+    return rows
+
+
+class _SuitBuild:
+    """One pool's side of a build run: its files, existing rows, quota, telemetry and row sinks."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        meta_json_path = Path(args.out).expanduser()
+        meta_json_path.parent.mkdir(parents=True, exist_ok=True)
+        self.meta_json_path, self.rows_csv_path = derive_output_paths(meta_json_path)
+        self.journal = RowJournal(_journal_path(self.rows_csv_path))
+        if args.overwrite:
+            self.journal.reset()
+        self.existing_rows: list[SeedRow] = []
+        if not args.overwrite:
+            self.existing_rows = _load_pool_rows(self.meta_json_path)
+        self.started = time.perf_counter()
+        self.sketch = None if args.exact_quantiles else _load_sketch(self.meta_json_path, self.existing_rows)
+        self.seeds: list[int] = []
+        self.db: Optional[SeedDb] = None
+        self.db_pending: list[dict] = []
+        self.predicted: dict[int, float] = {}
+        self.cost_features: dict[int, dict[str, float]] = {}
+        self.cost_log = None
+        self.solve_prob: dict[int, float] = {}
+        self.low_prob: set[int] = set()
+        self.triage_mode = args.triage
+        self.quota: Optional[BucketQuota] = None
+        self.telemetry = BuildTelemetry(total=0, workers=max(1, args.workers))
+        self.status_json_path = Path(args.status_json).expanduser() if args.status_json else _status_path(self.rows_csv_path)
+        self.prometheus_path = Path(args.prometheus).expanduser() if args.prometheus else None
+        self.last_sync_at = self.started
+        self.last_status_at = self.started
+
+    def compact(self) -> None:
+        args = self.args
+        payload = _write_artifacts(args, self.meta_json_path, self.rows_csv_path, self.existing_rows, [], self.started, sketch=self.sketch)
+        self.journal.reset()
+        print(f"compacted out={self.meta_json_path} scanned={payload['stats']['scanned']}")
+
+    def prepare(self) -> None:
+        """Pick this pool's pending seeds and open its sinks."""
+        args = self.args
+        if args.seed_file:
+            seeds = [seed for seed in args.file_seeds if seed % args.shard_count == args.shard_index]
+        else:
+            seeds = shard_seeds(args.start_seed, args.count, args.shard_index, args.shard_count)
+        owned = len(seeds)
+        if args.resume:
+            seeds = select_pending_seeds(
+                seeds,
+                self.existing_rows,
+                max_seconds=args.max_seconds,
+                max_nodes=args.max_nodes,
+                rerun_below_budget=args.rerun_below_budget,
+            )
+            print(f"resume suits={args.suits}: {owned - len(seeds)} seeds already analyzed, {len(seeds)} pending")
+        self.seeds = seeds
+
+        self.db = SeedDb(Path(args.db).expanduser()) if args.db else None
+        if self.db is not None and (args.overwrite or not self.db.mirrors_pool(args.suits, self.meta_json_path)):
+            # First build against this database, a pool rebuilt without it, or an
+            # --overwrite build: the suit's rows become the pool as loaded.
+            self.db.clear_rows(args.suits)
+            self.db.upsert_rows(args.suits, (row.to_dict() for row in self.existing_rows))
+
+        if args.schedule == "cost" and seeds:
+            model = CostModel.load(Path(args.cost_model).expanduser() if args.cost_model else default_model_path(args.suits))
+            probe_started = time.perf_counter()
+            self.cost_features = predict_seed_costs(seeds, args.suits, max(1, args.workers), args.probe_nodes)
+            self.predicted = {seed: model.predict_ms(features) for seed, features in self.cost_features.items()}
+            cost_log_path = _cost_log_path(self.rows_csv_path)
+            self.cost_log = cost_log_path.open("a", encoding="utf-8")
+            print(
+                f"schedule suits={args.suits}: predicted {len(self.predicted)} seeds in "
+                f"{(time.perf_counter() - probe_started) * 1000.0:.1f}ms (model samples={model.samples}); log={cost_log_path}"
+            )
+
+        if args.triage != "off" and seeds:
+            self.triage()
+        if args.target_per_bucket > 0:
+            self.quota = BucketQuota(args.target_per_bucket, self.existing_rows)
+        self.telemetry.total = len(self.seeds)
+
+    def triage(self) -> None:
+        """Score every pending seed's chance to resolve; skip or defer the unlikely ones."""
+        args = self.args
+        path = Path(args.solvability_model).expanduser() if args.solvability_model else default_solvability_path(args.suits)
+        model = SolvabilityModel.load(path)
+        self.triage_mode = args.triage
+        blocker = model.skip_blocker(args.max_seconds, args.max_nodes, args.probe_nodes)
+        if blocker is not None and args.triage == "skip":
+            # Only a model fit for this exact setup may drop seeds; otherwise they are just queued last.
+            print(f"triage suits={args.suits}: {blocker}; deferring instead of skipping (refit {path} with solver.solvability)")
+            self.triage_mode = "defer"
+        else:
+            mismatch = model.budget_mismatch(args.max_seconds, args.max_nodes)
+            if mismatch is not None:
+                print(f"triage suits={args.suits}: warning: {mismatch}; probabilities may be off")
+        features = self.cost_features or predict_seed_costs(self.seeds, args.suits, max(1, args.workers), args.probe_nodes)
+        self.solve_prob = {seed: model.probability(f) for seed, f in features.items()}
+        self.low_prob = {seed for seed, p in self.solve_prob.items() if p < args.min_solve_prob}
+        if self.triage_mode == "skip":
+            self.seeds = [seed for seed in self.seeds if seed not in self.low_prob]
+        print(
+            f"triage suits={args.suits}: {len(self.low_prob)}/{len(self.solve_prob)} seeds below "
+            f"p={args.min_solve_prob} {'skipped' if self.triage_mode == 'skip' else 'deferred'} (model samples={model.samples})"
+        )
+
+    def triage_report(self, rows: list[SeedRow]) -> dict:
+        """Resolve rates of analyzed seeds above and below the threshold, to judge the model."""
+        report: dict = {
+            "mode": self.triage_mode,
+            "min_solve_prob": self.args.min_solve_prob,
+            "scored": len(self.solve_prob),
+            "low": len(self.low_prob),
+        }
+        if self.triage_mode == "skip":
+            report["skipped"] = len(self.low_prob)
+        for name, group in (("high", [r for r in rows if r.seed not in self.low_prob]), ("low", [r for r in rows if r.seed in self.low_prob])):
+            group = [r for r in group if r.seed in self.solve_prob]
+            if group:
+                resolved = sum(1 for r in group if r.status in RESOLVED_STATUSES)
+                report[f"resolved_rate_{name}"] = round(resolved / len(group), 4)
+                report[f"cpu_ms_per_resolved_{name}"] = round(sum(r.elapsed_ms for r in group) / max(1, resolved), 3)
+        return report
+
+    def quota_met(self) -> bool:
+        return self.quota is not None and self.quota.satisfied()
+
+    def order(self, pending: list[int]) -> list[int]:
+        if not self.predicted and not self.low_prob:
+            return pending
+        # Deferred seeds last; otherwise longest expected first, so the tail of the run is short seeds.
+        return sorted(pending, key=lambda seed: (seed in self.low_prob, -self.predicted.get(seed, 0.0), seed))
+
+    def flush_db(self) -> None:
+        if self.db is not None and self.db_pending:
+            self.db.upsert_rows(self.args.suits, self.db_pending)
+            self.db_pending.clear()
+
+    def publish_status(self, finished: bool = False) -> None:
+        args = self.args
+        self.last_status_at = time.perf_counter()
+        snap = self.telemetry.write_status(
+            self.status_json_path, {"suits": args.suits, "out": str(self.meta_json_path), "finished": finished}
+        )
+        if self.prometheus_path is not None:
+            self.telemetry.write_prometheus(self.prometheus_path, {"suits": str(args.suits), "pool": self.meta_json_path.stem})
+        if not finished:
+            print(
+                f"status suits={args.suits} done={snap['done']}/{snap['total']} rate={snap['seeds_per_sec_rolling']}/s "
+                f"util={snap['worker_utilization']} p95_ms={snap['elapsed_ms'].get('p95')} eta_s={snap['eta_seconds']}"
+            )
+
+    def on_row(self, row: SeedRow) -> None:
+        args = self.args
+        self.journal.append(row.to_dict())
+        self.telemetry.record(row.status, row.elapsed_ms)
+        if args.status_interval_sec > 0 and time.perf_counter() - self.last_status_at >= args.status_interval_sec:
+            self.publish_status()
+        if self.quota is not None:
+            self.quota.add(row)
+        if self.sketch is not None and row.status == "solved" and row.score is not None:
+            self.sketch.update(float(row.score))
+        if self.cost_log is not None and row.seed in self.predicted:
+            item = {
+                "seed": row.seed,
+                "suits": args.suits,
+                "status": row.status,
+                "elapsed_ms": row.elapsed_ms,
+                "predicted_ms": round(self.predicted[row.seed], 3),
+                "max_seconds": row.max_seconds,
+                "max_nodes": row.max_nodes,
+                "probe_nodes": args.probe_nodes,
+                "features": self.cost_features[row.seed],
+            }
+            self.cost_log.write(json.dumps(item, ensure_ascii=False) + "\n")
+        if self.db is not None:
+            self.db_pending.append(row.to_dict())
+            if len(self.db_pending) >= max(1, args.db_batch):
+                self.flush_db()
+        interval = max(0.0, float(args.save_interval_sec))
+        now = time.perf_counter()
+        if interval > 0 and (now - self.last_sync_at) >= interval:
+            self.journal.sync()
+            self.flush_db()
+            self.last_sync_at = now
+            print(
+                f"checkpoint journal={self.journal.path} done={self.telemetry.done}/{len(self.seeds)} "
+                f"journaled={self.journal.appended}"
+            )
+
+    def finish(self, rows: list[SeedRow], tier_report: list[dict], multi_tier: bool) -> None:
+        args = self.args
+        existing_rows = self.existing_rows
+        sketch = self.sketch
+        self.publish_status(finished=True)
+        extra: dict = {}
+        if self.cost_log is not None:
+            self.cost_log.close()
+            logged = [row for row in rows if row.seed in self.predicted]
+            extra["schedule"] = {
+                "mode": "cost",
+                "probe_nodes": args.probe_nodes,
+                "rank_correlation": round(
+                    rank_correlation([self.predicted[row.seed] for row in logged], [row.elapsed_ms for row in logged]), 4
+                ),
+            }
+            print(f"schedule suits={args.suits}: predicted/actual rank_correlation={extra['schedule']['rank_correlation']}")
+        if multi_tier:
+            extra["tiers"] = tier_report
+        if self.solve_prob:
+            extra["triage"] = self.triage_report(rows)
+            print(f"triage suits={args.suits}: {extra['triage']}")
+        if self.quota is not None:
+            extra["quota"] = self.quota.to_dict()
+            if self.quota.satisfied():
+                print(f"bucket quota met suits={args.suits}: {self.quota.counts()}")
+        if sketch is not None:
+            replaced = {row.seed for row in existing_rows if row.status == "solved"}
+            if any(row.seed in replaced for row in rows):
+                # Re-analyzed seeds would otherwise be counted twice.
+                sketch = sketch_from_rows(merge_rows(existing_rows, rows))
+        payload = _write_artifacts(args, self.meta_json_path, self.rows_csv_path, existing_rows, rows, self.started, extra, sketch)
+        self.journal.reset()
+        stats = payload["stats"]
+        quantiles = payload["quantiles"]
+        if self.db is not None:
+            self.flush_db()
+            self.db.assign_buckets(args.suits, quantiles["q33"], quantiles["q66"])
+            self.db.set_budget(args.suits, args.max_seconds, args.max_nodes, args.max_frontier, args.single_stage)
+            self.db.record_run(args.suits, payload)
+            self.db.mark_pool(args.suits, payload["generated_at"], self.meta_json_path)
+            self.db.close()
+        if args.exact_quantiles:
+            approx = sketch_from_rows(merge_rows(existing_rows, rows))
+            if approx.count > 0:
+                print(
+                    f"sketch check: q33={approx.quantile(1.0 / 3.0):.6f} q66={approx.quantile(2.0 / 3.0):.6f} "
+                    f"(exact q33={quantiles['q33']} q66={quantiles['q66']})"
+                )
+
+        if args.raw_jsonl:
+            raw_path = Path(args.raw_jsonl).expanduser()
+            raw_path.parent.mkdir(parents=True, exist_ok=True)
+            with raw_path.open("a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row.to_dict(), ensure_ascii=False) + "\n")
+
+        print(
+            f"done out={self.meta_json_path} scanned={stats['scanned']} solved={stats['solved']} "
+            f"unknown={stats['unknown']} proven_unsolvable={stats['proven_unsolvable']} "
+            f"memory_limit={stats['memory_limit']} "
+            f"q33={quantiles['q33']} q66={quantiles['q66']} "
+            f"merged_existing={len(existing_rows)} incoming={len(rows)}"
+        )
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["merge"]:
+        merge_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["rescore"]:
+        rescore_main(sys.argv[2:])
+        return
+    args = parse_args()
+    builds = [_SuitBuild(suit_args) for suit_args in per_suit_args(args)]
+    if args.compact:
+        for build in builds:
+            build.compact()
+        return
+
+    if args.seed_file:
+        args.file_seeds = list(dict.fromkeys(read_seed_file(args.seed_file)))
+        for build in builds:
+            build.args.file_seeds = args.file_seeds
+    elif args.start_seed is None:
+        args.start_seed = random.SystemRandom().randrange(0, 2_147_483_647)
+        print(f"start-seed not set; selected random start_seed={args.start_seed}")
+        for build in builds:
+            build.args.start_seed = args.start_seed
+    for build in builds:
+        build.prepare()
+
+    budgets = tier_budgets(args.max_seconds, args.max_nodes, args.tiers, args.tier_growth)
+    multi_tier = len(budgets) > 1
+    by_seed: list[dict[int, SeedRow]] = [{} for _ in builds]
+    tier_reports: list[list[dict]] = [[] for _ in builds]
+    pending = [build.seeds for build in builds]
+    with ExitStack() as stack:
+        for build in builds:
+            stack.enter_context(build.journal)
+        for tier_idx, (tier_seconds, tier_nodes) in enumerate(budgets, 1):
+            # Every pool still short of work or quota shares this tier's worker pool.
+            active = [i for i, build in enumerate(builds) if pending[i] and not build.quota_met()]
+            if not active:
+                break
+            for i in active:
+                pending[i] = builds[i].order(pending[i])
+                builds[i].telemetry.total = builds[i].telemetry.done + len(pending[i])
+            if multi_tier:
+                sizes = " ".join(f"{builds[i].args.suits}s={len(pending[i])}" for i in active)
+                print(f"tier {tier_idx}/{len(budgets)} seeds {sizes} max_seconds={tier_seconds} max_nodes={tier_nodes}")
+            jobs = [
+                (
+                    RowSearch(
+                        suits=builds[i].args.suits,
+                        max_nodes=tier_nodes,
+                        max_seconds=tier_seconds,
+                        max_frontier=args.max_frontier,
+                        single_stage=args.single_stage,
+                        tier=tier_idx if multi_tier else None,
+                        max_rss_mb=args.max_rss_mb,
+                        deterministic=args.deterministic,
+                    ),
+                    pending[i],
+                )
+                for i in active
+            ]
+            results = _iter_rows_multi(
+                jobs,
+                workers=max(1, args.workers),
+                progress_every=max(0, args.progress_every),
+                on_row=lambda job, rows: builds[active[job]].on_row(rows[-1]),
+                chunk_sizes=[args.chunk_size if args.chunk_size > 0 else _default_chunk_size(builds[i].args.suits) for i in active],
+                should_stop=lambda job: builds[active[job]].quota_met(),
+            )
+            for i, tier_rows in zip(active, results):
+                for row in tier_rows:
+                    by_seed[i][row.seed] = row
+                pending[i] = sorted(row.seed for row in tier_rows if row.status == "unknown")
+                tier_reports[i].append(
+                    {
+                        "tier": tier_idx,
+                        "max_seconds": tier_seconds,
+                        "max_nodes": tier_nodes,
+                        "scanned": len(tier_rows),
+                        "resolved": len(tier_rows) - len(pending[i]),
+                    }
+                )
+
+    for i, build in enumerate(builds):
+        build.finish([by_seed[i][seed] for seed in sorted(by_seed[i])], tier_reports[i], multi_tier)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import mmap
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from base.Core import GameConfig
+from solver.analyzer import Action, SolveResult, SolverState, apply_action, build_initial_state, exact_state_key, plan_result
+
+MAGIC = b"SPSL"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_ENTRY = struct.Struct("<III")
+
+# One byte per deal, two per move: ``src * 10 + dest`` then ``src_idx``.
+_DEAL = 0xFF
+_MAX_STACKS = 10
+
+_MOVE_RE = re.compile(r"MOVE\(S(\d+):(\d+)->S(\d+),len=(\d+)\)")
+_DEAL_RE = re.compile(r"DEAL\((\d+)\)")
+
+
+def solutions_path(meta_json_path: Path) -> Path:
+    return meta_json_path.with_name(f"{meta_json_path.stem}_solutions.bin")
+
+
+def parse_notation(text: str) -> Action:
+    """Inverse of :meth:`Action.to_notation`."""
+    match = _MOVE_RE.fullmatch(text)
+    if match is not None:
+        src, idx, dest, moved = (int(v) for v in match.groups())
+        return Action(kind="MOVE", src_stack=src, src_idx=idx, dest_stack=dest, moved_len=moved)
+    match = _DEAL_RE.fullmatch(text)
+    if match is not None:
+        return Action(kind="DEAL", draw_count=int(match.group(1)))
+    raise ValueError(f"unknown action notation: {text!r}")
+
+
+def encode_actions(actions: Iterable[Action]) -> bytes:
+    """
+    Compact action list. ``moved_len`` and ``draw_count`` are dropped; they
+    follow from the position and are restored by :func:`replay_plan`.
+    """
+    out = bytearray()
+    for action in actions:
+        if action.kind == "DEAL":
+            out.append(_DEAL)
+            continue
+        if not (0 <= action.src_stack < _MAX_STACKS and 0 <= action.dest_stack < _MAX_STACKS and 0 <= action.src_idx < 256):
+            raise ValueError(f"action out of encodable range: {action.to_notation()}")
+        out.append(action.src_stack * _MAX_STACKS + action.dest_stack)
+        out.append(action.src_idx)
+    return bytes(out)
+
+
+def decode_actions(data: bytes) -> list[Action]:
+    actions: list[Action] = []
+    i = 0
+    while i < len(data):
+        code = data[i]
+        if code == _DEAL:
+            actions.append(Action(kind="DEAL"))
+            i += 1
+            continue
+        if i + 1 >= len(data) or code >= _MAX_STACKS * _MAX_STACKS:
+            raise ValueError(f"corrupt solution at byte {i}")
+        src, dest = divmod(code, _MAX_STACKS)
+        actions.append(Action(kind="MOVE", src_stack=src, src_idx=data[i + 1], dest_stack=dest))
+        i += 2
+    return actions
+
+
+def replay_plan(initial_state: SolverState, data: bytes) -> Optional[SolveResult]:
+    """A solved plan from ``initial_state``, or None if the stored actions do not apply to it."""
+    start = time.perf_counter()
+    try:
+        actions = decode_actions(data)
+    except ValueError:
+        return None
+    states = [initial_state]
+    full: list[Action] = []
+    for action in actions:
+        tr = apply_action(states[-1], action)
+        if tr is None:
+            return None
+        full.append(tr.action)
+        states.append(tr.state)
+    return plan_result(tuple(full), tuple(states), "stored_solution", 0, 0, start)
+
+
+def opening_plan(state: SolverState, seed: int, suits: int, data: bytes) -> Optional[SolveResult]:
+    """The stored plan for ``seed`` if ``state`` is still that deal's opening position."""
+    cfg = GameConfig()
+    cfg.seed = seed
+    cfg.suits = suits
+    opening = build_initial_state(cfg)
+    if exact_state_key(opening) != exact_state_key(state):
+        return None
+    return replay_plan(state, data)
+
+
+def write_solutions(path: Path, solutions: dict[int, bytes]) -> None:
+    """Header, ``(seed, offset, length)`` entries sorted by seed, then the encoded solutions."""
+    seeds = sorted(solutions)
+    offset = _HEADER.size + _ENTRY.size * len(seeds)
+    head = bytearray(_HEADER.pack(MAGIC, VERSION, 0, len(seeds)))
+    for seed in seeds:
+        head += _ENTRY.pack(seed, offset, len(solutions[seed]))
+        offset += len(solutions[seed])
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(head)
+        for seed in seeds:
+            f.write(solutions[seed])
+    tmp.replace(path)
+
+
+def _check_header(buf) -> int:
+    magic, version, _, count = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a seed solutions file")
+    return count
+
+
+def lookup_solution(path: Path, seed: int) -> Optional[bytes]:
+    """Binary search the entry table; reads only the entries probed and one solution."""
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        lo, hi = 0, _check_header(buf)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry_seed, offset, length = _ENTRY.unpack_from(buf, _HEADER.size + mid * _ENTRY.size)
+            if entry_seed == seed:
+                return bytes(buf[offset : offset + length])
+            if entry_seed < seed:
+                lo = mid + 1
+            else:
+                hi = mid
+    return None
+
+
+def read_solutions(path: Path) -> dict[int, bytes]:
+    if not path.exists():
+        return {}
+    data = path.read_bytes()
+    out: dict[int, bytes] = {}
+    for i in range(_check_header(data)):
+        seed, offset, length = _ENTRY.unpack_from(data, _HEADER.size + i * _ENTRY.size)
+        out[seed] = data[offset : offset + length]
+    return out
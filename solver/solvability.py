@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from solver.cost_model import DEFAULT_PROBE_NODES, FEATURES, read_cost_log, solve_linear
+
+# Statuses that count as "resolved within the budget" for training labels.
+RESOLVED_STATUSES = ("solved", "proven_unsolvable")
+
+# Prior for the log-odds of resolving before any fit: deals the probe already
+# solves resolve, dead-end-heavy probes and buried kings mostly do not.
+_DEFAULT_WEIGHTS = {
+    "potential": 0.002,
+    "same_suit_links": 0.05,
+    "any_suit_links": 0.02,
+    "buried_kings": -0.3,
+    "probe_solved": 4.0,
+    "probe_dead_ratio": -2.5,
+    "probe_duplicate_ratio": -0.5,
+    "probe_depth": 0.01,
+}
+_DEFAULT_INTERCEPT = -0.5
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+@dataclass(slots=True)
+class SolvabilityModel:
+    """Logistic model of the chance that a seed resolves under the pool's search budget."""
+
+    weights: dict[str, float] = field(default_factory=lambda: dict(_DEFAULT_WEIGHTS))
+    intercept: float = _DEFAULT_INTERCEPT
+    samples: int = 0
+    # Budget of the rows the model was fit on; probabilities are only meaningful near it.
+    max_seconds: float | None = None
+    max_nodes: int | None = None
+    # Probe search size of the training features; the probe features scale with it.
+    probe_nodes: int | None = None
+
+    def probability(self, features: dict[str, float]) -> float:
+        z = self.intercept + sum(w * float(features.get(name, 0.0)) for name, w in self.weights.items())
+        return _sigmoid(z)
+
+    def budget_mismatch(self, max_seconds: float, max_nodes: int) -> str | None:
+        """How the fit budget differs from ``(max_seconds, max_nodes)``, or None if it matches or is unknown."""
+        fit = (self.max_seconds, self.max_nodes)
+        if None in fit or fit == (float(max_seconds), int(max_nodes)):
+            return None
+        return f"model fit on max_seconds={self.max_seconds} max_nodes={self.max_nodes}, run uses max_seconds={max_seconds} max_nodes={max_nodes}"
+
+    def skip_blocker(self, max_seconds: float, max_nodes: int, probe_nodes: int) -> str | None:
+        """Why this model may not drop seeds from a run, or None if it was fit for exactly this run's setup."""
+        if self.samples <= 0:
+            return "model is the built-in prior, not fit on outcomes"
+        if self.max_seconds is None or self.max_nodes is None or self.probe_nodes is None:
+            return "model does not record the budget and probe it was fit with"
+        if self.probe_nodes != int(probe_nodes):
+            return f"model fit with probe_nodes={self.probe_nodes}, run uses probe_nodes={probe_nodes}"
+        return self.budget_mismatch(max_seconds, max_nodes)
+
+    def to_dict(self) -> dict:
+        return {
+            "weights": dict(self.weights),
+            "intercept": self.intercept,
+            "samples": self.samples,
+            "max_seconds": self.max_seconds,
+            "max_nodes": self.max_nodes,
+            "probe_nodes": self.probe_nodes,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "SolvabilityModel":
+        return SolvabilityModel(
+            weights={str(k): float(v) for k, v in (data.get("weights") or _DEFAULT_WEIGHTS).items()},
+            intercept=float(data.get("intercept", _DEFAULT_INTERCEPT)),
+            samples=int(data.get("samples", 0)),
+            max_seconds=(None if data.get("max_seconds") is None else float(data["max_seconds"])),
+            max_nodes=(None if data.get("max_nodes") is None else int(data["max_nodes"])),
+            probe_nodes=(None if data.get("probe_nodes") is None else int(data["probe_nodes"])),
+        )
+
+    @staticmethod
+    def load(path: Path) -> "SolvabilityModel":
+        """The model at ``path``, or the built-in prior if there is none yet."""
+        try:
+            return SolvabilityModel.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except Exception:
+            return SolvabilityModel()
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+def default_model_path(suits: int) -> Path:
+    return Path(__file__).resolve().parents[1] / "data" / f"seed_solvability_{suits}s.json"
+
+
+def fit_model(samples: Iterable[tuple[dict[str, float], bool]], ridge: float = 1e-2, iterations: int = 25) -> SolvabilityModel:
+    """L2-regularized logistic regression on :data:`FEATURES`, fit by Newton iterations (IRLS)."""
+    xs: list[list[float]] = []
+    ys: list[float] = []
+    for features, resolved in samples:
+        xs.append([1.0] + [float(features.get(name, 0.0)) for name in FEATURES])
+        ys.append(1.0 if resolved else 0.0)
+    if len(xs) <= len(FEATURES):
+        raise ValueError(f"need more than {len(FEATURES)} samples to fit, got {len(xs)}")
+
+    dim = len(FEATURES) + 1
+    coef = [0.0] * dim
+    for _ in range(iterations):
+        probs = [_sigmoid(sum(c * v for c, v in zip(coef, x))) for x in xs]
+        grad = [sum((y - p) * x[i] for x, y, p in zip(xs, ys, probs)) - (ridge * coef[i] if i > 0 else 0.0) for i in range(dim)]
+        hess = [
+            [sum(p * (1.0 - p) * x[i] * x[j] for x, p in zip(xs, probs)) + (ridge if i == j and i > 0 else 0.0) for j in range(dim)]
+            for i in range(dim)
+        ]
+        step = solve_linear(hess, grad)
+        coef = [c + s for c, s in zip(coef, step)]
+        if max(abs(s) for s in step) < 1e-6:
+            break
+    return SolvabilityModel(weights=dict(zip(FEATURES, coef[1:])), intercept=coef[0], samples=len(xs))
+
+
+def roc_auc(scores: list[float], labels: list[bool]) -> float:
+    """Probability that a random resolved seed scores above a random unresolved one."""
+    pos = sum(1 for label in labels if label)
+    neg = len(labels) - pos
+    if pos == 0 or neg == 0:
+        return 0.5
+    order = sorted(range(len(scores)), key=lambda i: scores[i])
+    rank_sum = 0.0
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and scores[order[j + 1]] == scores[order[i]]:
+            j += 1
+        avg_rank = (i + j) / 2.0 + 1.0
+        rank_sum += avg_rank * sum(1 for k in range(i, j + 1) if labels[order[k]])
+        i = j + 1
+    return (rank_sum - pos * (pos + 1) / 2.0) / (pos * neg)
+
+
+def read_row_labels(path: Path) -> list[tuple[int, bool]]:
+    """``(seed, resolved)`` from a pool rows CSV."""
+    out: list[tuple[int, bool]] = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for item in csv.DictReader(f):
+            try:
+                out.append((int(item["seed"]), item.get("status") in RESOLVED_STATUSES))
+            except (KeyError, TypeError, ValueError):
+                continue
+    return out
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fit the seed solvability pre-classifier used by seed_pool_builder --triage.")
+    parser.add_argument("--suits", type=int, choices=(1, 2, 3, 4), required=True, help="Suit count.")
+    parser.add_argument("--rows", type=str, default="", help="Pool rows CSV; features are computed with a probe search.")
+    parser.add_argument("--log", type=str, default="", help="Builder cost log JSONL; its features are reused as-is.")
+    parser.add_argument("--limit", type=int, default=0, help="Use at most this many CSV rows (0: all).")
+    parser.add_argument(
+        "--probe-nodes",
+        type=int,
+        default=DEFAULT_PROBE_NODES,
+        help="Probe search nodes per seed. The default ranks seeds near chance; use about 500 for --triage skip.",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Parallel workers for feature extraction.")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of samples kept out of the fit for the AUC report.")
+    parser.add_argument("--out", type=str, default="", help="Model path. Default: data/seed_solvability_{suits}s.json")
+    args = parser.parse_args()
+    if not args.rows and not args.log:
+        parser.error("--rows or --log is required")
+    return args
+
+
+def main() -> None:
+    from solver.seed_pool_builder import predict_seed_costs
+
+    args = parse_args()
+    samples: list[tuple[dict[str, float], bool]] = []
+    budgets: list[tuple[float, int]] = []
+    probes: set[int | None] = set()
+    if args.log:
+        for item in read_cost_log(Path(args.log).expanduser()):
+            if item.get("status") is None:
+                continue
+            samples.append((item["features"], item["status"] in RESOLVED_STATUSES))
+            if item.get("max_seconds") is not None and item.get("max_nodes") is not None:
+                budgets.append((float(item["max_seconds"]), int(item["max_nodes"])))
+            probes.add(item.get("probe_nodes"))
+    if args.rows:
+        labels = read_row_labels(Path(args.rows).expanduser())
+        if args.limit > 0:
+            labels = labels[: args.limit]
+        features = predict_seed_costs([seed for seed, _ in labels], args.suits, max(1, args.workers), args.probe_nodes)
+        samples += [(features[seed], resolved) for seed, resolved in labels if seed in features]
+        probes.add(args.probe_nodes)
+        pool_json = Path(args.rows).expanduser().with_name(Path(args.rows).stem.removesuffix("_rows") + ".json")
+        try:
+            search = json.loads(pool_json.read_text(encoding="utf-8")).get("search") or {}
+            budgets.append((float(search["max_seconds"]), int(search["max_nodes"])))
+        except Exception:
+            pass
+
+    # Deterministic split: every k-th sample is held out.
+    k = int(round(1.0 / args.holdout)) if 0.0 < args.holdout < 1.0 else 0
+    train = [s for i, s in enumerate(samples) if not k or i % k]
+    test = [s for i, s in enumerate(samples) if k and not i % k]
+    model = fit_model(train)
+    if budgets:
+        model.max_seconds, model.max_nodes = max(budgets)
+    if len(probes) == 1 and None not in probes:
+        model.probe_nodes = int(probes.pop())
+    out = Path(args.out).expanduser() if args.out else default_model_path(args.suits)
+    model.save(out)
+    resolved = sum(1 for _, label in samples if label)
+    print(f"fit samples={model.samples} resolved_rate={resolved / max(1, len(samples)):.4f} out={out}")
+    if test:
+        auc = roc_auc([model.probability(f) for f, _ in test], [label for _, label in test])
+        prior = roc_auc([SolvabilityModel().probability(f) for f, _ in test], [label for _, label in test])
+        print(f"holdout samples={len(test)} auc={auc:.4f} (prior auc={prior:.4f})")
+
+
+if __name__ == "__main__":
+    main()
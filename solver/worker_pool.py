@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+
+def _to_stderr(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+def make_worker_pool(workers: int, log: Callable[[str], None] = _to_stderr) -> Executor:
+    """
+    A process pool of ``workers``, or a thread pool where processes cannot be
+    started (e.g. sandboxes without POSIX semaphores). ``log`` gets the
+    fallback notice; CLIs whose stdout is data keep the default stderr.
+    """
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except PermissionError:
+        log("process pool unavailable in current environment; fallback to thread pool")
+        return ThreadPoolExecutor(max_workers=workers)
@@ -0,0 +1,41 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from solver.build_telemetry import BuildTelemetry
+
+
+class BuildTelemetryTestCase(unittest.TestCase):
+    def test_snapshot_rates_percentiles_and_eta(self):
+        telemetry = BuildTelemetry(total=40, workers=2, window_sec=5.0)
+        t0 = telemetry.started
+        for i in range(20):
+            telemetry.record("solved" if i % 4 else "unknown", elapsed_ms=100.0 * (i + 1), now=t0 + i * 0.5)
+
+        snap = telemetry.snapshot(now=t0 + 10.0)
+        eta = snap["eta_seconds"]
+        self.assertEqual(20, snap["done"])
+        self.assertAlmostEqual(2.0, snap["seeds_per_sec"], places=3)
+        # Only completions in the last 5 seconds count for the rolling rate.
+        self.assertAlmostEqual(2.0, snap["seeds_per_sec_rolling"], places=3)
+        self.assertAlmostEqual(0.2, telemetry.snapshot(now=t0 + 14.5)["seeds_per_sec_rolling"], places=3)
+        self.assertEqual({"solved": 15, "unknown": 5}, snap["status_counts"])
+        self.assertAlmostEqual(0.25, snap["status_rates"]["unknown"])
+        self.assertAlmostEqual(1050.0, snap["elapsed_ms"]["p50"], places=3)
+        self.assertAlmostEqual(10.0, eta, places=1)
+        self.assertAlmostEqual(1.0, snap["worker_utilization"])
+
+    def test_writes_status_and_prometheus_files(self):
+        telemetry = BuildTelemetry(total=2, workers=1)
+        telemetry.record("solved", 12.0)
+        with tempfile.TemporaryDirectory() as td:
+            status = telemetry.write_status(Path(td) / "status.json", {"suits": 2})
+            telemetry.write_prometheus(Path(td) / "pool.prom", {"suits": "2"})
+            text = (Path(td) / "pool.prom").read_text(encoding="utf-8")
+        self.assertEqual(2, status["suits"])
+        self.assertIn('seed_pool_rows{suits="2",status="solved"} 1', text)
+        self.assertIn('seed_pool_elapsed_ms{suits="2",quantile="0.5"} 12.0', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import math
+import random
+import unittest
+
+from solver.cost_model import FEATURES, CostModel, fit_model, rank_correlation, seed_features
+
+
+class CostModelTestCase(unittest.TestCase):
+    def test_fit_recovers_log_linear_weights(self):
+        rng = random.Random(5)
+        samples = []
+        for _ in range(60):
+            features = {name: rng.uniform(0, 3) for name in FEATURES}
+            elapsed = math.exp(3.0 + 0.8 * features["buried_kings"] - 0.5 * features["probe_solved"])
+            samples.append((features, elapsed))
+        model = fit_model(samples)
+
+        self.assertAlmostEqual(3.0, model.intercept, places=2)
+        self.assertAlmostEqual(0.8, model.weights["buried_kings"], places=2)
+        self.assertAlmostEqual(-0.5, model.weights["probe_solved"], places=2)
+        self.assertEqual(60, model.samples)
+        restored = CostModel.from_dict(model.to_dict())
+        self.assertAlmostEqual(samples[0][1], restored.predict_ms(samples[0][0]), delta=samples[0][1] * 0.01)
+
+    def test_rank_correlation_and_features(self):
+        self.assertAlmostEqual(1.0, rank_correlation([1.0, 5.0, 9.0], [10.0, 20.0, 30.0]))
+        self.assertAlmostEqual(-1.0, rank_correlation([1.0, 5.0, 9.0], [30.0, 20.0, 10.0]))
+
+        features = seed_features(1, suits=1, probe_nodes=8)
+        self.assertEqual(set(FEATURES), set(features))
+        self.assertGreater(CostModel().predict_ms(features), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
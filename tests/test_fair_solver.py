@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from base.Core import GameConfig
+from solver.analyzer import SearchLimits, SolverState, build_initial_state
+from solver import fair_solver
+from solver.fair_solver import fair_solve, information_set_key, sample_determinization
+
+
+def visible(suit, num):
+    return suit * 13 + num
+
+
+class FairSolverTestCase(unittest.TestCase):
+    def test_determinization_keeps_information_set(self):
+        cfg = GameConfig()
+        cfg.seed = 20260210
+        cfg.suits = 2
+        state = build_initial_state(cfg)
+
+        sample = sample_determinization(state, random.Random(7))
+
+        self.assertEqual(information_set_key(state), information_set_key(sample))
+        self.assertNotEqual(state.base, sample.base)
+        self.assertEqual(sorted(state.base + sum(state.stacks, ())), sorted(sample.base + sum(sample.stacks, ())))
+
+    def test_fair_solve_votes_and_caches(self):
+        run_without_ace = tuple(visible(0, num) for num in range(12, 0, -1))
+        state = SolverState(
+            base=(),
+            stacks=(run_without_ace, (visible(0, 0),), tuple()),
+            hidden_prefix=(0, 0, 0),
+            finished_count=0,
+        )
+        limits = SearchLimits(max_nodes=2000, max_seconds=1.0, max_frontier=5000)
+
+        first = fair_solve(state, samples=3, limits=limits, workers=1, seed=5)
+        again = fair_solve(state, samples=3, limits=limits, workers=1, seed=5)
+
+        self.assertEqual(1.0, first.success_rate)
+        self.assertEqual("MOVE(S1:0->S0,len=1)", first.best_action.to_notation())
+        self.assertEqual({"MOVE(S1:0->S0,len=1)": 3}, first.action_votes)
+        self.assertFalse(first.cached)
+        self.assertTrue(again.cached)
+
+    def test_parallel_fair_solve_reuses_one_pool(self):
+        run_without_ace = tuple(visible(0, num) for num in range(12, 0, -1))
+        state = SolverState(
+            base=(),
+            stacks=(run_without_ace, (visible(0, 0),), tuple()),
+            hidden_prefix=(0, 0, 0),
+            finished_count=0,
+        )
+        limits = SearchLimits(max_nodes=2000, max_seconds=5.0, max_frontier=5000)
+        self.addCleanup(fair_solver._close_shared_executor)
+
+        first = fair_solve(state, samples=4, limits=limits, workers=2, seed=5, use_cache=False)
+        pool = fair_solver._executor
+        again = fair_solve(state, samples=4, limits=limits, workers=2, seed=6, use_cache=False)
+
+        self.assertEqual(1.0, first.success_rate)
+        self.assertEqual({"MOVE(S1:0->S0,len=1)": 4}, first.action_votes)
+        self.assertEqual(first.action_votes, again.action_votes)
+        self.assertIsNotNone(pool)
+        self.assertIs(pool, fair_solver._executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import random
 import tempfile
 import unittest
@@ -98,6 +99,61 @@ class ModernUiSeedAndSettingsTestCase(unittest.TestCase):
         self.assertEqual([], pools["Medium"])
         self.assertIn(picked, {21, 22})
 
+    def test_seed_pool_prefers_seed_db(self):
+        from solver.seed_db import SeedDb
+
+        with tempfile.TemporaryDirectory() as td:
+            pool_path = Path(td) / "seed_pool_2s.json"
+            pool_path.write_text('{"buckets":{"Hard":[21]}}', encoding="utf-8")
+            with SeedDb(Path(td) / "seed_pool.sqlite") as db:
+                db.upsert_rows(2, [{"seed": 77, "status": "solved", "score": 5.0, "bucket": "Hard"}])
+                db.mark_pool(2, "", pool_path)
+            with patch.object(seed_pool_store, "seed_pool_path", return_value=pool_path):
+                from_db = seed_pool_store.choose_seed_for_bucket(2, "Hard", rng=random.Random(1))
+                from_json = seed_pool_store.choose_seed_for_bucket(2, "Easy", rng=random.Random(1))
+        self.assertEqual(77, from_db)
+        self.assertIsNone(from_json)
+
+    def test_seed_pool_skips_seed_db_not_synced_with_pool(self):
+        from solver.seed_db import SeedDb
+
+        with tempfile.TemporaryDirectory() as td:
+            pool_path = Path(td) / "seed_pool_2s.json"
+            pool_path.write_text('{"buckets":{"Hard":[21]}}', encoding="utf-8")
+            with SeedDb(Path(td) / "seed_pool.sqlite") as db:
+                db.upsert_rows(2, [{"seed": 77, "status": "solved", "score": 5.0, "bucket": "Hard"}])
+                db.mark_pool(2, "", pool_path)
+                # Pool rebuilt without --db, then a --db build of another suit count.
+                os.utime(pool_path, ns=(pool_path.stat().st_mtime_ns + 10**9,) * 2)
+                db.mark_pool(4, "", pool_path)
+            with patch.object(seed_pool_store, "seed_pool_path", return_value=pool_path):
+                picked = seed_pool_store.choose_seed_for_bucket(2, "Hard", rng=random.Random(1))
+        self.assertEqual(21, picked)
+
+    def test_seed_pool_picks_from_binary_index(self):
+        from solver.pool_index import write_pool_index
+
+        with tempfile.TemporaryDirectory() as td:
+            pool_path = Path(td) / "seed_pool_2s.json"
+            pool_path.write_text('{"buckets":{"Hard":[21]}}', encoding="utf-8")
+            write_pool_index(Path(td) / "seed_pool_2s.idx", {"Easy": [], "Medium": [], "Hard": [31]})
+            with patch.object(seed_pool_store, "seed_pool_path", return_value=pool_path):
+                picked = seed_pool_store.choose_seed_for_bucket(2, "Hard", rng=random.Random(1))
+        self.assertEqual(31, picked)
+
+    def test_stored_solution_looks_up_seed(self):
+        from solver.solution_codec import write_solutions
+
+        with tempfile.TemporaryDirectory() as td:
+            pool_path = Path(td) / "seed_pool_2s.json"
+            pool_path.write_text('{"buckets":{"Hard":[21]}}', encoding="utf-8")
+            write_solutions(Path(td) / "seed_pool_2s_solutions.bin", {21: b"\x01\x05\xff"})
+            with patch.object(seed_pool_store, "seed_pool_path", return_value=pool_path):
+                found = seed_pool_store.stored_solution(2, 21)
+                missing = seed_pool_store.stored_solution(2, 22)
+        self.assertEqual(b"\x01\x05\xff", found)
+        self.assertIsNone(missing)
+
     def test_seed_pool_missing_file_returns_none(self):
         with tempfile.TemporaryDirectory() as td:
             pool_path = Path(td) / "missing_seed_pool_4s.json"
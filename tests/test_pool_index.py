@@ -0,0 +1,24 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from solver.pool_index import pick_seed, pool_index_path, read_pool_index, write_pool_index
+
+
+class PoolIndexTestCase(unittest.TestCase):
+    def test_round_trip_and_pick(self):
+        buckets = {"Easy": [1, 2, 3], "Medium": [], "Hard": [4_000_000_000, 7]}
+        with tempfile.TemporaryDirectory() as td:
+            path = pool_index_path(Path(td) / "seed_pool_2s.json")
+            self.assertEqual("seed_pool_2s.idx", path.name)
+            write_pool_index(path, buckets)
+            self.assertEqual(buckets, read_pool_index(path))
+            picks = {pick_seed(path, "Hard", random.Random(i)) for i in range(20)}
+            self.assertEqual({4_000_000_000, 7}, picks)
+            self.assertIsNone(pick_seed(path, "Medium"))
+            self.assertIsNone(pick_seed(path, "unknown"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import random
+import tempfile
+import unittest
+from argparse import Namespace
+from pathlib import Path
+
+from solver.pool_query import (
+    SortedIndex,
+    build_sections,
+    ensure_sorted_index,
+    percentile_range,
+    score_range,
+    solved_within,
+    sorted_index_path,
+    take,
+    write_sorted_index,
+)
+from solver.seed_pool_builder import SeedRow, _write_artifacts
+
+
+def _rows():
+    rows = []
+    for seed in range(12):
+        solved = seed % 4 != 3
+        rows.append(
+            SeedRow(
+                seed=seed,
+                status="solved" if solved else "unknown",
+                score=(float(seed * 10) if solved else None),
+                band=None,
+                reason=(None if solved else "limits_reached"),
+                elapsed_ms=float(100 - seed),
+                expanded_nodes=(seed * 7) % 5,
+                unique_states=seed,
+            )
+        )
+    return rows
+
+
+class PoolQueryTestCase(unittest.TestCase):
+    def test_queries_read_sorted_sections(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "pool_sorted.idx"
+            write_sorted_index(path, build_sections(_rows()))
+            with SortedIndex(path) as index:
+                self.assertEqual(9, index.count("score"))
+                self.assertEqual(3, index.count("unknown_nodes"))
+                self.assertEqual([1, 2, 4], take(index, "score", *score_range(index, 10.0, 40.0)))
+                self.assertEqual([0, 1, 2], take(index, "score", *percentile_range(index, 0.0, 100.0), limit=3))
+                self.assertEqual([4, 5, 6], take(index, "score", *percentile_range(index, 33.3, 66.7)))
+                self.assertEqual([10, 9], take(index, "solved_ms", *solved_within(index, 91.0)))
+                # Unknown seeds 3, 7 and 11 expanded 1, 4 and 2 nodes.
+                self.assertEqual([7, 11, 3], take(index, "unknown_nodes", 0, 3, descending=True))
+                sample = take(index, "score", 0, 9, limit=4, rng=random.Random(7))
+                self.assertEqual(sample, take(index, "score", 0, 9, limit=4, rng=random.Random(7)))
+                self.assertEqual(sorted(sample), sample)
+
+    def test_index_is_cached_until_rows_change(self):
+        args = Namespace(suits=1, max_seconds=2.0, max_nodes=1000, max_frontier=10, single_stage=False, workers=1, start_seed=0, count=12, overwrite=True)
+        with tempfile.TemporaryDirectory() as td:
+            meta = Path(td) / "seed_pool_1s.json"
+            csv_path = Path(td) / "seed_pool_1s_rows.csv"
+            _write_artifacts(args, meta, csv_path, _rows(), [], 0.0)
+            path = ensure_sorted_index(meta)
+            self.assertEqual(sorted_index_path(meta), path)
+            built = path.stat().st_mtime_ns
+            self.assertEqual(built, ensure_sorted_index(meta).stat().st_mtime_ns)
+
+            _write_artifacts(args, meta, csv_path, _rows()[:4], [], 0.0)
+            newer = path.stat().st_mtime + 5
+            os.utime(csv_path, (newer, newer))
+            with SortedIndex(ensure_sorted_index(meta)) as index:
+                self.assertEqual(3, index.count("score"))
+
+
+if __name__ == "__main__":
+    unittest.main()
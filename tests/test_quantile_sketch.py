@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from solver.pool_rows import quantile
+from solver.quantile_sketch import KllSketch
+
+
+class KllSketchTestCase(unittest.TestCase):
+    def test_small_stream_is_exact(self):
+        rng = random.Random(3)
+        values = [rng.uniform(0, 100) for _ in range(50)]
+        sketch = KllSketch()
+        sketch.extend(values)
+        self.assertTrue(sketch.exact)
+        ordered = sorted(values)
+        for q in (0.0, 1.0 / 3.0, 2.0 / 3.0, 1.0):
+            self.assertAlmostEqual(quantile(ordered, q), sketch.quantile(q), places=9)
+
+    def test_merged_sketch_stays_close_to_exact_rank(self):
+        rng = random.Random(7)
+        values = [rng.expovariate(0.1) for _ in range(20_000)]
+        left, right = KllSketch(seed=1), KllSketch(seed=2)
+        left.extend(values[:12_000])
+        right.extend(values[12_000:])
+        left.merge(right)
+        self.assertEqual(len(values), left.count)
+        self.assertLess(sum(len(items) for items in left.levels), 1_000)
+
+        ordered = sorted(values)
+        for q in (1.0 / 3.0, 2.0 / 3.0):
+            estimate = left.quantile(q)
+            rank = sum(1 for v in ordered if v <= estimate) / len(ordered)
+            self.assertLess(abs(rank - q), 0.02)
+
+    def test_round_trip(self):
+        sketch = KllSketch(k=16)
+        sketch.extend(float(i) for i in range(500))
+        restored = KllSketch.from_dict(sketch.to_dict())
+        self.assertEqual(sketch.count, restored.count)
+        self.assertEqual(sketch.quantile(0.5), restored.quantile(0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
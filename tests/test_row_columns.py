@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from pathlib import Path
+
+from solver.row_columns import RowColumns, columns_dir, load_pool_columns
+from solver.seed_pool_builder import SeedRow, _write_artifacts, bucket_solved_rows, load_existing_rows
+
+
+def _rows():
+    rows = []
+    for seed in range(9):
+        solved = seed % 3 != 2
+        rows.append(
+            SeedRow(
+                seed=seed,
+                status="solved" if solved else "unknown",
+                score=(float(100 - seed * 7) if solved else None),
+                band=None,
+                reason=(None if solved else "limits_reached"),
+                elapsed_ms=float(seed) + 0.5,
+                expanded_nodes=seed * 10,
+                unique_states=seed * 9,
+                max_seconds=(2.0 if seed < 6 else None),
+                max_nodes=(1000 if seed < 6 else None),
+                tier=(1 if seed % 2 else None),
+            )
+        )
+    return rows
+
+
+class RowColumnsTestCase(unittest.TestCase):
+    def test_round_trip_stats_and_buckets(self):
+        rows = _rows()
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "cols"
+            RowColumns.from_rows(rows).write(path)
+            # .npy data starts on a 64-byte boundary right after the header's newline.
+            self.assertEqual(63, (path / "seed.npy").read_bytes().index(b"\n") % 64)
+            cols = RowColumns.load(path)
+            self.assertEqual(rows, cols.to_rows())
+
+            buckets, quantiles = bucket_solved_rows(rows)
+            self.assertEqual(quantiles, cols.quantiles())
+            cols.assign_buckets(quantiles["q33"], quantiles["q66"])
+            by_name = cols.bucket_seeds()
+            for name, bucket_rows in buckets.items():
+                self.assertEqual(sorted(r.seed for r in bucket_rows), sorted(by_name[name]))
+            self.assertEqual([2, 5, 8], by_name["unknown"])
+            self.assertEqual([r.seed for r in buckets["Easy"]], cols.bucket_seeds(by_score=True)["Easy"])
+            self.assertEqual("unknown", cols.csv_rows()[2]["bucket"])
+            stats = cols.stats()
+        self.assertEqual(9, stats["scanned"])
+        self.assertEqual(6, stats["solved"])
+        self.assertEqual(3, stats["unknown"])
+        self.assertEqual(4.5, stats["elapsed_ms"]["p50"])
+
+    def test_builder_loads_columns_and_prefers_newer_csv(self):
+        args = Namespace(suits=1, max_seconds=2.0, max_nodes=1000, max_frontier=10, single_stage=False, workers=1, start_seed=0, count=9, overwrite=False)
+        rows = _rows()
+        with tempfile.TemporaryDirectory() as td:
+            meta = Path(td) / "seed_pool_1s.json"
+            csv_path = Path(td) / "seed_pool_1s_rows.csv"
+            _write_artifacts(args, meta, csv_path, rows, [], 0.0)
+            self.assertTrue((columns_dir(csv_path) / "vocab.json").exists())
+            csv_path.unlink()
+            self.assertEqual(rows, load_existing_rows(csv_path, meta))
+            csv_path.write_text("seed,status\n1,solved\n", encoding="utf-8")
+            newer = (columns_dir(csv_path) / "vocab.json").stat().st_mtime + 5
+            os.utime(csv_path, (newer, newer))
+            self.assertIsNone(load_pool_columns(csv_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
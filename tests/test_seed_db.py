@@ -0,0 +1,79 @@
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from solver.seed_db import SeedDb, export_pool, import_pool
+
+
+def _row(seed, status, score):
+    return {
+        "seed": seed,
+        "status": status,
+        "score": score,
+        "reason": None,
+        "elapsed_ms": 1.0,
+        "expanded_nodes": 1,
+        "unique_states": 1,
+    }
+
+
+class SeedDbTestCase(unittest.TestCase):
+    def test_assign_buckets_and_pick(self):
+        with tempfile.TemporaryDirectory() as td, SeedDb(Path(td) / "seeds.sqlite") as db:
+            rows = [_row(seed, "solved", float(seed)) for seed in range(1, 10)] + [_row(99, "unknown", None)]
+            self.assertEqual(10, db.upsert_rows(2, rows))
+            db.upsert_rows(4, [_row(1, "solved", 500.0)])
+            db.assign_buckets(2, q33=3.0, q66=6.0)
+
+            self.assertEqual(3, db.bucket_size(2, "Hard"))
+            self.assertEqual([99], [row["seed"] for row in db.rows(2, bucket="unknown")])
+            self.assertEqual(10, db.row_count(2))
+            picked = {db.pick_seed(2, "Easy", random.Random(i)) for i in range(20)}
+            self.assertEqual({1, 2, 3}, picked)
+            self.assertIsNone(db.pick_seed(4, "Easy"))
+
+    def test_import_export_round_trip(self):
+        with tempfile.TemporaryDirectory() as td:
+            pool = Path(td) / "seed_pool_2s.json"
+            pool.write_text(
+                json.dumps(
+                    {
+                        "suits": 2,
+                        "search": {"max_seconds": 1.0, "max_nodes": 100, "max_frontier": 10, "single_stage": False},
+                        "buckets": {"Easy": [1], "Medium": [2], "Hard": [3], "unknown": [4]},
+                    }
+                ),
+                encoding="utf-8",
+            )
+            (Path(td) / "seed_pool_2s_rows.csv").write_text(
+                "seed,status,score,bucket,reason,elapsed_ms,expanded_nodes,unique_states\n"
+                "1,solved,10.0,Easy,,1.0,1,1\n"
+                "2,solved,20.0,Medium,,1.0,1,1\n"
+                "3,solved,30.0,Hard,,1.0,1,1\n"
+                "4,unknown,,unknown,max_nodes,1.0,1,1\n",
+                encoding="utf-8",
+            )
+            with SeedDb(Path(td) / "seeds.sqlite") as db:
+                self.assertEqual(4, import_pool(db, pool))
+                self.assertEqual(3, db.pick_seed(2, "Hard"))
+                self.assertEqual(100, db.budget(2)["max_nodes"])
+                self.assertTrue(db.mirrors_pool(2, pool))
+                out = Path(td) / "out" / "seed_pool_2s.json"
+                payload = export_pool(db, 2, out)
+                self.assertTrue(db.mirrors_pool(2, out))
+                self.assertFalse(db.mirrors_pool(4, out))
+
+                # Re-importing a pool that lost seed 4 drops its row.
+                rows_csv = Path(td) / "seed_pool_2s_rows.csv"
+                rows_csv.write_text("".join(rows_csv.read_text(encoding="utf-8").splitlines(True)[:4]), encoding="utf-8")
+                self.assertEqual(3, import_pool(db, pool))
+                self.assertEqual(3, db.row_count(2))
+
+        self.assertEqual({"Easy": [1], "Medium": [2], "Hard": [3], "unknown": [4]}, payload["buckets"])
+        self.assertEqual(100, payload["search"]["max_nodes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
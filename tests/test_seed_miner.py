@@ -0,0 +1,43 @@
+import unittest
+
+from solver.analyzer import SearchLimits
+from solver.seed_miner import iter_mined
+
+LIMITS = SearchLimits(max_nodes=50, max_seconds=0.05, max_frontier=1000)
+
+
+class SeedMinerTestCase(unittest.TestCase):
+    def test_iter_mined_parallel_yields_every_seed(self):
+        payloads = list(iter_mined(range(1, 7), suits=1, limits=LIMITS, staged=False, workers=2, inflight_per_worker=1))
+        self.assertEqual(list(range(1, 7)), sorted(p["seed"] for p in payloads))
+        self.assertTrue(all("wall_ms" in p for p in payloads))
+
+    def test_iter_mined_close_cancels_queued_seeds(self):
+        submitted = []
+
+        def seeds():
+            for seed in range(1, 1000):
+                submitted.append(seed)
+                yield seed
+
+        mined = iter_mined(seeds(), suits=1, limits=LIMITS, staged=False, workers=2, inflight_per_worker=2)
+        first = next(mined)
+        mined.close()
+        self.assertIn(first["seed"], submitted)
+        self.assertLess(len(submitted), 10)
+
+    def test_iter_mined_stop_callback_ends_the_run(self):
+        submitted = []
+
+        def seeds():
+            for seed in range(1, 1000):
+                submitted.append(seed)
+                yield seed
+
+        payloads = list(iter_mined(seeds(), suits=1, limits=LIMITS, staged=False, workers=2, stop=lambda result: True))
+        self.assertEqual(1, len(payloads))
+        self.assertLess(len(submitted), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,22 +1,73 @@
+import json
+import multiprocessing
+import os
+import tempfile
 import unittest
 from argparse import Namespace
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
 
-from solver.seed_pool_builder import SeedRow, _build_payload, _quantile, bucket_solved_rows, merge_rows
+from solver import seed_pool_builder
+from solver.analyzer import DIFFICULTY_COMPONENTS, difficulty_score
+from solver.pool_rows import quantile
+from solver.row_journal import RowJournal
+from solver.seed_pool_builder import (
+    BucketQuota,
+    RowSearch,
+    SeedRow,
+    _build_payload,
+    _iter_rows_multi,
+    _parse_bucket_targets,
+    _replay_journal_rows,
+    _write_artifacts,
+    bucket_solved_rows,
+    merge_main,
+    merge_rows,
+    merge_shard_rows,
+    per_suit_args,
+    rescore_main,
+    select_pending_seeds,
+    shard_seeds,
+    sketch_from_rows,
+    tier_budgets,
+)
+
+
+def _row(seed, score=None, status=None, **fields):
+    """A solved row when ``score`` is given, else an unknown row that hit its limits."""
+    status = status or ("solved" if score is not None else "unknown")
+    reason = None if status == "solved" else "limits_reached"
+    base = dict(status=status, score=score, band=None, reason=reason, elapsed_ms=1.0, expanded_nodes=1, unique_states=1)
+    return SeedRow(seed=seed, **{**base, **fields})
+
+
+def _search(suits, max_nodes=100, max_seconds=0.01):
+    return RowSearch(suits=suits, max_nodes=max_nodes, max_seconds=max_seconds, max_frontier=1000, single_stage=True)
+
+
+def _crashing_chunk(seeds, search):
+    if 13 in seeds:
+        if multiprocessing.parent_process() is None:
+            raise BrokenProcessPool("simulated worker loss")
+        os._exit(1)
+    return [_row(seed) for seed in seeds]
 
 
 class SeedPoolBuilderTestCase(unittest.TestCase):
     def test_quantile_interpolates(self):
         values = [10.0, 20.0, 30.0, 40.0]
-        self.assertAlmostEqual(20.0, _quantile(values, 1.0 / 3.0), places=6)
-        self.assertAlmostEqual(30.0, _quantile(values, 2.0 / 3.0), places=6)
+        self.assertAlmostEqual(20.0, quantile(values, 1.0 / 3.0), places=6)
+        self.assertAlmostEqual(30.0, quantile(values, 2.0 / 3.0), places=6)
 
     def test_bucket_solved_rows(self):
         rows = [
-            SeedRow(seed=1, status="solved", score=10.0, band="Easy", reason=None, elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
-            SeedRow(seed=2, status="solved", score=20.0, band="Easy", reason=None, elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
-            SeedRow(seed=3, status="solved", score=30.0, band="Medium", reason=None, elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
-            SeedRow(seed=4, status="solved", score=40.0, band="Hard", reason=None, elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
-            SeedRow(seed=5, status="unknown", score=None, band=None, reason="limits_reached", elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
+            _row(1, 10.0, band="Easy"),
+            _row(2, 20.0, band="Easy"),
+            _row(3, 30.0, band="Medium"),
+            _row(4, 40.0, band="Hard"),
+            _row(5),
         ]
 
         buckets, quantiles = bucket_solved_rows(rows)
@@ -29,12 +80,12 @@ class SeedPoolBuilderTestCase(unittest.TestCase):
 
     def test_merge_rows_prefers_incoming_by_seed(self):
         existing = [
-            SeedRow(seed=100, status="unknown", score=None, band=None, reason="limits_reached", elapsed_ms=10.0, expanded_nodes=10, unique_states=10),
-            SeedRow(seed=101, status="solved", score=20.0, band="Easy", reason=None, elapsed_ms=12.0, expanded_nodes=12, unique_states=12),
+            _row(100, elapsed_ms=10.0, expanded_nodes=10, unique_states=10),
+            _row(101, 20.0, band="Easy", elapsed_ms=12.0, expanded_nodes=12, unique_states=12),
         ]
         incoming = [
-            SeedRow(seed=100, status="solved", score=25.0, band="Medium", reason=None, elapsed_ms=8.0, expanded_nodes=8, unique_states=8),
-            SeedRow(seed=102, status="unknown", score=None, band=None, reason="limits_reached", elapsed_ms=9.0, expanded_nodes=9, unique_states=9),
+            _row(100, 25.0, band="Medium", elapsed_ms=8.0, expanded_nodes=8, unique_states=8),
+            _row(102, elapsed_ms=9.0, expanded_nodes=9, unique_states=9),
         ]
 
         merged = merge_rows(existing, incoming)
@@ -59,9 +110,9 @@ class SeedPoolBuilderTestCase(unittest.TestCase):
             overwrite=False,
         )
         rows = [
-            SeedRow(seed=1, status="solved", score=10.0, band="Easy", reason=None, elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
-            SeedRow(seed=2, status="unknown", score=None, band=None, reason="limits_reached", elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
-            SeedRow(seed=3, status="unknown", score=None, band=None, reason="limits_reached", elapsed_ms=1.0, expanded_nodes=1, unique_states=1),
+            _row(1, 10.0, band="Easy"),
+            _row(2),
+            _row(3),
         ]
 
         payload = _build_payload(args, existing_rows=[], rows=rows, started=0.0, in_progress=False)
@@ -70,6 +121,227 @@ class SeedPoolBuilderTestCase(unittest.TestCase):
         self.assertEqual([2, 3], payload["buckets"]["unknown"])
         self.assertNotIn("bucket_entries", payload)
 
+    def test_select_pending_seeds_for_resume(self):
+        existing = [
+            _row(1, 10.0, band="Easy", max_seconds=1.0, max_nodes=100),
+            _row(2, max_seconds=1.0, max_nodes=100),
+            _row(3, max_seconds=5.0, max_nodes=1000),
+        ]
+
+        skip_done = select_pending_seeds(range(1, 6), existing, max_seconds=5.0, max_nodes=1000)
+        rerun = select_pending_seeds(range(1, 6), existing, max_seconds=5.0, max_nodes=1000, rerun_below_budget=True)
+
+        self.assertEqual([4, 5], skip_done)
+        self.assertEqual([2, 4, 5], rerun)
+
+    def test_journal_replay_ignores_torn_tail(self):
+        row = _row(7, 12.0, band="Easy", elapsed_ms=3.0, expanded_nodes=4, unique_states=5, max_seconds=2.0, max_nodes=100)
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "pool_rows.journal.jsonl"
+            with RowJournal(path) as journal:
+                journal.append(row.to_dict())
+            with path.open("a", encoding="utf-8") as f:
+                f.write('{"seed": 8, "status": "unk')
+
+            replayed = _replay_journal_rows(path)
+
+        self.assertEqual([row], replayed)
+
+    def test_journal_append_after_torn_tail_starts_a_new_line(self):
+        first = _row(7, 12.0, band="Easy", elapsed_ms=3.0, expanded_nodes=4, unique_states=5)
+        second = _row(9, elapsed_ms=2.0, expanded_nodes=6, unique_states=7)
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "pool_rows.journal.jsonl"
+            with RowJournal(path) as journal:
+                journal.append(first.to_dict())
+            with path.open("a", encoding="utf-8") as f:
+                f.write('{"seed": 8, "status": "unk')
+            # A restarted builder appends to the same journal.
+            with RowJournal(path) as journal:
+                journal.append(second.to_dict())
+
+            replayed = _replay_journal_rows(path)
+
+        self.assertEqual([first, second], replayed)
+
+    def test_iter_rows_multi_chunks_with_bounded_window(self):
+        seen = []
+        [rows] = _iter_rows_multi(
+            [(_search(1, max_nodes=200, max_seconds=0.02), list(range(1, 8)))],
+            workers=2,
+            progress_every=0,
+            on_row=lambda job, current: seen.append(len(current)),
+            chunk_sizes=[3],
+            inflight_per_worker=1,
+        )
+
+        self.assertEqual(list(range(1, 8)), sorted(row.seed for row in rows))
+        self.assertEqual(list(range(1, 8)), seen)
+
+    def test_tier_budgets_grow_to_ceiling(self):
+        budgets = tier_budgets(max_seconds=16.0, max_nodes=1600, tiers=3, growth=4.0)
+
+        self.assertEqual([(1.0, 100), (4.0, 400), (16.0, 1600)], budgets)
+        self.assertEqual([(16.0, 1600)], tier_budgets(16.0, 1600, tiers=1, growth=4.0))
+
+    def test_bucket_quota_tracks_tertiles(self):
+        rows = [_row(i, float(i * 10)) for i in range(1, 7)]
+        quota = BucketQuota(2, rows[:5])
+        self.assertFalse(quota.satisfied())
+
+        quota.add(rows[5])
+        self.assertEqual({"Easy": 2, "Medium": 2, "Hard": 2}, quota.counts())
+        self.assertTrue(quota.satisfied())
+
+        quota.add(_row(6))
+        self.assertFalse(quota.satisfied())
+
+    def test_iter_rows_multi_stops_early(self):
+        rows_seen = []
+        [rows] = _iter_rows_multi(
+            [(_search(1), list(range(1, 20)))],
+            workers=1,
+            progress_every=0,
+            should_stop=lambda job: len(rows_seen) >= 2,
+            on_row=lambda job, current: rows_seen.append(len(current)),
+        )
+        self.assertEqual(2, len(rows))
+
+    def test_iter_rows_multi_shares_pool_and_stops_jobs_independently(self):
+        seen = []
+        results = _iter_rows_multi(
+            [(_search(1), list(range(1, 6))), (_search(2), list(range(11, 15)))],
+            workers=2,
+            progress_every=0,
+            on_row=lambda job, rows: seen.append(job),
+            chunk_sizes=[2, 1],
+            inflight_per_worker=1,
+            should_stop=lambda job: job == 0 and seen.count(0) >= 2,
+        )
+        self.assertEqual(list(range(11, 15)), sorted(row.seed for row in results[1]))
+        self.assertLess(len(results[0]), 5)
+        self.assertGreaterEqual(len(results[0]), 2)
+
+    def test_per_suit_args_split_paths_and_quotas(self):
+        self.assertEqual({None: 2000}, _parse_bucket_targets("2000"))
+        self.assertEqual({1: 5000, 4: 20}, _parse_bucket_targets("1:5000, 4:20"))
+        args = Namespace(suits=1, suit_counts=(1, 4), bucket_targets={4: 20}, target_per_bucket=0, out="", out_dir="/tmp/pools", shard_count=2, shard_index=1)
+        one, four = per_suit_args(args)
+        self.assertEqual((1, 0, "seed_pool_1s.shard1of2.json"), (one.suits, one.target_per_bucket, Path(one.out).name))
+        self.assertEqual((4, 20, str(Path("/tmp/pools/seed_pool_4s.shard1of2.json"))), (four.suits, four.target_per_bucket, four.out))
+
+    def test_broken_pool_is_rebuilt_and_runaway_seed_recorded(self):
+        with patch.object(seed_pool_builder, "_analyze_chunk", _crashing_chunk):
+            [rows] = _iter_rows_multi([(_search(4), list(range(10, 20)))], workers=2, progress_every=0, chunk_sizes=[2])
+        by_seed = {row.seed: row for row in rows}
+        self.assertEqual(list(range(10, 20)), sorted(by_seed))
+        self.assertEqual("memory_limit", by_seed[13].status)
+        self.assertEqual("worker_lost", by_seed[13].reason)
+        self.assertEqual("unknown", by_seed[12].status)
+
+    def test_broken_pool_strikes_only_the_crashing_seed(self):
+        # Every chunk is in flight when seed 13 kills the pool; with one strike
+        # allowed, only a seed that crashes while running alone may be lost.
+        with patch.object(seed_pool_builder, "_analyze_chunk", _crashing_chunk):
+            [rows] = _iter_rows_multi(
+                [(_search(4), list(range(10, 20)))], workers=2, progress_every=0, chunk_sizes=[2], max_pool_strikes=1
+            )
+        lost = sorted(row.seed for row in rows if row.reason == "worker_lost")
+        self.assertEqual([13], lost)
+        self.assertEqual(10, len(rows))
+
+    def test_shard_seeds_partition_range(self):
+        shards = [shard_seeds(10, 25, i, 4) for i in range(4)]
+        self.assertEqual(list(range(10, 35)), sorted(seed for shard in shards for seed in shard))
+        self.assertTrue(all(seed % 4 == 1 for seed in shards[1]))
+
+    def test_merge_shard_rows_prefers_conclusive_then_budget(self):
+        def row(seed, status, max_nodes):
+            return _row(seed, 1.0 if status == "solved" else None, max_seconds=1.0, max_nodes=max_nodes)
+
+        merged, conflicts = merge_shard_rows(
+            [
+                [row(1, "solved", 100), row(2, "unknown", 100), row(3, "unknown", 100)],
+                [row(1, "unknown", 900), row(2, "unknown", 900), row(4, "solved", 100)],
+                [row(3, "unknown", 100)],
+            ]
+        )
+        by_seed = {r.seed: r for r in merged}
+        self.assertEqual(2, conflicts)
+        self.assertEqual("solved", by_seed[1].status)
+        self.assertEqual(900, by_seed[2].max_nodes)
+        self.assertEqual([1, 2, 3, 4], sorted(by_seed))
+
+    def test_merge_main_combines_shard_files(self):
+        args = Namespace(suits=1, max_seconds=1.0, max_nodes=100, max_frontier=10, single_stage=False, workers=1, start_seed=0, count=6, overwrite=False)
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td) / "seed_pool_1s.json"
+            for shard in range(2):
+                path = Path(td) / f"seed_pool_1s.shard{shard}of2.json"
+                rows = [_row(seed, float(seed)) for seed in shard_seeds(0, 6, shard, 2)]
+                _write_artifacts(args, path, path.with_name(f"{path.stem}_rows.csv"), rows, [], 0.0, sketch=sketch_from_rows(rows))
+            merge_main(["--suits", "1", "--out", str(out)])
+            payload = json.loads(out.read_text(encoding="utf-8"))
+            # A second merge reads the merged pool as an input too.
+            merge_main(["--suits", "1", "--out", str(out)])
+            remerged = json.loads(out.read_text(encoding="utf-8"))
+        self.assertEqual(6, payload["stats"]["solved"])
+        self.assertEqual(0, payload["merge_conflicts"])
+        self.assertEqual(6, payload["sketch"]["count"])
+        self.assertEqual([0, 1], payload["buckets"]["Easy"])
+        self.assertEqual(6, remerged["sketch"]["count"])
+        self.assertEqual(payload["quantiles"], remerged["quantiles"])
+
+    def test_rescore_main_uses_stored_components(self):
+        args = Namespace(suits=1, max_seconds=1.0, max_nodes=100, max_frontier=10, single_stage=False, workers=1, start_seed=0, count=4, overwrite=False)
+        rows = []
+        for seed in range(4):
+            components = tuple(float(seed + i) for i in range(len(DIFFICULTY_COMPONENTS)))
+            score = difficulty_score(dict(zip(DIFFICULTY_COMPONENTS, components)))
+            rows.append(
+                _row(seed, score, components=components)
+            )
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td) / "seed_pool_1s.json"
+            _write_artifacts(args, out, out.with_name("seed_pool_1s_rows.csv"), rows, [], 0.0)
+            self.assertTrue((Path(td) / "seed_pool_1s_components.bin").exists())
+            weights = Path(td) / "weights.json"
+            # Score becomes 7 - seed, so the bucket order reverses.
+            weights.write_text(json.dumps({name: 0.0 for name in DIFFICULTY_COMPONENTS} | {"expanded_nodes": -2.0, "suit_factor": 1.0}))
+            rescore_main(["--suits", "1", "--out", str(out), "--weights", str(weights)])
+            payload = json.loads(out.read_text(encoding="utf-8"))
+        self.assertEqual(0, payload["rescored"]["missing_components"])
+        self.assertEqual([2, 3], payload["buckets"]["Easy"])
+        self.assertEqual([0], payload["buckets"]["Hard"])
+
+
+    def test_db_export_and_merge_keep_side_files(self):
+        from solver.difficulty_columns import read_columns
+        from solver.seed_db import SeedDb, export_pool, import_pool
+        from solver.solution_codec import read_solutions
+
+        args = Namespace(suits=1, max_seconds=1.0, max_nodes=100, max_frontier=10, single_stage=False, workers=1, start_seed=0, count=4, overwrite=False)
+        components = tuple(1.0 for _ in DIFFICULTY_COMPONENTS)
+        rows = [
+            _row(seed, float(seed), components=components, solution=bytes([0xFF, seed]))
+            for seed in range(4)
+        ]
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td) / "seed_pool_1s.json"
+            _write_artifacts(args, out, out.with_name("seed_pool_1s_rows.csv"), rows, [], 0.0)
+            with SeedDb(Path(td) / "seed_pool.sqlite") as db:
+                import_pool(db, out)
+                export_pool(db, 1, out)
+            # A shard from a build that stored neither components nor solutions.
+            shard = Path(td) / "seed_pool_1s.shard0of1.json"
+            bare = [replace(row, components=None, solution=None) for row in rows]
+            _write_artifacts(args, shard, shard.with_name(f"{shard.stem}_rows.csv"), bare, [], 0.0)
+            merge_main(["--suits", "1", "--out", str(out), "--overwrite"])
+            seeds, _ = read_columns(Path(td) / "seed_pool_1s_components.bin")
+            solutions = read_solutions(Path(td) / "seed_pool_1s_solutions.bin")
+        self.assertEqual([0, 1, 2, 3], seeds)
+        self.assertEqual({seed: bytes([0xFF, seed]) for seed in range(4)}, solutions)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from base.Core import GameConfig
+from solver.analyzer import SearchLimits, analyze_seed, build_initial_state
+from solver.solution_codec import (
+    decode_actions,
+    encode_actions,
+    lookup_solution,
+    opening_plan,
+    parse_notation,
+    read_solutions,
+    solutions_path,
+    write_solutions,
+)
+
+
+class SolutionCodecTestCase(unittest.TestCase):
+    def test_analyzer_solution_round_trips_and_replays(self):
+        result = analyze_seed(seed=0, suits=1, limits=SearchLimits(max_nodes=20_000, max_seconds=10.0))
+        self.assertEqual("solved", result.status)
+        actions = [parse_notation(text) for text in result.solution]
+        data = encode_actions(actions)
+        self.assertLessEqual(len(data), 2 * len(actions))
+        self.assertEqual(
+            [(a.kind, a.src_stack, a.src_idx, a.dest_stack) for a in actions],
+            [(a.kind, a.src_stack, a.src_idx, a.dest_stack) for a in decode_actions(data)],
+        )
+
+        cfg = GameConfig()
+        cfg.seed = 0
+        cfg.suits = 1
+        state = build_initial_state(cfg)
+        plan = opening_plan(state, 0, 1, data)
+        self.assertIsNotNone(plan)
+        self.assertEqual(list(result.solution), [action.to_notation() for action in plan.solution])
+        self.assertEqual(len(plan.solution) + 1, len(plan.solution_states))
+        self.assertIsNone(opening_plan(state, 1, 1, data))
+
+    def test_solutions_file_lookup(self):
+        solutions = {5: b"\x01\x02", 3: b"\xff", 4_000_000_000: b""}
+        with tempfile.TemporaryDirectory() as td:
+            path = solutions_path(Path(td) / "seed_pool_1s.json")
+            self.assertEqual("seed_pool_1s_solutions.bin", path.name)
+            write_solutions(path, solutions)
+            self.assertEqual(solutions, read_solutions(path))
+            self.assertEqual(b"\xff", lookup_solution(path, 3))
+            self.assertEqual(b"", lookup_solution(path, 4_000_000_000))
+            self.assertIsNone(lookup_solution(path, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+
+from solver.cost_model import FEATURES
+from solver.solvability import SolvabilityModel, _sigmoid, fit_model, roc_auc
+
+
+class SolvabilityTestCase(unittest.TestCase):
+    def test_fit_recovers_logistic_weights(self):
+        rng = random.Random(7)
+        samples = []
+        for _ in range(3000):
+            features = {name: rng.uniform(0, 1) for name in FEATURES}
+            p = _sigmoid(-1.0 + 3.0 * features["probe_solved"] - 2.0 * features["probe_dead_ratio"])
+            samples.append((features, rng.random() < p))
+        model = fit_model(samples)
+
+        self.assertAlmostEqual(3.0, model.weights["probe_solved"], delta=0.4)
+        self.assertAlmostEqual(-2.0, model.weights["probe_dead_ratio"], delta=0.4)
+        self.assertAlmostEqual(0.0, model.weights["buried_kings"], delta=0.4)
+        restored = SolvabilityModel.from_dict(model.to_dict())
+        self.assertAlmostEqual(model.probability(samples[0][0]), restored.probability(samples[0][0]))
+
+    def test_budget_mismatch_compares_the_fit_budget(self):
+        self.assertIsNone(SolvabilityModel().budget_mismatch(2.0, 1000))
+        model = SolvabilityModel(max_seconds=2.0, max_nodes=1000)
+        self.assertIsNone(model.budget_mismatch(2, 1000))
+        self.assertIn("max_nodes=5000", model.budget_mismatch(2.0, 5000))
+
+    def test_skip_needs_a_model_fit_for_the_run(self):
+        self.assertIn("prior", SolvabilityModel().skip_blocker(2.0, 1000, 64))
+        model = SolvabilityModel(samples=100, max_seconds=2.0, max_nodes=1000, probe_nodes=500)
+        self.assertIsNone(model.skip_blocker(2.0, 1000, 500))
+        self.assertIn("probe_nodes=64", model.skip_blocker(2.0, 1000, 64))
+        self.assertIn("max_nodes=5000", model.skip_blocker(2.0, 5000, 500))
+        self.assertIn("does not record", SolvabilityModel(samples=100).skip_blocker(2.0, 1000, 64))
+
+    def test_roc_auc(self):
+        self.assertEqual(1.0, roc_auc([0.1, 0.2, 0.8, 0.9], [False, False, True, True]))
+        self.assertEqual(0.0, roc_auc([0.9, 0.8, 0.2, 0.1], [False, False, True, True]))
+        self.assertEqual(0.5, roc_auc([0.5, 0.5, 0.5, 0.5], [False, True, False, True]))
+        self.assertEqual(0.5, roc_auc([0.1, 0.2], [True, True]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import itertools
 import unittest
+from dataclasses import replace
+from unittest.mock import patch
 
+from base.Core import GameConfig
 from solver.analyzer import (
     Action,
     SearchLimits,
@@ -8,8 +12,15 @@ from solver.analyzer import (
     _canonical_state_key,
     _is_immediate_reverse,
     _iter_transitions,
+    _replay_actions,
+    _single_step_transitions,
     analyze_seed,
+    analyze_seeds,
     analyze_state,
+    build_initial_state,
+    resolve_state,
+    shorten_result,
+    shorten_solution,
     solve_state,
 )
 
@@ -18,6 +29,13 @@ def visible(suit, num):
     return suit * 13 + num
 
 
+def _config(seed, suits):
+    cfg = GameConfig()
+    cfg.seed = seed
+    cfg.suits = suits
+    return cfg
+
+
 class SolverAnalyzerTestCase(unittest.TestCase):
     def test_solve_simple_one_move_position(self):
         full_run = tuple(visible(0, num) for num in range(12, -1, -1))
@@ -203,6 +221,172 @@ class SolverAnalyzerTestCase(unittest.TestCase):
         transitions = _iter_transitions(state, policy=policy)
         self.assertTrue(any(t.macro_steps > 0 for t in transitions))
 
+    def test_solve_state_profile_is_opt_in(self):
+        full_run = tuple(visible(0, num) for num in range(12, -1, -1))
+        state = SolverState(base=(), stacks=(full_run, tuple()), finished_count=0)
+        limits = SearchLimits(max_nodes=5000, max_seconds=1.0, max_frontier=20000)
+
+        plain = solve_state(state, limits=limits)
+        profiled = solve_state(state, limits=limits, instrument=True)
+
+        self.assertIsNone(plain.profile)
+        self.assertIsNotNone(profiled.profile)
+        phases = profiled.profile.to_dict()["phases"]
+        self.assertEqual(profiled.expanded_nodes, phases["iter_transitions"]["calls"])
+        self.assertIn("heap_pop", phases)
+
+    def test_rss_cap_aborts_with_memory_limit(self):
+        state = build_initial_state(_config(5, 4))
+        limits = SearchLimits(max_nodes=50_000, max_seconds=5.0, max_frontier=500_000, max_rss_mb=1.0)
+        # RSS grows by 2 MiB on every check after the baseline read.
+        readings = itertools.count(start=100)
+
+        with patch("solver.analyzer._rss_bytes", side_effect=lambda: next(readings) * 2 * 1024 * 1024):
+            result = analyze_state(state, suits=4, seed=5, limits=limits)
+
+        self.assertEqual("memory_limit", result.status)
+        self.assertEqual("memory_limit", result.metrics["reason"])
+        self.assertEqual(1, len(result.metrics["stages"]))
+
+    def test_rss_cap_ignores_memory_held_before_the_search(self):
+        state = build_initial_state(_config(5, 4))
+        ballast = b"x" * (96 * 1024 * 1024)
+        limits = SearchLimits(max_nodes=3_000, max_seconds=5.0, max_frontier=500_000, max_rss_mb=64.0)
+
+        result = solve_state(state, limits)
+
+        self.assertEqual(96 * 1024 * 1024, len(ballast))
+        self.assertNotEqual("memory_limit", result.status)
+        self.assertGreater(result.expanded_nodes, 0)
+
+    def test_analyze_state_profile_counts_prunes(self):
+        state = SolverState(
+            base=(),
+            stacks=(
+                (visible(0, 9), visible(0, 8), visible(0, 7)),
+                (visible(1, 10),),
+                (visible(0, 10),),
+            ),
+            finished_count=0,
+        )
+        result = analyze_state(
+            initial_state=state,
+            suits=2,
+            limits=SearchLimits(max_nodes=2000, max_seconds=1.0, max_frontier=20000),
+            instrument=True,
+        )
+        profile = result.metrics["profile"]
+        self.assertGreater(profile["prunes"].get("lock_same_suit_runs", 0), 0)
+        self.assertTrue(profile["depth"])
+        self.assertTrue(all(0.0 <= row["duplicate_rate"] <= 1.0 for row in profile["depth"]))
+
+    def test_shorten_solution_splices_detours(self):
+        run_without_ace = tuple(visible(0, num) for num in range(12, 0, -1))
+        state = SolverState(base=(), stacks=(run_without_ace, (visible(0, 0),), tuple()), finished_count=0)
+        detour = (
+            Action(kind="MOVE", src_stack=1, src_idx=0, dest_stack=2, moved_len=1),
+            Action(kind="MOVE", src_stack=2, src_idx=0, dest_stack=1, moved_len=1),
+            Action(kind="MOVE", src_stack=1, src_idx=0, dest_stack=2, moved_len=1),
+            Action(kind="MOVE", src_stack=2, src_idx=0, dest_stack=0, moved_len=1),
+        )
+
+        actions, states = shorten_solution(state, detour)
+
+        self.assertEqual(1, len(actions))
+        self.assertEqual(2, len(states))
+        self.assertTrue(all(len(stack) == 0 for stack in states[-1].stacks))
+
+    def test_shorten_result_recounts_the_shorter_path(self):
+        state = build_initial_state(_config(seed=11, suits=1))
+        result = solve_state(state, limits=SearchLimits(max_nodes=20000, max_seconds=2.0))
+
+        shortened = shorten_result(state, result)
+
+        self.assertIsNot(result, shortened)
+        self.assertLessEqual(len(shortened.solution), len(result.solution))
+        self.assertEqual(sum(1 for action in shortened.solution if action.kind == "DEAL"), shortened.solution_deals)
+        self.assertEqual(result.expanded_nodes, shortened.expanded_nodes)
+
+    def test_anytime_solution_is_not_longer(self):
+        result = analyze_seed(seed=11, suits=1, limits=SearchLimits(max_nodes=20000, max_seconds=2.0, max_frontier=50000))
+        self.assertEqual("solved", result.status)
+        state = build_initial_state(_config(seed=11, suits=1))
+
+        refined = solve_state(state, limits=SearchLimits(max_nodes=20000, max_seconds=0.5), anytime=True)
+
+        self.assertEqual("solved", refined.status)
+        self.assertLessEqual(len(refined.solution), len(result.solution))
+        self.assertEqual(len(refined.solution) + 1, len(refined.solution_states))
+
+    def test_solution_states_hold_one_state_per_action(self):
+        state = build_initial_state(_config(seed=11, suits=1))
+
+        result = solve_state(state, limits=SearchLimits(max_nodes=20000, max_seconds=2.0))
+
+        self.assertEqual("solved", result.status)
+        self.assertEqual(_replay_actions(state, result.solution), result.solution_states)
+        # Macro-chain moves are replayed but are not search decisions.
+        self.assertEqual(0, result.decision_points[0])
+        self.assertLess(len(result.decision_points), len(result.solution))
+
+    def test_anytime_refinement_stops_after_a_pass_without_improvement(self):
+        state = build_initial_state(_config(seed=11, suits=1))
+        real_solve = solve_state
+        weights = []
+
+        def nothing_shorter(*args, **kwargs):
+            weights.append(kwargs["depth_weight"])
+            found = real_solve(*args, **{**kwargs, "limits": SearchLimits(max_nodes=10)})
+            return replace(found, status="unknown", stop_reason="exhausted", solution=(), solution_states=())
+
+        with patch("solver.analyzer.solve_state", side_effect=nothing_shorter):
+            refined = solve_state(state, limits=SearchLimits(max_nodes=20000, max_seconds=2.0), anytime=True)
+
+        self.assertEqual("solved", refined.status)
+        self.assertEqual([8], weights)
+
+    def test_resolve_state_reconnects_to_previous_plan(self):
+        state = build_initial_state(_config(seed=11, suits=1))
+        limits = SearchLimits(max_nodes=20000, max_seconds=2.0)
+        previous = solve_state(state, limits=limits)
+        self.assertEqual("solved", previous.status)
+
+        unchanged = resolve_state(state, previous, limits=limits)
+        self.assertEqual(previous.solution, unchanged.solution)
+        self.assertEqual(0, unchanged.expanded_nodes)
+
+        deviated = next(tr.state for tr in _single_step_transitions(state) if tr.action != previous.solution[0])
+        result = resolve_state(deviated, previous, limits=limits)
+
+        self.assertEqual("solved", result.status)
+        self.assertEqual("plan_reconnected", result.stop_reason)
+        self.assertEqual(deviated, result.solution_states[0])
+        self.assertTrue(all(len(stack) == 0 for stack in result.solution_states[-1].stacks))
+
+    def test_analyze_seeds_streams_results_from_pool(self):
+        limits = SearchLimits(max_nodes=500, max_seconds=0.05, max_frontier=2000)
+
+        results = analyze_seeds(range(100, 104), suits=1, limits=limits, workers=2)
+
+        self.assertNotIsInstance(results, list)
+        self.assertEqual([100, 101, 102, 103], sorted(result.seed for result in results))
+
+    def test_deterministic_limits_budget_by_nodes_only(self):
+        limits = SearchLimits(max_nodes=6_000, max_seconds=30.0, deterministic=True)
+
+        first = analyze_seed(seed=1, suits=2, limits=limits)
+        second = analyze_seed(seed=1, suits=2, limits=limits)
+        capped = analyze_seed(seed=1, suits=2, limits=SearchLimits(max_nodes=6_000, max_seconds=0.0, deterministic=True))
+
+        self.assertEqual("unknown", first.status)
+        self.assertEqual([2_100, 2_100, 2_000], [stage["expanded_nodes"] for stage in first.metrics["stages"]])
+        self.assertEqual(
+            [(s["name"], s["reason"], s["expanded_nodes"], s["unique_states"]) for s in first.metrics["stages"]],
+            [(s["name"], s["reason"], s["expanded_nodes"], s["unique_states"]) for s in second.metrics["stages"]],
+        )
+        self.assertEqual("time_cap", capped.metrics["reason"])
+        self.assertEqual(1, len(capped.metrics["stages"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from solver import worker_pool
+from solver.worker_pool import make_worker_pool
+
+
+class WorkerPoolTestCase(unittest.TestCase):
+    def test_falls_back_to_threads_where_processes_are_denied(self):
+        notices = []
+        with patch.object(worker_pool, "ProcessPoolExecutor", side_effect=PermissionError):
+            exe = make_worker_pool(2, log=notices.append)
+        with exe:
+            self.assertIsInstance(exe, ThreadPoolExecutor)
+            self.assertEqual(4, exe.submit(pow, 2, 2).result())
+        self.assertEqual(1, len(notices))
+
+
+if __name__ == "__main__":
+    unittest.main()